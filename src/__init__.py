@@ -1,2 +1,3 @@
 # This file makes src a Python package
 
+__version__ = "0.1.0"
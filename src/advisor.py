@@ -0,0 +1,283 @@
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from src.packed_score_card import PackedScoreCard
+from src.roll_encoding import encode_roll
+from src.roll_table import KEEPS, ROLL_KEEPS
+from src.score_card import ScoreCard
+from src.score_category import ScoreCategory
+from src.solver import (
+    FULL_MASK, NUM_UPPER, UPPER_CAP, best_keep_values, card_state, category_values_batch, keep_values
+)
+from src.strategy_file import StrategyTable
+
+MAX_REROLLS = 2
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_CATEGORIES = tuple(ScoreCategory)
+
+# The distinct keeps each sorted roll allows, as indices into KEEPS. Holding either of two
+# equal dice leaves the same keep, so most rolls have fewer than 32.
+_ROLL_CHOICES: list[tuple[int, ...]] = [tuple(sorted(set(keeps))) for keeps in ROLL_KEEPS.tolist()]
+
+
+class Advice:
+    """
+    One action available on a turn, with the expected score still to come if it is taken
+    and the rest of the game is played optimally. Exactly one of keep and category is set.
+    """
+    __slots__ = ('keep', 'category', 'expected_value')
+
+    def __init__(self, keep: tuple[int, ...] | None, category: ScoreCategory | None, expected_value: float) -> None:
+        """
+        Initializes an Advice instance.
+        :param keep: The sorted dice to hold before rerolling the rest, or None. Holding all
+            five dice stands on the roll.
+        :param category: The category to score the roll in, or None.
+        :param expected_value: The expected points still to come, excluding points already on the card.
+        """
+        self.keep = keep
+        self.category = category
+        self.expected_value = expected_value
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Advice instance.
+        :return: A string representing the Advice instance.
+        """
+        action = f"keep={self.keep}" if self.category is None else f"category={self.category}"
+        return f"Advice({action}, expected_value={self.expected_value:.4f})"
+
+
+class Advisor:
+    """
+    Ranks the actions available on a turn using solved state values. Scoring options are
+    valued for the queried roll alone. Keep options need the value of every keep in the
+    state, which costs a few small matrix products; those are kept in an LRU cache, so every
+    further roll in the same state is answered with lookups alone.
+    """
+    def __init__(self, values: StrategyTable | np.ndarray, cache_size: int = 4096) -> None:
+        """
+        Initializes an Advisor.
+        :param values: A StrategyTable, or the (8192, 64) value table returned by solve().
+        :param cache_size: The number of evaluated (state, rerolls left) entries to keep.
+        """
+        self.cache_size = cache_size
+        self.table = values if isinstance(values, StrategyTable) else None
+        self.values = values.values if isinstance(values, StrategyTable) else np.asarray(values)
+        # Keep values by (mask, upper, rerolls left), least recently used first.
+        self._keep_cache: OrderedDict[tuple[int, int, int], np.ndarray] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles the values but not the caches, which are rebuilt on demand.
+        :return: The constructor and its arguments.
+        """
+        return Advisor, (self.table if self.table is not None else self.values, self.cache_size)
+
+    def advise(self, card: ScoreCard | PackedScoreCard, roll: list[int], rerolls_left: int) -> list[Advice]:
+        """
+        Ranks the actions available for a roll, best first. With rerolls left these are
+        the keeps the roll allows; with none left, the open categories to score it in.
+        :param card: The player's score card.
+        :param roll: The five dice showing, in any order.
+        :param rerolls_left: How many rerolls remain this turn, from 0 to 2.
+        :return: The actions, sorted by descending expected value.
+        :raises ValueError: If the roll or rerolls left are invalid, the card is full, or the
+            strategy values were not solved for the card.
+        """
+        if not 0 <= rerolls_left <= MAX_REROLLS:
+            raise ValueError(f"Rerolls left must be between 0 and {MAX_REROLLS}, got {rerolls_left}.")
+
+        rank = encode_roll(roll)
+        mask, upper = card_state(card)
+
+        if mask == FULL_MASK:
+            raise ValueError("Every category on the card has already been scored.")
+
+        if self.table is not None and not self.table.covers(mask):
+            raise ValueError("The strategy table was not solved for this card.")
+
+        if np.isnan(self.values[mask, upper]):
+            raise ValueError("The strategy values were not solved for this card.")
+
+        if rerolls_left == 0:
+            scores = self._score_options(mask, upper, rank).tolist()
+            advice = [
+                Advice(None, category, value)
+                for category, value in zip(_CATEGORIES, scores)
+                if value != -np.inf
+            ]
+        else:
+            choices = _ROLL_CHOICES[rank]
+            keeps = self._keep_values(mask, upper, rerolls_left)[list(choices)].tolist()
+            advice = [Advice(KEEPS[keep], None, value) for keep, value in zip(choices, keeps)]
+
+        advice.sort(key=lambda action: action.expected_value, reverse=True)
+        return advice
+
+    def advise_batch(self, masks: np.ndarray, uppers: np.ndarray, ranks: np.ndarray,
+                     rerolls_left: np.ndarray | int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the best action for many turns in one vectorized evaluation. Each distinct
+        game state is evaluated once, however many requests share it, and the best action
+        for each request is gathered from its state's values.
+        :param masks: The filled-category masks, as an (N,) integer array.
+        :param uppers: The upper-section subtotals, as an (N,) integer array; they are capped at 63.
+        :param ranks: The roll ranks, as an (N,) integer array.
+        :param rerolls_left: The rerolls left for each request, as an (N,) integer array or
+            one value for all of them.
+        :return: The best action and its expected value for each request, as (N,) arrays.
+            The action is an index into KEEPS for requests with rerolls left, and a column
+            in ScoreCategory order for those without.
+        :raises ValueError: If the arrays differ in length or hold values out of range, a
+            card is full, or the strategy values were not solved for a card.
+        """
+        masks, uppers, ranks, rerolls_left = self._check_batch(masks, uppers, ranks, rerolls_left)
+        states, state_of = np.unique(masks * NUM_UPPER + uppers, return_inverse=True)
+        scores = category_values_batch(self.values, states // NUM_UPPER, states % NUM_UPPER)
+        roll_values = scores.max(axis=2)
+        actions = np.empty(masks.shape, dtype=np.intp)
+        expected = np.empty(masks.shape)
+
+        scoring = np.flatnonzero(rerolls_left == 0)
+        options = scores[state_of[scoring], ranks[scoring]]
+        actions[scoring] = options.argmax(axis=1)
+        expected[scoring] = options.max(axis=1)
+
+        # The states whose roll values are held in roll_values, in order.
+        evaluated = np.arange(len(states))
+
+        for rerolls in range(1, MAX_REROLLS + 1):
+            # Only states with a request at least this many rerolls from the end need keep values.
+            needed = np.unique(state_of[rerolls_left >= rerolls])
+            keeps = keep_values(roll_values[np.searchsorted(evaluated, needed)])
+            requests = np.flatnonzero(rerolls_left == rerolls)
+            choices = ROLL_KEEPS[ranks[requests]]
+            options = keeps[np.searchsorted(needed, state_of[requests])[:, np.newaxis], choices]
+            best = options.argmax(axis=1)
+            actions[requests] = choices[np.arange(len(requests)), best]
+            expected[requests] = options[np.arange(len(requests)), best]
+
+            if rerolls < MAX_REROLLS:
+                roll_values = best_keep_values(keeps)
+                evaluated = needed
+
+        return actions, expected
+
+    def best_categories(self, masks: np.ndarray, uppers: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+        """
+        Finds the best category to score each final roll in, as advise_batch() does with no
+        rerolls left but without the expected values. With a strategy file that holds the
+        best-category table the answers are read from it, so no options are valued.
+        :param masks: The filled-category masks, as an (N,) integer array.
+        :param uppers: The upper-section subtotals, as an (N,) integer array; they are capped at 63.
+        :param ranks: The roll ranks, as an (N,) integer array.
+        :return: An (N,) array of columns in ScoreCategory order.
+        :raises ValueError: As for advise_batch().
+        """
+        masks, uppers, ranks, _ = self._check_batch(masks, uppers, ranks, 0)
+
+        if self.table is not None and self.table.actions is not None:
+            return self.table.actions[masks, uppers, ranks].astype(np.intp)
+
+        states, state_of = np.unique(masks * NUM_UPPER + uppers, return_inverse=True)
+        scores = category_values_batch(self.values, states // NUM_UPPER, states % NUM_UPPER)
+        return scores[state_of, ranks].argmax(axis=1)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Reports how well the keep cache is doing.
+        :return: The hits, misses, maximum size and current size of the cache.
+        """
+        return CacheInfo(self._hits, self._misses, self.cache_size, len(self._keep_cache))
+
+    def _check_batch(self, masks: np.ndarray, uppers: np.ndarray, ranks: np.ndarray,
+                     rerolls_left: np.ndarray | int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Checks a batch of requests and brings them to a common form.
+        :param masks: The filled-category masks.
+        :param uppers: The upper-section subtotals.
+        :param ranks: The roll ranks.
+        :param rerolls_left: The rerolls left, per request or for all of them.
+        :return: The masks, capped subtotals, ranks and rerolls left, as (N,) intp arrays.
+        :raises ValueError: If the arrays differ in length or hold values out of range, a
+            card is full, or the strategy values were not solved for a card.
+        """
+        masks = np.asarray(masks, dtype=np.intp)
+        uppers = np.minimum(np.asarray(uppers, dtype=np.intp), UPPER_CAP)
+        ranks = np.asarray(ranks, dtype=np.intp)
+        rerolls_left = np.broadcast_to(np.asarray(rerolls_left, dtype=np.intp), masks.shape)
+
+        if masks.ndim != 1 or uppers.shape != masks.shape or ranks.shape != masks.shape:
+            raise ValueError("masks, uppers and ranks must be one-dimensional arrays of the same length.")
+
+        if masks.size:
+            if masks.min() < 0 or masks.max() >= FULL_MASK:
+                raise ValueError(f"Masks must be between 0 and {FULL_MASK - 1}.")
+
+            if uppers.min() < 0:
+                raise ValueError("Upper-section subtotals must not be negative.")
+
+            if ranks.min() < 0 or ranks.max() >= len(ROLL_KEEPS):
+                raise ValueError(f"Roll ranks must be between 0 and {len(ROLL_KEEPS) - 1}.")
+
+            if rerolls_left.min() < 0 or rerolls_left.max() > MAX_REROLLS:
+                raise ValueError(f"Rerolls left must be between 0 and {MAX_REROLLS}.")
+
+            if self.table is not None and (masks & self.table.start_mask != self.table.start_mask).any():
+                raise ValueError("The strategy table was not solved for every card.")
+
+            if np.isnan(self.values[masks, uppers]).any():
+                raise ValueError("The strategy values were not solved for every card.")
+
+        return masks, uppers, ranks, rerolls_left
+
+    def _score_options(self, mask: int, upper: int, rank: int | None = None) -> np.ndarray:
+        """
+        Values scoring a roll in every category with category_values_batch(), for the one
+        state and, when a rank is given, that roll alone.
+        :param mask: The filled-category mask.
+        :param upper: The capped upper-section subtotal.
+        :param rank: The roll rank to value, or None for every roll.
+        :return: The value of each category in ScoreCategory order, -inf if filled, as a
+            (13,) array for one rank or a (252, 13) array for every roll.
+        """
+        ranks = None if rank is None else np.array([rank])
+        options = category_values_batch(self.values, np.array([mask]), np.array([upper]), ranks)[0]
+        return options if rank is None else options[0]
+
+    def _keep_values(self, mask: int, upper: int, rerolls_left: int) -> np.ndarray:
+        """
+        Values every keep, given the rerolls left before it is thrown, through the LRU cache.
+        :param mask: The filled-category mask.
+        :param upper: The capped upper-section subtotal.
+        :param rerolls_left: The rerolls left, from 1 to 2, including the one the keep is for.
+        :return: The expected value of each keep, indexed like KEEPS.
+        """
+        key = (mask, upper, rerolls_left)
+        keeps = self._keep_cache.get(key)
+
+        if keeps is not None:
+            self._hits += 1
+            self._keep_cache.move_to_end(key)
+            return keeps
+
+        self._misses += 1
+
+        if rerolls_left == 1:
+            roll_values = self._score_options(mask, upper).max(axis=1)
+        else:
+            roll_values = best_keep_values(self._keep_values(mask, upper, rerolls_left - 1)[np.newaxis])[0]
+
+        keeps = keep_values(roll_values[np.newaxis])[0]
+        self._keep_cache[key] = keeps
+
+        if len(self._keep_cache) > self.cache_size:
+            self._keep_cache.popitem(last=False)
+
+        return keeps
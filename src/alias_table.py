@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class AliasTable:
+    """
+    Walker's alias method over one or more discrete distributions sharing the same outcomes.
+    Each draw costs a single uniform variate regardless of the number of outcomes.
+    """
+    def __init__(self, probabilities: np.ndarray) -> None:
+        """
+        Builds the alias tables with Vose's algorithm.
+        :param probabilities: A (num_outcomes,) distribution, or a (num_tables, num_outcomes)
+            stack of distributions, one per row. Rows are normalized before use.
+        :raises ValueError: If a distribution has negative weights or sums to zero.
+        """
+        weights = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+        totals = weights.sum(axis=1)
+
+        if (weights < 0).any() or (totals <= 0).any():
+            raise ValueError("Probabilities must be non-negative with a positive sum.")
+
+        self.num_outcomes = weights.shape[1]
+        self.prob = np.ones(weights.shape)
+        self.alias = np.tile(np.arange(self.num_outcomes, dtype=np.intp), (weights.shape[0], 1))
+
+        for row, scaled in enumerate(weights * (self.num_outcomes / totals[:, None])):
+            self._fill_row(row, scaled.tolist())
+
+    def _fill_row(self, row: int, scaled: list[float]) -> None:
+        """
+        Pairs each under-full column with an over-full donor for a single distribution.
+        :param row: The table row to fill.
+        :param scaled: The distribution scaled so that its mean is 1.
+        """
+        small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[row, less] = scaled[less]
+            self.alias[row, less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # Whatever is left over is full up to rounding error and keeps prob 1.
+
+    def sample(self, rng: np.random.Generator, tables: np.ndarray | int = 0, size: int | None = None) -> np.ndarray:
+        """
+        Draws outcomes, using one uniform variate per draw.
+        :param rng: The random number generator to draw from.
+        :param tables: The table to draw from, or an array with one table per draw.
+        :param size: Number of draws when sampling a single table; ignored for an array of tables.
+        :return: An array of outcome indices.
+        """
+        tables = np.asarray(tables, dtype=np.intp)
+
+        if tables.ndim:
+            size = tables.shape
+
+        uniform = np.asarray(rng.random(size)) * self.num_outcomes
+        column = np.minimum(uniform.astype(np.intp), self.num_outcomes - 1)
+        accept = uniform - column < self.prob[tables, column]
+        return np.where(accept, column, self.alias[tables, column])
+
+    def sample_one(self, rng: np.random.Generator, table: int = 0) -> int:
+        """
+        Draws a single outcome without the array overhead of sample().
+        :param rng: The random number generator to draw from.
+        :param table: The table to draw from.
+        :return: The outcome index.
+        """
+        uniform = rng.random() * self.num_outcomes
+        column = min(int(uniform), self.num_outcomes - 1)
+
+        if uniform - column < self.prob[table, column]:
+            return column
+
+        return int(self.alias[table, column])
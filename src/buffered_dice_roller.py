@@ -0,0 +1,191 @@
+import queue
+import threading
+import weakref
+
+import numpy as np
+
+from src.dice_roller import DiceRoller
+
+
+class _Block:
+    """
+    One block of pre-generated dice: the raw draws in order, as an array and as a list,
+    and the same draws cut into rolls and sorted.
+    """
+    __slots__ = ('dice', 'dice_list', 'rolls')
+
+    def __init__(self, dice: np.ndarray, num_dice: int) -> None:
+        """
+        Prepares a block for reading.
+        :param dice: The raw dice values, a whole number of rolls.
+        :param num_dice: Number of dice in a roll.
+        """
+        self.dice = dice
+        self.dice_list = dice.tolist()
+        self.rolls = np.sort(dice.reshape(-1, num_dice), axis=1).tolist()
+
+
+def _fill_blocks(rng: np.random.Generator, die_size: int, num_dice: int, block_size: int,
+                 requests: threading.Semaphore, ready: queue.Queue, stop: threading.Event) -> None:
+    """
+    Generates one block for every refill request, in order, until stopped. It is the only
+    user of the generator once started, and holds no reference to the roller so that an
+    abandoned roller can still be collected.
+    :param rng: The generator.
+    :param die_size: Number of sides on each die.
+    :param num_dice: Number of dice in a roll.
+    :param block_size: Number of rolls per block.
+    :param requests: Released once per block wanted.
+    :param ready: Receives the finished blocks.
+    :param stop: Set to end the thread.
+    """
+    while True:
+        requests.acquire()
+
+        if stop.is_set():
+            return
+
+        ready.put(_Block(rng.integers(1, die_size + 1, size=block_size * num_dice), num_dice))
+
+
+def _stop_thread(requests: threading.Semaphore, stop: threading.Event) -> None:
+    """
+    Asks a fill thread to finish.
+    :param requests: The thread's refill requests.
+    :param stop: The thread's stop event.
+    """
+    stop.set()
+    requests.release()
+
+
+class BufferedDiceRoller(DiceRoller):
+    """
+    A DiceRoller that serves dice from large pre-generated blocks, so a roll costs a cursor
+    bump instead of a call into the generator. A background thread generates the next block
+    once the current one runs down to a low watermark.
+    The dice come from the generator in the same order as an unbuffered DiceRoller with the
+    same seed would draw them, so the rolls and rerolls are identical.
+    """
+    def __init__(self, num_dice: int = 5, die_size: int = 6, seed: int | np.random.SeedSequence = None,
+                 block_size: int = 65536, low_watermark: int = 16384, counter_based: bool = False) -> None:
+        """
+        Initialize the BufferedDiceRoller and generate its first block.
+        :param num_dice: Number of dice used in a roll.
+        :param die_size: Number of sides on each die.
+        :param seed: Optional seed for the random number generator, an integer or a SeedSequence.
+        :param block_size: Number of rolls generated per block.
+        :param low_watermark: Number of rolls left in the current block at which the next
+            block is requested.
+        :param counter_based: Use the counter-based Philox generator.
+        :raises ValueError: If the block size or watermark is out of range.
+        """
+        if block_size < 1 or not 0 <= low_watermark <= block_size:
+            raise ValueError("The block size must be positive and the low watermark between 0 and the block size.")
+
+        super().__init__(num_dice, die_size, seed, counter_based=counter_based)
+        self.block_size = block_size
+        self.low_watermark = low_watermark
+        self._block = _Block(self.rng.integers(1, die_size + 1, size=block_size * num_dice), num_dice)
+        self._cursor = 0
+        self._requested = False
+        self._requests = threading.Semaphore(0)
+        self._ready: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+
+        threading.Thread(
+            target=_fill_blocks,
+            name="BufferedDiceRoller",
+            args=(self.rng, die_size, num_dice, block_size, self._requests, self._ready, self._stop),
+            daemon=True,
+        ).start()
+        self._finalizer = weakref.finalize(self, _stop_thread, self._requests, self._stop)
+
+    def roll(self) -> list[int]:
+        """
+        Roll the specified number of dice, from the buffer.
+        :return: A sorted list of integers representing the result of each die rolled.
+        """
+        cursor = self._cursor
+
+        if cursor % self.num_dice == 0 and cursor < len(self._block.dice_list):
+            # Aligned with a roll of the block, which was sorted when the block was made.
+            # Each sorted roll is handed out only once, so it needs no copy.
+            self._cursor = cursor + self.num_dice
+            self._check_watermark()
+            return self._block.rolls[cursor // self.num_dice]
+
+        return sorted(self._roll_dice(self.num_dice))
+
+    def close(self) -> None:
+        """
+        Stops the background thread. The roller must not be used afterwards.
+        """
+        self._finalizer()
+
+    def __enter__(self) -> 'BufferedDiceRoller':
+        """
+        Returns the roller for use in a with statement.
+        :return: This roller.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stops the background thread at the end of a with statement.
+        """
+        self.close()
+
+    def _roll_dice(self, num: int = 1) -> list[int]:
+        """
+        Roll a specified number of dice, from the buffer.
+        :param num: Number of dice to roll.
+        :return: A list of integers representing the result of each die rolled.
+        """
+        cursor = self._cursor
+
+        if cursor + num <= len(self._block.dice_list):
+            self._cursor = cursor + num
+            self._check_watermark()
+            return self._block.dice_list[cursor:cursor + num]
+
+        return self._draw(num).tolist()
+
+    def _draw(self, size: int | tuple[int, ...]) -> np.ndarray:
+        """
+        Takes dice values from the buffer, moving on to later blocks as needed.
+        :param size: The number of dice, or the shape of the array to fill.
+        :return: A new array of dice values.
+        """
+        remaining = int(np.prod(size))
+        pieces = []
+
+        while remaining:
+            if self._cursor == len(self._block.dice_list):
+                self._next_block()
+
+            taken = min(remaining, len(self._block.dice_list) - self._cursor)
+            pieces.append(self._block.dice[self._cursor:self._cursor + taken])
+            self._cursor += taken
+            remaining -= taken
+
+        self._check_watermark()
+        return np.concatenate([np.empty(0, dtype=np.int64), *pieces]).reshape(size)
+
+    def _check_watermark(self) -> None:
+        """
+        Requests the next block once the current one runs down to the low watermark.
+        """
+        if not self._requested and len(self._block.dice_list) - self._cursor <= self.low_watermark * self.num_dice:
+            self._requested = True
+            self._requests.release()
+
+    def _next_block(self) -> None:
+        """
+        Switches to the next block, waiting for the background thread if it is not ready.
+        """
+        if not self._requested:
+            self._requests.release()
+
+        self._block = self._ready.get()
+        self._cursor = 0
+        self._requested = False
@@ -1,5 +1,7 @@
 from collections import Counter
-from typing import Callable
+from typing import Callable, Sequence
+
+import numpy as np
 
 from src.score import Score
 from src.score_category import ScoreCategory
@@ -118,4 +120,88 @@ def score_yahtzee(roll: list[int]) -> Score | None:
     if len(set(roll)) == 1:
         return Score(ScoreCategory.YAHTZEE, roll, 50)
     
-    return None
\ No newline at end of file
+    return None
+
+def has_small_straight(counts: Sequence[int]) -> bool:
+    """Check whether face counts contain a small straight.
+
+    Args:
+        counts (Sequence[int]): The number of dice showing each face, ones first.
+
+    Returns:
+        bool: True if four consecutive faces are all present.
+    """
+    return any(all(counts[start:start + 4]) for start in range(3))
+
+def has_large_straight(counts: Sequence[int]) -> bool:
+    """Check whether face counts are exactly a large straight.
+
+    Args:
+        counts (Sequence[int]): The number of dice showing each face, ones first.
+
+    Returns:
+        bool: True if the faces present are exactly 1-5 or exactly 2-6.
+    """
+    present = [count > 0 for count in counts]
+    return present == [True] * 5 + [False] or present == [False] + [True] * 5
+
+def score_face_counts(counts: Sequence[int]) -> list[int]:
+    """Calculate the points of every category from a roll's face counts.
+
+    The counts are taken once, so this is the cheap way to score a roll that
+    is not in the precomputed table. It agrees with CATEGORY_SCORERS for any
+    number of dice with values 1-6.
+
+    Args:
+        counts (Sequence[int]): The number of dice showing each face, ones first.
+
+    Returns:
+        list[int]: The points for each category in ScoreCategory order, 0 where
+            the category does not score.
+    """
+    total = sum(face * count for face, count in enumerate(counts, start=1))
+    most = max(counts)
+    nonzero = sorted(count for count in counts if count)
+
+    return [
+        *(face * count for face, count in enumerate(counts, start=1)),
+        total if most >= 3 else 0,
+        total if most >= 4 else 0,
+        25 if nonzero == [2, 3] else 0,
+        30 if has_small_straight(counts) else 0,
+        40 if has_large_straight(counts) else 0,
+        50 if len(nonzero) == 1 else 0,
+        total,
+    ]
+
+def score_face_counts_batch(counts: np.ndarray) -> np.ndarray:
+    """Calculate the points of every category for a batch of face counts.
+
+    Args:
+        counts (np.ndarray): An (N, 6) array of face counts, ones first.
+
+    Returns:
+        np.ndarray: An (N, 13) array of points, with columns in ScoreCategory
+            order and 0 where a category does not score.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    upper = counts * np.arange(1, 7)
+    total = upper.sum(axis=1)
+    most = counts.max(axis=1)
+    present = counts > 0
+    distinct = present.sum(axis=1)
+
+    small_straight = present[:, 0:4].all(axis=1) | present[:, 1:5].all(axis=1) | present[:, 2:6].all(axis=1)
+    large_straight = (distinct == 5) & (present[:, 0:5].all(axis=1) | present[:, 1:6].all(axis=1))
+    full_house = (distinct == 2) & (most == 3) & (counts.sum(axis=1) == 5)
+
+    return np.column_stack([
+        upper,
+        np.where(most >= 3, total, 0),
+        np.where(most >= 4, total, 0),
+        np.where(full_house, 25, 0),
+        np.where(small_straight, 30, 0),
+        np.where(large_straight, 40, 0),
+        np.where(distinct == 1, 50, 0),
+        total,
+    ])
@@ -1,26 +1,154 @@
+from functools import cache
+
 import numpy as np
 
+from src.alias_table import AliasTable
+from src.roll_encoding import DIE_FACES, NUM_DICE, ROLL_ARRAY, ROLL_INDEX, ROLLS, encode_rolls
+from src.roll_table import KEEP_INDEX, KEEP_PROBABILITIES, ROLL_KEEPS, ROLL_PROBABILITIES
+
+_ROLL_DICE = ROLL_ARRAY.astype(np.int64)
+_MASK_BITS = 1 << np.arange(NUM_DICE)
+
+# Philox counters are four 64-bit words, incremented from the lowest. Positional draws put
+# the turn and roll in word 1 and the game in word 2, leaving word 0 free for the draws
+# themselves, and set word 3 so they never meet the sequential stream, which starts at 0.
+_MAX_POSITION = 2 ** 32
+_MAX_GAME = 2 ** 64
+
+
+@cache
+def _roll_sampler() -> AliasTable:
+    """
+    Builds the alias table over the 252 sorted rolls on first use.
+    :return: The shared roll sampler.
+    """
+    return AliasTable(ROLL_PROBABILITIES)
+
+
+@cache
+def _keep_sampler() -> AliasTable:
+    """
+    Builds one alias table per keep over the 252 sorted rolls on first use.
+    :return: The shared reroll sampler.
+    """
+    return AliasTable(KEEP_PROBABILITIES)
+
+
 class DiceRoller:
     """
     A class to simulate rolling and rerolling dice.
     """
-    def __init__(self, num_dice: int = 5, die_size: int = 6, seed: int =None) -> None:
+    def __init__(self, num_dice: int = 5, die_size: int = 6, seed: int | np.random.SeedSequence = None,
+                 use_alias: bool = False, counter_based: bool = False) -> None:
         """
         Initialize the DiceRoller with a specified number of dice and an optional random seed.
         :param num_dice: Number of dice used in a roll.
-        :param seed: Optional seed for the random number generator.
+        :param seed: Optional seed for the random number generator, an integer or a SeedSequence.
+        :param use_alias: Draw each sorted roll directly from an alias table over the 252
+            possible outcomes, with one uniform variate per roll, instead of rolling and
+            sorting individual dice. The rolls follow the same distribution but a different
+            sequence for a given seed. Only five six-sided dice are supported.
+        :param counter_based: Use the counter-based Philox generator, which also allows any
+            roll of any game to be drawn directly with roll_at() and reroll_at().
+        :raises ValueError: If use_alias is set for anything but five six-sided dice.
         """
+        if use_alias and (num_dice, die_size) != (NUM_DICE, DIE_FACES):
+            raise ValueError("The alias sampler only supports five six-sided dice.")
+
         self.num_dice = num_dice
         self.die_size = die_size
-        self.rng = np.random.default_rng(seed)
+        self.use_alias = use_alias
+        self.counter_based = counter_based
+        # Kept so a run can be replayed: its entropy recovers an unseeded roller's seed.
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+        if counter_based:
+            self.rng = np.random.Generator(np.random.Philox(self.seed_sequence))
+            self._key = self.rng.bit_generator.state['state']['key']
+        else:
+            self.rng = np.random.default_rng(self.seed_sequence)
+
+    @classmethod
+    def spawn(cls, seed: int | np.random.SeedSequence | None, n: int, **kwargs) -> list['DiceRoller']:
+        """
+        Creates rollers on n independent child streams of one root seed, for example one
+        per worker or per game. Child streams do not overlap or correlate with each other.
+        :param seed: The root seed, or a SeedSequence to spawn from. Spawning from the same
+            SeedSequence again continues with new children.
+        :param n: Number of rollers.
+        :param kwargs: Other DiceRoller arguments, applied to every roller.
+        :return: The rollers, in child order.
+        """
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        return [cls(seed=child, **kwargs) for child in root.spawn(n)]
+
+    @classmethod
+    def for_stream(cls, seed: int | np.random.SeedSequence, index: int, **kwargs) -> 'DiceRoller':
+        """
+        Creates the roller for one child stream of a root seed directly, without spawning
+        the streams before it. It draws the same sequence as spawn(seed, n)[index] for a
+        freshly created root, so any share of the streams can be rebuilt anywhere.
+        :param seed: The root seed, or the root SeedSequence.
+        :param index: The child stream.
+        :param kwargs: Other DiceRoller arguments.
+        :return: The roller.
+        """
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        child = np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (index,), pool_size=root.pool_size)
+        return cls(seed=child, **kwargs)
 
     def roll(self) -> list[int]:
         """
         Roll the specified number of dice.
         :return: A list of integers representing the result of each die rolled.
         """
+        if self.use_alias:
+            return list(ROLLS[_roll_sampler().sample_one(self.rng)])
+
         return sorted(self._roll_dice(self.num_dice))
-    
+
+    def roll_many(self, n: int) -> np.ndarray:
+        """
+        Roll the dice n times with a single generator call.
+        The rolls are the same as n consecutive calls to roll() would produce.
+        :param n: Number of rolls.
+        :return: An (n, num_dice) array with each row sorted in ascending order.
+        """
+        if self.use_alias:
+            return _ROLL_DICE[_roll_sampler().sample(self.rng, size=n)]
+
+        dice = self._draw((n, self.num_dice))
+        dice.sort(axis=1)
+        return dice
+
+    def roll_rank(self) -> int:
+        """
+        Roll five six-sided dice and return the rank of the sorted roll.
+        In alias mode the rank is drawn directly, without producing dice.
+        :return: The roll rank, from 0 to 251.
+        :raises ValueError: If the roller is not configured for five six-sided dice.
+        """
+        self._require_standard_dice()
+
+        if self.use_alias:
+            return _roll_sampler().sample_one(self.rng)
+
+        return ROLL_INDEX[tuple(self._roll_dice(self.num_dice))]
+
+    def roll_many_ranks(self, n: int) -> np.ndarray:
+        """
+        Roll five six-sided dice n times and return the ranks of the sorted rolls.
+        :param n: Number of rolls.
+        :return: An (n,) uint8 array of roll ranks.
+        :raises ValueError: If the roller is not configured for five six-sided dice.
+        """
+        self._require_standard_dice()
+
+        if self.use_alias:
+            return _roll_sampler().sample(self.rng, size=n).astype(np.uint8)
+
+        return encode_rolls(self._draw((n, self.num_dice)))
+
     def reroll(self, dice: list[int], indices: list[int]) -> list[int]:
         """
         Reroll specific dice based on their indices.
@@ -28,6 +156,14 @@ class DiceRoller:
         :param indices: List of indices of dice to reroll.
         :return: A new list of integers representing the updated dice values after rerolling.
         """
+        if self.use_alias and len(dice) == self.num_dice:
+            rerolled = {index for index in indices if 0 <= index < self.num_dice}
+            kept = tuple(sorted(die for position, die in enumerate(dice) if position not in rerolled))
+            keep = KEEP_INDEX.get(kept)
+
+            if keep is not None:
+                return list(ROLLS[_keep_sampler().sample_one(self.rng, keep)])
+
         new_dice = dice.copy()
         
         # Reroll the specified dice
@@ -39,11 +175,112 @@ class DiceRoller:
                 
         # Return the new sorted list of dice
         return sorted(new_dice)
-        
+
+    def reroll_many(self, dice: np.ndarray, keep_mask: np.ndarray) -> np.ndarray:
+        """
+        Reroll every unkept die across many hands with a single generator call.
+        The result matches calling reroll() row by row with the unkept indices in ascending order.
+        :param dice: An (n, num_dice) array of current dice values.
+        :param keep_mask: An (n, num_dice) boolean array, True for dice to keep.
+        :return: A new (n, num_dice) array with the unkept dice rerolled and each row sorted.
+        :raises ValueError: If the arrays do not both have shape (n, num_dice).
+        """
+        dice = np.asarray(dice)
+        keep_mask = np.asarray(keep_mask, dtype=bool)
+
+        if dice.ndim != 2 or dice.shape[1] != self.num_dice:
+            raise ValueError(f"dice must have shape (n, {self.num_dice}), got {dice.shape}.")
+
+        if keep_mask.shape != dice.shape:
+            raise ValueError(f"keep_mask must have shape {dice.shape}, got {keep_mask.shape}.")
+
+        if self.use_alias:
+            order = np.argsort(dice, axis=1, kind="stable")
+            sorted_dice = np.take_along_axis(dice, order, axis=1)
+            sorted_keep = np.take_along_axis(keep_mask, order, axis=1)
+            keeps = ROLL_KEEPS[encode_rolls(sorted_dice), sorted_keep @ _MASK_BITS]
+            return _ROLL_DICE[_keep_sampler().sample(self.rng, keeps)]
+
+        reroll_mask = ~keep_mask
+        new_dice = dice.copy()
+        new_dice[reroll_mask] = self._draw(int(reroll_mask.sum()))
+        new_dice.sort(axis=1)
+        return new_dice
+
+    def roll_at(self, game: int, turn: int, roll_number: int = 0) -> list[int]:
+        """
+        Roll the dice for one position in a run directly, in constant time, without drawing
+        any of the rolls before it. The same seed and position always give the same dice,
+        so a game can be replayed from its seed and decisions alone.
+        :param game: The game number.
+        :param turn: The turn number within the game.
+        :param roll_number: The roll within the turn, 0 for the first roll.
+        :return: A sorted list of dice values.
+        :raises ValueError: If the roller is not counter-based or the position is out of range.
+        """
+        return sorted(self._dice_at(game, turn, roll_number))
+
+    def reroll_at(self, dice: list[int], indices: list[int], game: int, turn: int, roll_number: int) -> list[int]:
+        """
+        Reroll specific dice with the draws for one position in a run, in constant time.
+        The rerolled dice take the position's draws in the order of their indices.
+        :param dice: The current list of dice values.
+        :param indices: List of indices of dice to reroll.
+        :param game: The game number.
+        :param turn: The turn number within the game.
+        :param roll_number: The roll within the turn, 1 or 2 for the rerolls.
+        :return: A new sorted list of dice values.
+        :raises ValueError: If the roller is not counter-based or the position is out of range.
+        """
+        draws = iter(self._dice_at(game, turn, roll_number))
+        new_dice = dice.copy()
+
+        for index in indices:
+            if 0 <= index < self.num_dice:
+                new_dice[index] = next(draws)
+
+        return sorted(new_dice)
+
+    def _dice_at(self, game: int, turn: int, roll_number: int) -> list[int]:
+        """
+        Draws one die per die in a roll from the Philox stream at a position in a run.
+        :param game: The game number.
+        :param turn: The turn number within the game.
+        :param roll_number: The roll within the turn.
+        :return: The dice, in draw order.
+        :raises ValueError: If the roller is not counter-based or the position is out of range.
+        """
+        if not self.counter_based:
+            raise ValueError("Rolls can only be drawn by position with a counter-based roller.")
+
+        if not (0 <= game < _MAX_GAME and 0 <= turn < _MAX_POSITION and 0 <= roll_number < _MAX_POSITION):
+            raise ValueError(f"Game, turn and roll are out of range, got {(game, turn, roll_number)}.")
+
+        counter = [0, turn * _MAX_POSITION + roll_number, game, 1]
+        rng = np.random.Generator(np.random.Philox(counter=counter, key=self._key))
+        return rng.integers(1, self.die_size + 1, size=self.num_dice).tolist()
+
+    def _require_standard_dice(self) -> None:
+        """
+        Ensures the roller throws five six-sided dice, as roll ranks require.
+        :raises ValueError: If the roller uses any other dice.
+        """
+        if (self.num_dice, self.die_size) != (NUM_DICE, DIE_FACES):
+            raise ValueError("Roll ranks are only defined for five six-sided dice.")
+
     def _roll_dice(self, num: int = 1) -> list[int]:
         """
         Roll a specified number of dice.
         :param num: Number of dice to roll.
         :return: A list of integers representing the result of each die rolled.
         """
-        return self.rng.integers(1, self.die_size + 1, size=num).tolist()
\ No newline at end of file
+        return self._draw(num).tolist()
+
+    def _draw(self, size: int | tuple[int, ...]) -> np.ndarray:
+        """
+        Draws dice values from the generator. Every die rolled outside the alias sampler
+        comes from here, in order, so the rolls form one stream of dice whatever the calls.
+        :param size: The number of dice, or the shape of the array to fill.
+        :return: A new array of dice values.
+        """
+        return self.rng.integers(1, self.die_size + 1, size=size)
\ No newline at end of file
@@ -0,0 +1,347 @@
+import os
+import struct
+import tempfile
+from collections.abc import Iterable
+
+import numpy as np
+
+from src.roll_encoding import NUM_DICE, ROLL_COUNTS, ROLLS, encode_roll
+from src.roll_table import KEEP_INDEX, KEEP_MASKS, KEEP_PROBABILITIES, KEEPS, ROLL_KEEPS, SCORE_TABLE
+from src.score import Score
+from src.score_card import UPPER_SECTION, UPPER_SECTION_BONUS, UPPER_SECTION_BONUS_THRESHOLD, YAHTZEE_BONUS, ScoreCard
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.utils import default_file_mode
+
+NUM_TURNS = len(ScoreCategory)
+MAX_ROLLS = 3
+
+# Each game is a fixed-size record: the rank of every roll of every turn, then one 16-bit
+# word per turn. A keep is stored as a delta against the roll it was taken from, the 5-bit
+# mask of that sorted roll's positions held, so the kept dice themselves never need storing.
+# Turn word bits: 0-4 the first keep, 5-9 the second keep, 10-13 the category column and
+# 14-15 the number of rolls. The final score card follows from the last roll and category
+# of each turn, so it is rebuilt rather than stored.
+RECORD_DTYPE = np.dtype([('rolls', 'u1', (NUM_TURNS, MAX_ROLLS)), ('turns', '<u2', (NUM_TURNS,))])
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+# Game files are a header followed by the records, which are memory-mapped in place.
+MAGIC = b"YAHTGAME"
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIQ")
+
+_CATEGORIES = tuple(ScoreCategory)
+_UPPER_COLUMNS = np.array([category in UPPER_SECTION for category in _CATEGORIES])
+_YAHTZEE_COLUMN = CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+_IS_YAHTZEE = ROLL_COUNTS.max(axis=1) == NUM_DICE
+_KEEP_BITS = 5
+_MASK = (1 << _KEEP_BITS) - 1
+
+
+class TurnRecord:
+    """
+    One turn of a played game: the rolls thrown, the dice kept before each reroll and the
+    category the last roll was scored in.
+    """
+    __slots__ = ('rolls', 'keeps', 'category')
+
+    def __init__(self, rolls: list[list[int]], keeps: list[list[int]], category: ScoreCategory) -> None:
+        """
+        Initializes a TurnRecord.
+        :param rolls: The one to three rolls of the turn, five dice each.
+        :param keeps: The dice held from each roll but the last, one fewer than the rolls.
+        :param category: The category the last roll was scored in.
+        """
+        self.rolls = rolls
+        self.keeps = keeps
+        self.category = category
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares two TurnRecords by value.
+        :param other: The object to compare with.
+        :return: True if both have the same rolls, keeps and category.
+        """
+        if not isinstance(other, TurnRecord):
+            return NotImplemented
+
+        return (self.rolls, self.keeps, self.category) == (other.rolls, other.keeps, other.category)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the TurnRecord instance.
+        :return: A string representing the TurnRecord instance.
+        """
+        return f"TurnRecord(rolls={self.rolls}, keeps={self.keeps}, category={self.category})"
+
+
+class GameRecord:
+    """
+    A complete played game of 13 turns, from which its final score card can be rebuilt.
+    """
+    __slots__ = ('turns',)
+
+    def __init__(self, turns: list[TurnRecord]) -> None:
+        """
+        Initializes a GameRecord.
+        :param turns: The 13 turns, in the order they were played.
+        """
+        self.turns = turns
+
+    def score_card(self) -> ScoreCard:
+        """
+        Replays the game's scoring onto a new score card.
+        :return: The final ScoreCard, holding the sorted final roll of each turn.
+        :raises ValueError: If a category is scored twice.
+        """
+        card = ScoreCard()
+
+        for turn in self.turns:
+            rank = encode_roll(turn.rolls[-1])
+            card.assign_score(Score.from_rank(turn.category, rank, int(SCORE_TABLE[rank, CATEGORY_INDEX[turn.category]])))
+
+        return card
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares two GameRecords by value.
+        :param other: The object to compare with.
+        :return: True if both have the same turns.
+        """
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+
+        return self.turns == other.turns
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the GameRecord instance.
+        :return: A string representing the GameRecord instance.
+        """
+        return f"GameRecord(turns={self.turns})"
+
+
+class GameRecordBatch:
+    """
+    Many decoded game records, held as one array per field. Rolls are roll ranks, keeps are
+    indices into KEEPS and categories are columns in ScoreCategory order.
+    """
+    __slots__ = ('rolls', 'roll_counts', 'keeps', 'categories')
+
+    def __init__(self, records: np.ndarray) -> None:
+        """
+        Unpacks an array of packed records.
+        :param records: A (G,) array of RECORD_DTYPE records.
+        :raises ValueError: If a record holds an invalid category, roll count or roll rank.
+        """
+        words = records['turns'].astype(np.intp)
+        self.rolls: np.ndarray = records['rolls']
+        self.roll_counts: np.ndarray = (words >> 14).astype(np.uint8)
+        self.categories: np.ndarray = (words >> 2 * _KEEP_BITS & 0xF).astype(np.uint8)
+
+        if len(records) and (self.categories.max() >= NUM_TURNS or self.roll_counts.min() < 1
+                             or self.rolls.max() >= len(ROLLS)):
+            raise ValueError("Game records hold an invalid category, roll count or roll rank.")
+
+        masks = np.stack([words & _MASK, words >> _KEEP_BITS & _MASK], axis=2)
+        self.keeps: np.ndarray = ROLL_KEEPS[self.rolls[:, :, :MAX_ROLLS - 1], masks]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of games.
+        :return: The number of games in the batch.
+        """
+        return len(self.rolls)
+
+    @property
+    def final_ranks(self) -> np.ndarray:
+        """
+        The rank of the roll scored in each turn.
+        :return: A (G, 13) uint8 array of roll ranks.
+        """
+        return np.take_along_axis(self.rolls, self.roll_counts[:, :, np.newaxis].astype(np.intp) - 1, axis=2)[:, :, 0]
+
+    @property
+    def points(self) -> np.ndarray:
+        """
+        The points scored in each turn, before bonuses.
+        :return: A (G, 13) integer array.
+        """
+        return SCORE_TABLE[self.final_ranks, self.categories]
+
+    @property
+    def yahtzee_bonus_counts(self) -> np.ndarray:
+        """
+        The Yahtzee bonuses earned in each game: Yahtzees scored in another category once
+        the Yahtzee box has been filled.
+        :return: A (G,) integer array.
+        """
+        yahtzee_turns = (self.categories == _YAHTZEE_COLUMN).argmax(axis=1)
+        later = np.arange(NUM_TURNS) > yahtzee_turns[:, np.newaxis]
+        return (later & _IS_YAHTZEE[self.final_ranks]).sum(axis=1)
+
+    @property
+    def totals(self) -> np.ndarray:
+        """
+        The final total score of each game, including bonuses.
+        :return: A (G,) integer array.
+        """
+        points = self.points.astype(np.int64)
+        upper = np.where(_UPPER_COLUMNS[self.categories], points, 0).sum(axis=1)
+        bonus = np.where(upper >= UPPER_SECTION_BONUS_THRESHOLD, UPPER_SECTION_BONUS, 0)
+        return points.sum(axis=1) + bonus + self.yahtzee_bonus_counts * YAHTZEE_BONUS
+
+    def record(self, index: int) -> GameRecord:
+        """
+        Rebuilds one game as a GameRecord. Rolls and keeps come back sorted.
+        :param index: The game to rebuild.
+        :return: The GameRecord.
+        """
+        turns = []
+
+        for turn in range(NUM_TURNS):
+            count = int(self.roll_counts[index, turn])
+            turns.append(TurnRecord(
+                [list(ROLLS[rank]) for rank in self.rolls[index, turn, :count]],
+                [list(KEEPS[keep]) for keep in self.keeps[index, turn, :count - 1]],
+                _CATEGORIES[self.categories[index, turn]]
+            ))
+
+        return GameRecord(turns)
+
+
+def _pack_game(record: GameRecord, out: np.ndarray) -> None:
+    """
+    Packs one game into a record.
+    :param record: The game to pack.
+    :param out: The zeroed RECORD_DTYPE record to fill.
+    :raises ValueError: If the game is not 13 turns scoring each category once, or a turn's
+        rolls and keeps are inconsistent.
+    """
+    if len(record.turns) != NUM_TURNS or len({turn.category for turn in record.turns}) != NUM_TURNS:
+        raise ValueError(f"A game must have {NUM_TURNS} turns, scoring each category once.")
+
+    for index, turn in enumerate(record.turns):
+        if not 1 <= len(turn.rolls) <= MAX_ROLLS or len(turn.keeps) != len(turn.rolls) - 1:
+            raise ValueError(f"Turn {index} must have 1 to {MAX_ROLLS} rolls and one keep before each reroll.")
+
+        ranks = [encode_roll(roll) for roll in turn.rolls]
+        word = len(ranks) << 14 | CATEGORY_INDEX[turn.category] << 2 * _KEEP_BITS
+
+        for position, (kept, rank, next_rank) in enumerate(zip(turn.keeps, ranks, ranks[1:])):
+            keep = KEEP_INDEX.get(tuple(sorted(kept)))
+            mask = -1 if keep is None else int(KEEP_MASKS[rank, keep])
+
+            if mask < 0 or not KEEP_PROBABILITIES[keep, next_rank]:
+                raise ValueError(f"Turn {index} keeps {kept}, which its rolls do not allow.")
+
+            word |= mask << position * _KEEP_BITS
+
+        out['rolls'][index, :len(ranks)] = ranks
+        out['turns'][index] = word
+
+
+def encode_games(records: Iterable[GameRecord]) -> bytes:
+    """
+    Packs games into consecutive fixed-size records of RECORD_SIZE bytes each.
+    :param records: The games to pack.
+    :return: The packed records.
+    :raises ValueError: If a game is incomplete or inconsistent.
+    """
+    records = list(records)
+    packed = np.zeros(len(records), dtype=RECORD_DTYPE)
+
+    for index, record in enumerate(records):
+        _pack_game(record, packed[index])
+
+    return packed.tobytes()
+
+
+def decode_games(data: bytes | memoryview | np.ndarray) -> GameRecordBatch:
+    """
+    Unpacks consecutive packed records into arrays, without building a GameRecord per game.
+    :param data: The packed records, as a bytes-like object or a RECORD_DTYPE array.
+    :return: The decoded GameRecordBatch.
+    :raises ValueError: If the data is not a whole number of valid records.
+    """
+    if isinstance(data, np.ndarray) and data.dtype == RECORD_DTYPE:
+        return GameRecordBatch(data)
+
+    if len(memoryview(data).cast("B")) % RECORD_SIZE:
+        raise ValueError(f"Game records must be a multiple of {RECORD_SIZE} bytes.")
+
+    return GameRecordBatch(np.frombuffer(data, dtype=RECORD_DTYPE))
+
+
+def encode_game(record: GameRecord) -> bytes:
+    """
+    Packs one game into RECORD_SIZE bytes.
+    :param record: The game to pack.
+    :return: The packed record.
+    :raises ValueError: If the game is incomplete or inconsistent.
+    """
+    return encode_games([record])
+
+
+def decode_game(data: bytes) -> GameRecord:
+    """
+    Unpacks one packed game.
+    :param data: The RECORD_SIZE bytes of the record.
+    :return: The GameRecord, with its rolls and keeps sorted.
+    :raises ValueError: If the data is not exactly one valid record.
+    """
+    if len(data) != RECORD_SIZE:
+        raise ValueError(f"A game record must be {RECORD_SIZE} bytes, got {len(data)}.")
+
+    return decode_games(data).record(0)
+
+
+def write_game_file(path: str, records: Iterable[GameRecord]) -> None:
+    """
+    Writes games to a game file. The file is written beside its destination and renamed
+    into place, so readers never see a partial file.
+    :param path: The path to write.
+    :param records: The games to write.
+    :raises ValueError: If a game is incomplete or inconsistent.
+    """
+    packed = encode_games(records)
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+
+    try:
+        with os.fdopen(handle, "wb") as file:
+            os.fchmod(file.fileno(), default_file_mode())
+            file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(packed) // RECORD_SIZE).ljust(HEADER_SIZE, b"\0"))
+            file.write(packed)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def open_game_file(path: str) -> GameRecordBatch:
+    """
+    Maps a game file read-only and decodes it in one pass.
+    :param path: The path of the game file.
+    :return: The decoded GameRecordBatch.
+    :raises ValueError: If the file is not a game file, uses another format version, or is truncated.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        size = os.fstat(file.fileno()).st_size
+
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a game file.")
+
+    _, format_version, count = _HEADER.unpack_from(header)
+
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"{path} uses format version {format_version}, expected {FORMAT_VERSION}.")
+
+    if size != HEADER_SIZE + count * RECORD_SIZE:
+        raise ValueError(f"{path} should be {HEADER_SIZE + count * RECORD_SIZE} bytes, got {size}.")
+
+    if not count:
+        return GameRecordBatch(np.zeros(0, dtype=RECORD_DTYPE))
+
+    return GameRecordBatch(np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,)))
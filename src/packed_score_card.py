@@ -0,0 +1,154 @@
+from src.roll_encoding import ROLLS
+from src.roll_table import SCORE_TABLE
+from src.score import Score
+from src.score_card import (
+    UPPER_SECTION, UPPER_SECTION_BONUS, UPPER_SECTION_BONUS_THRESHOLD, YAHTZEE_BONUS, ScoreCard
+)
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+
+_CATEGORIES = tuple(ScoreCategory)
+_UPPER_SECTION_BITS = sum(1 << CATEGORY_INDEX[category] for category in UPPER_SECTION)
+_YAHTZEE_BIT = 1 << CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+_YAHTZEE_RANKS = frozenset(rank for rank, roll in enumerate(ROLLS) if len(set(roll)) == 1)
+_MAX_POINTS = 255
+
+
+class PackedScoreCard:
+    """
+    A compact score card that stores only packed integers rather than Score objects.
+    Follows the same scoring and bonus rules as ScoreCard, but keeps the total up to date
+    on every assignment so reading it is O(1).
+    """
+    __slots__ = ('filled', 'upper_subtotal', 'points', 'yahtzee_bonus_count', '_total')
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty PackedScoreCard.
+        """
+        # Bit i is set once the i-th category in ScoreCategory order has been scored.
+        self.filled: int = 0
+        self.upper_subtotal: int = 0
+        # Every category scores at most 50 points, so one byte per category is enough.
+        self.points: bytearray = bytearray(len(_CATEGORIES))
+        self.yahtzee_bonus_count: int = 0
+        self._total: int = 0
+
+    def available_categories(self) -> list[ScoreCategory]:
+        """
+        Returns a list of categories that have not yet been scored.
+        :return: A list of available ScoreCategory enums.
+        """
+        return [category for index, category in enumerate(_CATEGORIES) if not self.filled >> index & 1]
+
+    def is_filled(self, category: ScoreCategory) -> bool:
+        """
+        Checks whether a category has been scored.
+        :param category: The scoring category to check.
+        :return: True if the category has been scored.
+        """
+        return bool(self.filled >> CATEGORY_INDEX[category] & 1)
+
+    def assign_score(self, score: Score) -> None:
+        """
+        Assigns a score to the appropriate category on the score card.
+        :param score: The Score object to assign. Only its points are kept.
+        :raises ValueError: If the category has already been scored or the points do not fit.
+        """
+        self._assign(score.category, score.points, ScoreCard.is_yahtzee(score.roll))
+
+    def assign_rank(self, category: ScoreCategory, rank: int) -> None:
+        """
+        Scores a roll, given by its rank, in a category without building a Score.
+        :param category: The scoring category.
+        :param rank: The roll rank, from 0 to 251.
+        :raises ValueError: If the rank is out of range or the category has already been scored.
+        """
+        if not 0 <= rank < len(ROLLS):
+            raise ValueError(f"Roll rank must be between 0 and {len(ROLLS) - 1}, got {rank}.")
+
+        points = int(SCORE_TABLE[rank, CATEGORY_INDEX[category]])
+        self._assign(category, points, rank in _YAHTZEE_RANKS)
+
+    def _assign(self, category: ScoreCategory, points: int, is_yahtzee: bool) -> None:
+        """
+        Records points in a category and updates the bonuses and running total.
+        :param category: The scoring category.
+        :param points: The points scored.
+        :param is_yahtzee: Whether the scored roll is a Yahtzee.
+        :raises ValueError: If the category has already been scored or the points do not fit.
+        """
+        index = CATEGORY_INDEX[category]
+        bit = 1 << index
+
+        if self.filled & bit:
+            raise ValueError(f"Category {category} has already been scored.")
+
+        if not 0 <= points <= _MAX_POINTS:
+            raise ValueError(f"Points must be between 0 and {_MAX_POINTS}, got {points}.")
+
+        if is_yahtzee and self.filled & _YAHTZEE_BIT and category != ScoreCategory.YAHTZEE:
+            # If Yahtzee category is already filled, award a Yahtzee bonus
+            self.yahtzee_bonus_count += 1
+            self._total += YAHTZEE_BONUS
+
+        if bit & _UPPER_SECTION_BITS:
+            before = self.upper_subtotal
+            self.upper_subtotal += points
+
+            if before < UPPER_SECTION_BONUS_THRESHOLD <= self.upper_subtotal:
+                self._total += UPPER_SECTION_BONUS
+
+        self.filled |= bit
+        self.points[index] = points
+        self._total += points
+
+    def get_points(self, category: ScoreCategory) -> int | None:
+        """
+        Retrieves the points scored in a specific category.
+        :param category: The scoring category to retrieve.
+        :return: The points for the category, or None if not scored yet.
+        """
+        index = CATEGORY_INDEX[category]
+        return self.points[index] if self.filled >> index & 1 else None
+
+    @property
+    def upper_section_bonus_awarded(self) -> bool:
+        """
+        Whether the upper section bonus has been achieved.
+        :return: True if the upper section subtotal has reached the bonus threshold.
+        """
+        return self.upper_subtotal >= UPPER_SECTION_BONUS_THRESHOLD
+
+    @property
+    def total_score(self) -> int:
+        """
+        The total score, including any bonuses, maintained as scores are assigned.
+        :return: The total score as an integer.
+        """
+        return self._total
+
+    @classmethod
+    def from_score_card(cls, card: ScoreCard) -> 'PackedScoreCard':
+        """
+        Packs an existing ScoreCard, keeping its points and Yahtzee bonuses.
+        :param card: The ScoreCard to pack.
+        :return: An equivalent PackedScoreCard.
+        :raises ValueError: If a category holds points that do not fit.
+        """
+        packed = cls()
+
+        for category, score in card.scores.items():
+            if score is not None:
+                packed._assign(category, score.points, False)
+
+        packed.yahtzee_bonus_count = card.yahtzee_bonus_count
+        packed._total += card.yahtzee_bonus_count * YAHTZEE_BONUS
+        return packed
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the PackedScoreCard instance.
+        :return: A string representing the PackedScoreCard instance.
+        """
+        scores = {category: self.get_points(category) for category in _CATEGORIES}
+        return f"PackedScoreCard(scores={scores}, yahtzee_bonus_count={self.yahtzee_bonus_count})"
@@ -0,0 +1,99 @@
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+
+from src.roll_encoding import ROLLS, encode_roll
+from src.roll_table import KEEP_INDEX, KEEP_TRANSITIONS, ROLL_KEEPS, SCORE_TABLE
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+
+# A keep strategy is given the sorted roll and the rerolls left, and returns the dice to hold.
+KeepStrategy = Callable[[tuple[int, ...], int], tuple[int, ...]]
+
+_ROLL_KEEP_SETS = [frozenset(keeps) for keeps in ROLL_KEEPS.tolist()]
+
+
+def probability_of(category: ScoreCategory, roll: list[int], keep_strategy: KeepStrategy | None = None,
+                   rerolls_left: int = 2, exact: bool = False) -> float | Fraction:
+    """
+    Computes the chance of ending the turn with a roll that scores in a category, by
+    dynamic programming over the 252 sorted rolls rather than by simulation. The table for
+    each category, strategy and number of rerolls is built once and cached, so repeated
+    queries are lookups.
+    :param category: The category to make.
+    :param roll: The five dice showing, in any order.
+    :param keep_strategy: Chooses the dice to hold before each reroll, or None to hold
+        whatever maximizes the chance of making the category. Holding all five dice stands.
+    :param rerolls_left: How many rerolls remain this turn.
+    :param exact: Return the probability as an exact Fraction instead of a float.
+    :return: The probability of finishing with a nonzero score in the category.
+    :raises ValueError: If the roll is invalid, rerolls_left is negative, or the strategy
+        holds dice that are not in the roll.
+    """
+    if rerolls_left < 0:
+        raise ValueError(f"Rerolls left must not be negative, got {rerolls_left}.")
+
+    probability = _chance_table(category, keep_strategy, rerolls_left, exact)[encode_roll(roll)]
+    return probability if exact else float(probability)
+
+
+@lru_cache(maxsize=256)
+def _chance_table(category: ScoreCategory, keep_strategy: KeepStrategy | None, rerolls_left: int,
+                  exact: bool) -> np.ndarray | tuple[Fraction, ...]:
+    """
+    Computes the chance of making a category from every sorted roll.
+    :param category: The category to make.
+    :param keep_strategy: The keep strategy, or None for the one that maximizes the chance.
+    :param rerolls_left: How many rerolls remain.
+    :param exact: Build the table from Fractions instead of floats.
+    :return: The probability for each roll rank: a read-only float array, or a tuple of Fractions.
+    :raises ValueError: If the strategy holds dice that are not in the roll.
+    """
+    if rerolls_left == 0:
+        scored = SCORE_TABLE[:, CATEGORY_INDEX[category]] > 0
+        return tuple(Fraction(int(made)) for made in scored) if exact else _read_only(scored.astype(np.float64))
+
+    previous = _chance_table(category, keep_strategy, rerolls_left - 1, exact)
+
+    if keep_strategy is None:
+        if exact:
+            keeps = [KEEP_TRANSITIONS.exact_expectation(keep, previous) for keep in range(KEEP_TRANSITIONS.shape[0])]
+            return tuple(max(keeps[keep] for keep in choices) for choices in _ROLL_KEEP_SETS)
+
+        return _read_only(KEEP_TRANSITIONS.expectation(previous)[ROLL_KEEPS].max(axis=1))
+
+    keeps = [_strategy_keep(keep_strategy, rank, rerolls_left) for rank in range(len(ROLLS))]
+
+    if exact:
+        return tuple(KEEP_TRANSITIONS.exact_expectation(keep, previous) for keep in keeps)
+
+    return _read_only(np.array([KEEP_TRANSITIONS.row_expectation(keep, previous) for keep in keeps]))
+
+
+def _strategy_keep(keep_strategy: KeepStrategy, rank: int, rerolls_left: int) -> int:
+    """
+    Asks a keep strategy what to hold from a roll.
+    :param keep_strategy: The keep strategy.
+    :param rank: The roll rank.
+    :param rerolls_left: How many rerolls remain.
+    :return: The index of the keep in KEEPS.
+    :raises ValueError: If the strategy holds dice that are not in the roll.
+    """
+    kept = tuple(sorted(keep_strategy(ROLLS[rank], rerolls_left)))
+    keep = KEEP_INDEX.get(kept)
+
+    if keep is None or keep not in _ROLL_KEEP_SETS[rank]:
+        raise ValueError(f"Cannot keep {kept} from the roll {ROLLS[rank]}.")
+
+    return keep
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """
+    Marks a cached table read-only so callers cannot corrupt it.
+    :param array: The table.
+    :return: The same array.
+    """
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,182 @@
+from itertools import combinations_with_replacement, product
+
+import numpy as np
+
+NUM_DICE = 5
+DIE_FACES = 6
+
+# Every distinct sorted 5d6 roll, in lexicographic order. A roll's position in this
+# list is its rank: a canonical encoding of the roll as an integer from 0 to 251 that
+# fits in a uint8 and is used as the row index into the precomputed roll tables.
+ROLLS: list[tuple[int, ...]] = list(combinations_with_replacement(range(1, DIE_FACES + 1), NUM_DICE))
+
+_SORTED_INDEX = {roll: index for index, roll in enumerate(ROLLS)}
+
+# Maps every ordered 5d6 roll (all 7776 of them) to the rank of its sorted form, so a
+# roll can be looked up without sorting or validating it first.
+ROLL_INDEX: dict[tuple[int, ...], int] = {
+    roll: _SORTED_INDEX[tuple(sorted(roll))]
+    for roll in product(range(1, DIE_FACES + 1), repeat=NUM_DICE)
+}
+
+# Array form of ROLL_INDEX for vectorized lookups: an ordered roll's dice are read as the
+# digits of a base-6 number (most significant die first) which indexes its rank.
+_PLACE_VALUES = DIE_FACES ** np.arange(NUM_DICE - 1, -1, -1)
+_ORDERED_RANKS = np.array(list(ROLL_INDEX.values()), dtype=np.uint8)
+_ORDERED_RANKS.setflags(write=False)
+
+# ROLLS as a read-only (252, 5) array, for turning ranks back into dice in bulk.
+ROLL_ARRAY = np.array(ROLLS, dtype=np.uint8)
+ROLL_ARRAY.setflags(write=False)
+
+_FACES = np.arange(1, DIE_FACES + 1)
+
+
+def encode_roll(roll: list[int]) -> int:
+    """
+    Encodes a roll as the rank of its sorted form.
+    :param roll: A list of five dice values, in any order.
+    :return: The roll rank, from 0 to 251.
+    :raises ValueError: If the roll is not five dice with values 1-6.
+    """
+    rank = ROLL_INDEX.get(tuple(roll))
+
+    if rank is None:
+        raise ValueError(f"Roll must be {NUM_DICE} dice with values between 1 and {DIE_FACES}, got {roll}.")
+
+    return rank
+
+
+def decode_roll(rank: int) -> list[int]:
+    """
+    Decodes a roll rank back into its sorted dice.
+    :param rank: The roll rank, from 0 to 251.
+    :return: A sorted list of five dice values.
+    :raises ValueError: If the rank is out of range.
+    """
+    if not 0 <= rank < len(ROLLS):
+        raise ValueError(f"Roll rank must be between 0 and {len(ROLLS) - 1}, got {rank}.")
+
+    return list(ROLLS[rank])
+
+
+def encode_rolls(rolls: np.ndarray) -> np.ndarray:
+    """
+    Encodes every roll in a batch as the rank of its sorted form, without sorting the rolls.
+    :param rolls: An (N, 5) integer array of dice values, in any order within a row.
+    :return: An (N,) uint8 array of roll ranks.
+    :raises ValueError: If the array is not (N, 5) or holds values outside 1-6.
+    """
+    rolls = np.asarray(rolls)
+
+    if rolls.ndim != 2 or rolls.shape[1] != NUM_DICE:
+        raise ValueError(f"Rolls must be an array of shape (N, {NUM_DICE}).")
+
+    if rolls.size and (rolls.min() < 1 or rolls.max() > DIE_FACES):
+        raise ValueError(f"Dice values must be between 1 and {DIE_FACES}.")
+
+    return _ORDERED_RANKS[(rolls.astype(np.intp) - 1) @ _PLACE_VALUES]
+
+
+def decode_rolls(ranks: np.ndarray) -> np.ndarray:
+    """
+    Decodes a batch of roll ranks back into sorted dice.
+    :param ranks: An (N,) integer array of roll ranks.
+    :return: An (N, 5) uint8 array of dice, each row sorted in ascending order.
+    :raises ValueError: If a rank is out of range.
+    """
+    ranks = np.asarray(ranks)
+
+    if ranks.size and (ranks.min() < 0 or ranks.max() >= len(ROLLS)):
+        raise ValueError(f"Roll ranks must be between 0 and {len(ROLLS) - 1}.")
+
+    return ROLL_ARRAY[ranks]
+
+
+def encode_ordered_rolls(rolls: np.ndarray) -> np.ndarray:
+    """
+    Encodes every roll in a batch, keeping the order of its dice, as a base-6 code.
+    :param rolls: An (N, 5) integer array of dice values.
+    :return: An (N,) uint16 array of codes from 0 to 7775.
+    :raises ValueError: If the array is not (N, 5) or holds values outside 1-6.
+    """
+    rolls = np.asarray(rolls)
+
+    if rolls.ndim != 2 or rolls.shape[1] != NUM_DICE:
+        raise ValueError(f"Rolls must be an array of shape (N, {NUM_DICE}).")
+
+    if rolls.size and (rolls.min() < 1 or rolls.max() > DIE_FACES):
+        raise ValueError(f"Dice values must be between 1 and {DIE_FACES}.")
+
+    return ((rolls.astype(np.intp) - 1) @ _PLACE_VALUES).astype(np.uint16)
+
+
+def decode_ordered_rolls(codes: np.ndarray) -> np.ndarray:
+    """
+    Decodes a batch of ordered roll codes back into dice, in their original order.
+    :param codes: An (N,) integer array of codes from encode_ordered_rolls().
+    :return: An (N, 5) uint8 array of dice.
+    :raises ValueError: If a code is out of range.
+    """
+    codes = np.asarray(codes)
+
+    if codes.size and (codes.min() < 0 or codes.max() >= len(_ORDERED_RANKS)):
+        raise ValueError(f"Ordered roll codes must be between 0 and {len(_ORDERED_RANKS) - 1}.")
+
+    return (codes[:, np.newaxis] // _PLACE_VALUES % DIE_FACES + 1).astype(np.uint8)
+
+
+def ranks_from_ordered_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Finds the rank of the sorted form of every roll in a batch of ordered roll codes.
+    :param codes: An (N,) integer array of codes from encode_ordered_rolls().
+    :return: An (N,) uint8 array of roll ranks.
+    :raises ValueError: If a code is out of range.
+    """
+    codes = np.asarray(codes)
+
+    if codes.size and (codes.min() < 0 or codes.max() >= len(_ORDERED_RANKS)):
+        raise ValueError(f"Ordered roll codes must be between 0 and {len(_ORDERED_RANKS) - 1}.")
+
+    return _ORDERED_RANKS[codes]
+
+
+def face_counts(roll: list[int]) -> tuple[int, ...]:
+    """
+    Counts how many dice in a roll show each face.
+    :param roll: A list of dice values, of any length and in any order.
+    :return: A 6-tuple holding the number of ones, twos, ..., sixes.
+    :raises ValueError: If a die value is outside 1-6.
+    """
+    counts = [0] * DIE_FACES
+
+    for die in roll:
+        if not 1 <= die <= DIE_FACES:
+            raise ValueError(f"Dice values must be between 1 and {DIE_FACES}.")
+
+        counts[die - 1] += 1
+
+    return tuple(counts)
+
+
+def face_counts_batch(rolls: np.ndarray) -> np.ndarray:
+    """
+    Counts how many dice in each roll of a batch show each face.
+    :param rolls: An (N, num_dice) integer array of dice values.
+    :return: An (N, 6) uint8 array of face counts.
+    :raises ValueError: If the array is not two-dimensional or holds values outside 1-6.
+    """
+    rolls = np.asarray(rolls)
+
+    if rolls.ndim != 2:
+        raise ValueError("Rolls must be a two-dimensional array.")
+
+    if rolls.size and (rolls.min() < 1 or rolls.max() > DIE_FACES):
+        raise ValueError(f"Dice values must be between 1 and {DIE_FACES}.")
+
+    return (rolls[:, :, np.newaxis] == _FACES).sum(axis=1, dtype=np.uint8)
+
+
+# Face counts of every sorted roll, so a roll rank can be turned into counts in bulk.
+ROLL_COUNTS = face_counts_batch(ROLL_ARRAY)
+ROLL_COUNTS.setflags(write=False)
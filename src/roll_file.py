@@ -0,0 +1,242 @@
+import os
+import struct
+import tempfile
+from typing import Iterator
+
+import numpy as np
+
+from src.roll_encoding import (
+    NUM_DICE, ROLLS, decode_ordered_rolls, decode_rolls, encode_ordered_rolls, encode_rolls, ranks_from_ordered_codes
+)
+from src.scorer import Scorer
+from src.utils import default_file_mode
+
+# File layout: a fixed-size header followed by one contiguous little-endian column per
+# field, each starting on an 8-byte boundary, so every column can be memory-mapped in place.
+MAGIC = b"YAHTROLL"
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIIQI")
+
+# How rolls are stored: as the one-byte rank of the sorted roll, or as a two-byte base-6
+# code that keeps the order the dice were thrown in.
+ENCODINGS = ('rank', 'ordered')
+_ROLL_DTYPES = {'rank': np.dtype("u1"), 'ordered': np.dtype("<u2")}
+
+# The optional columns, in file order, with their types and header flag bits.
+_COLUMNS = (('game_ids', np.dtype("<u8"), 1), ('turns', np.dtype("u1"), 2), ('roll_numbers', np.dtype("u1"), 4))
+
+
+def _column_offsets(count: int, encoding: str, flags: int) -> dict[str, tuple[int, np.dtype]]:
+    """
+    Lays out the columns of a file.
+    :param count: The number of records.
+    :param encoding: The roll encoding.
+    :param flags: The optional columns present, as header flag bits.
+    :return: The offset and type of each column present, by name, with the rolls under 'rolls'.
+    """
+    layout = {}
+    offset = HEADER_SIZE
+
+    for name, dtype, flag in (('rolls', _ROLL_DTYPES[encoding], 0), *_COLUMNS):
+        if flag and not flags & flag:
+            continue
+
+        layout[name] = (offset, dtype)
+        offset += -(-count * dtype.itemsize // 8) * 8
+
+    layout['end'] = (offset, np.dtype("u1"))
+    return layout
+
+
+class RollFile:
+    """
+    A roll dataset mapped read-only from a roll file. Columns are np.memmap arrays, so
+    opening a file reads only its header and scanning it reads the columns straight from
+    the page cache.
+    """
+    def __init__(self, path: str, encoding: str, rolls: np.ndarray, game_ids: np.ndarray | None,
+                 turns: np.ndarray | None, roll_numbers: np.ndarray | None) -> None:
+        """
+        Initializes a RollFile. Use open_roll_file() instead.
+        :param path: The path of the roll file.
+        :param encoding: The roll encoding, 'rank' or 'ordered'.
+        :param rolls: The (N,) roll column: ranks, or ordered codes.
+        :param game_ids: The (N,) uint64 game ID column, or None.
+        :param turns: The (N,) uint8 turn column, or None.
+        :param roll_numbers: The (N,) uint8 roll number column, or None.
+        """
+        self.path = path
+        self.encoding = encoding
+        self.rolls = rolls
+        self.game_ids = game_ids
+        self.turns = turns
+        self.roll_numbers = roll_numbers
+
+    def __len__(self) -> int:
+        """
+        Returns the number of records.
+        :return: The number of rolls in the file.
+        """
+        return len(self.rolls)
+
+    def ranks(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Reads the ranks of the sorted rolls in a range of records. For rank-encoded files
+        this is a view of the mapped column, with no copy.
+        :param start: The first record.
+        :param stop: The record after the last, or None for the end of the file.
+        :return: An (M,) uint8 array of roll ranks.
+        """
+        rolls = self.rolls[start:stop]
+        return rolls if self.encoding == 'rank' else ranks_from_ordered_codes(rolls)
+
+    def dice(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Reads the dice of a range of records: sorted for rank-encoded files, and in the
+        order they were thrown for ordered ones.
+        :param start: The first record.
+        :param stop: The record after the last, or None for the end of the file.
+        :return: An (M, 5) uint8 array of dice.
+        """
+        rolls = self.rolls[start:stop]
+        return decode_rolls(rolls) if self.encoding == 'rank' else decode_ordered_rolls(rolls)
+
+    def iter_scores(self, chunk_size: int = 1 << 20, scorer: Scorer | None = None) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Scores the whole file a chunk at a time, with memory use bounded by the chunk size.
+        :param chunk_size: Number of records scored per chunk.
+        :param scorer: The Scorer to use; a default one if omitted.
+        :return: An iterator of (first record, (M, 13) points array) pairs.
+        """
+        scorer = scorer or Scorer()
+
+        for start in range(0, len(self), chunk_size):
+            yield start, scorer.score_ranks(self.ranks(start, start + chunk_size))
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles as the path, so other processes map the same file instead of copying it.
+        :return: The callable and arguments that reopen the file.
+        """
+        return open_roll_file, (self.path,)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the RollFile instance.
+        :return: A string representing the RollFile instance.
+        """
+        return f"RollFile(path={self.path!r}, encoding={self.encoding!r}, records={len(self)})"
+
+
+def write_roll_file(path: str, rolls: np.ndarray, game_ids: np.ndarray | None = None,
+                    turns: np.ndarray | None = None, roll_numbers: np.ndarray | None = None,
+                    encoding: str = 'rank') -> None:
+    """
+    Writes a roll dataset to a roll file. The file is written beside its destination and
+    renamed into place, so readers never see a partial file.
+    :param path: The path to write.
+    :param rolls: An (N, 5) array of dice, or for the rank encoding an (N,) array of roll ranks.
+    :param game_ids: Optional (N,) game IDs, from 0 to 2 ** 64 - 1.
+    :param turns: Optional (N,) turn numbers, from 0 to 255.
+    :param roll_numbers: Optional (N,) roll numbers within a turn, from 0 to 255.
+    :param encoding: 'rank' to store the sorted roll in one byte, or 'ordered' to keep the
+        order of the dice in two bytes.
+    :raises ValueError: If the encoding is unknown, the rolls are invalid, or a column does
+        not match the rolls in length or does not fit its type.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Encoding must be one of {ENCODINGS}, got {encoding!r}.")
+
+    rolls = np.asarray(rolls)
+
+    if rolls.size and not np.issubdtype(rolls.dtype, np.integer):
+        raise ValueError(f"Rolls must be an integer array, got {rolls.dtype}.")
+
+    if rolls.ndim == 1 and encoding == 'rank':
+        if rolls.size and (rolls.min() < 0 or rolls.max() >= len(ROLLS)):
+            raise ValueError(f"Roll ranks must be between 0 and {len(ROLLS) - 1}.")
+
+        codes = rolls
+    elif rolls.ndim == 2 and rolls.shape[1] == NUM_DICE:
+        codes = encode_rolls(rolls) if encoding == 'rank' else encode_ordered_rolls(rolls)
+    else:
+        raise ValueError(f"Rolls must be an array of shape (N, {NUM_DICE}), or of ranks for the rank encoding.")
+
+    columns = {'rolls': codes}
+    flags = 0
+
+    for (name, dtype, flag), values in zip(_COLUMNS, (game_ids, turns, roll_numbers)):
+        if values is None:
+            continue
+
+        values = np.asarray(values)
+
+        if values.shape != codes.shape:
+            raise ValueError(f"{name} must have shape {codes.shape}, got {values.shape}.")
+
+        if values.size and not np.issubdtype(values.dtype, np.integer):
+            raise ValueError(f"{name} must be an integer array, got {values.dtype}.")
+
+        if values.size and (values.min() < 0 or values.max() > np.iinfo(dtype).max):
+            raise ValueError(f"{name} must be between 0 and {np.iinfo(dtype).max}.")
+
+        columns[name] = values
+        flags |= flag
+
+    layout = _column_offsets(len(codes), encoding, flags)
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+
+    try:
+        with os.fdopen(handle, "wb") as file:
+            os.fchmod(file.fileno(), default_file_mode())
+            file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, ENCODINGS.index(encoding), len(codes), flags)
+                       .ljust(HEADER_SIZE, b"\0"))
+
+            for name, values in columns.items():
+                offset, dtype = layout[name]
+                file.seek(offset)
+                values.astype(dtype, copy=False).tofile(file)
+
+            file.truncate(layout['end'][0])
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def open_roll_file(path: str) -> RollFile:
+    """
+    Maps a roll file read-only.
+    :param path: The path of the roll file.
+    :return: The mapped RollFile.
+    :raises ValueError: If the file is not a roll file, uses another format version, or is truncated.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        size = os.fstat(file.fileno()).st_size
+
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a roll file.")
+
+    _, format_version, encoding_index, count, flags = _HEADER.unpack_from(header)
+
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"{path} uses format version {format_version}, expected {FORMAT_VERSION}.")
+
+    if encoding_index >= len(ENCODINGS):
+        raise ValueError(f"{path} uses an unknown roll encoding.")
+
+    encoding = ENCODINGS[encoding_index]
+    layout = _column_offsets(count, encoding, flags)
+
+    if size != layout['end'][0]:
+        raise ValueError(f"{path} should be {layout['end'][0]} bytes, got {size}.")
+
+    columns = {
+        name: np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,)) if count else np.empty(0, dtype)
+        for name, (offset, dtype) in layout.items() if name != 'end'
+    }
+    return RollFile(path, encoding, columns['rolls'], columns.get('game_ids'), columns.get('turns'),
+                    columns.get('roll_numbers'))
@@ -0,0 +1,113 @@
+from itertools import combinations_with_replacement, product
+
+import numpy as np
+
+from src.category_scorer import CATEGORY_SCORERS
+from src.roll_encoding import DIE_FACES, NUM_DICE, ROLL_INDEX, ROLLS
+from src.score import Score
+from src.score_category import ScoreCategory
+from src.transitions import TransitionMatrix
+
+# Chance of throwing each sorted roll with all five dice.
+ROLL_PROBABILITIES = np.bincount(list(ROLL_INDEX.values()), minlength=len(ROLLS)) / DIE_FACES ** NUM_DICE
+
+# Every sorted sub-multiset of a roll that can be kept before a reroll, from keeping no
+# dice up to keeping all five: 462 in total.
+KEEPS: list[tuple[int, ...]] = [
+    keep
+    for size in range(NUM_DICE + 1)
+    for keep in combinations_with_replacement(range(1, DIE_FACES + 1), size)
+]
+
+KEEP_INDEX: dict[tuple[int, ...], int] = {keep: index for index, keep in enumerate(KEEPS)}
+
+
+def _build_keep_tables() -> tuple[TransitionMatrix, np.ndarray]:
+    """
+    Enumerates the reroll outcomes of every keep and the keeps available from every roll.
+    :return: The exact keep-to-roll transition matrix and the (252, 32) keep lookup.
+    """
+    counts = np.zeros((len(KEEPS), len(ROLLS)), dtype=np.int64)
+    denominators = np.zeros(len(KEEPS), dtype=np.int64)
+
+    for index, keep in enumerate(KEEPS):
+        rerolled = NUM_DICE - len(keep)
+
+        for outcome in product(range(1, DIE_FACES + 1), repeat=rerolled):
+            counts[index, ROLL_INDEX[keep + outcome]] += 1
+
+        denominators[index] = DIE_FACES ** rerolled
+
+    roll_keeps = np.zeros((len(ROLLS), 2 ** NUM_DICE), dtype=np.uint16)
+
+    for rank, roll in enumerate(ROLLS):
+        for mask in range(2 ** NUM_DICE):
+            kept = tuple(die for position, die in enumerate(roll) if mask >> position & 1)
+            roll_keeps[rank, mask] = KEEP_INDEX[kept]
+
+    roll_keeps.setflags(write=False)
+    return TransitionMatrix(counts, denominators), roll_keeps
+
+
+# KEEP_TRANSITIONS row keep gives the chance that rerolling the dice not in the keep ends
+# on each sorted roll, exactly as outcome counts over 6 ** rerolled dice and in sparse form:
+# only 4368 of its 462 x 252 entries are nonzero. KEEP_PROBABILITIES is its dense float64
+# form, KEEP_PROBABILITIES[keep, rank]. ROLL_KEEPS[rank, mask] is the keep left by holding
+# the dice of a sorted roll whose positions are set in the 5-bit mask.
+KEEP_TRANSITIONS, ROLL_KEEPS = _build_keep_tables()
+KEEP_PROBABILITIES = KEEP_TRANSITIONS.dense
+
+
+def _build_keep_masks() -> np.ndarray:
+    """
+    Finds, for every sorted roll and keep it allows, a 5-bit mask of sorted positions to hold.
+    :return: A (252, 462) array of position masks, -1 where the roll does not allow the keep.
+    """
+    keep_masks = np.full((len(ROLL_KEEPS), int(ROLL_KEEPS.max()) + 1), -1, dtype=np.int8)
+
+    for rank, keeps in enumerate(ROLL_KEEPS):
+        keep_masks[rank, keeps] = np.arange(len(keeps))
+
+    keep_masks.setflags(write=False)
+    return keep_masks
+
+
+# KEEP_MASKS[rank, keep] is the inverse of ROLL_KEEPS: a 5-bit mask of sorted positions that
+# holds the keep from the roll, or -1 where the roll does not allow the keep.
+KEEP_MASKS = _build_keep_masks()
+
+
+def _build_tables() -> tuple[np.ndarray, list[tuple[tuple[ScoreCategory, int], ...]], list[tuple[Score, ...]]]:
+    """
+    Runs every category scorer once over every sorted roll.
+    :return: The points matrix and, per roll, the (category, points) pairs that scored and
+        the shared Scores for them, each holding the roll as a tuple.
+    """
+    points = np.zeros((len(ROLLS), len(ScoreCategory)), dtype=np.int16)
+    scored = []
+    interned = []
+
+    for index, roll in enumerate(ROLLS):
+        row = []
+
+        for column, category in enumerate(ScoreCategory):
+            score = CATEGORY_SCORERS[category.value](list(roll))
+
+            if score is not None:
+                points[index, column] = score.points
+                row.append(Score(category, roll, score.points))
+
+        scored.append(tuple((score.category, score.points) for score in row))
+        interned.append(tuple(row))
+
+    points.setflags(write=False)
+    return points, scored, interned
+
+
+# SCORE_TABLE[rank, column] holds the points a roll earns in the column's category, with
+# columns in ScoreCategory order and 0 where the category does not score.
+# ROLL_SCORES[rank] holds only the categories that score, ready to be turned into Scores.
+# INTERNED_SCORES[rank] holds those Scores themselves: a flyweight pool of the 252 x 13
+# possible immutable Scores, all sharing one sorted roll tuple per rank, handed out in
+# place of new instances. The roll is a tuple, so no caller can change the shared pool.
+SCORE_TABLE, ROLL_SCORES, INTERNED_SCORES = _build_tables()
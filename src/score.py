@@ -1,22 +1,86 @@
 from typing import Any
 
+from src.roll_encoding import decode_roll, encode_roll
 from src.score_category import ScoreCategory
 
 
 class Score:
     """
     Represents a score in a specific category based on a roll of dice.
+    Scores are immutable, so the Scorer can hand out shared instances.
     """
-    def __init__(self, category: ScoreCategory, roll: list[int], points: int) -> None:
+    __slots__ = ('category', 'roll', 'points')
+
+    def __init__(self, category: ScoreCategory, roll: list[int] | tuple[int, ...], points: int) -> None:
         """
         Initializes a Score instance.
         :param category: The scoring category.
-        :param roll: The list of dice values.
+        :param roll: The dice values, as a list or, for shared Scores, a tuple.
+        :param points: The points scored in this category.
+        """
+        object.__setattr__(self, 'category', category)
+        object.__setattr__(self, 'roll', roll)
+        object.__setattr__(self, 'points', points)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Prevents attributes from being changed after initialization.
+        :raises AttributeError: Always, as Score instances are immutable.
+        """
+        raise AttributeError(f"Score is immutable; cannot set '{name}'.")
+
+    def __delattr__(self, name: str) -> None:
+        """
+        Prevents attributes from being deleted.
+        :raises AttributeError: Always, as Score instances are immutable.
+        """
+        raise AttributeError(f"Score is immutable; cannot delete '{name}'.")
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares two Scores by value.
+        :param other: The object to compare with.
+        :return: True if both have the same category, dice and points.
+        """
+        if not isinstance(other, Score):
+            return NotImplemented
+
+        # Rolls compare by their dice, so a shared Score's tuple roll equals a list roll.
+        return (self.category, tuple(self.roll), self.points) == (other.category, tuple(other.roll), other.points)
+
+    def __hash__(self) -> int:
+        """
+        Hashes the Score by value.
+        :return: A hash of the category, roll and points.
+        """
+        return hash((self.category, tuple(self.roll), self.points))
+
+    def __reduce__(self) -> tuple:
+        """
+        Supports pickling and copying despite the immutability guard.
+        :return: The constructor and its arguments.
+        """
+        return self.__class__, (self.category, self.roll, self.points)
+
+    @property
+    def rank(self) -> int:
+        """
+        The rank of the scored roll, its compact integer encoding.
+        :return: The roll rank, from 0 to 251.
+        :raises ValueError: If the roll is not five dice with values 1-6.
+        """
+        return encode_roll(self.roll)
+
+    @classmethod
+    def from_rank(cls, category: ScoreCategory, rank: int, points: int) -> 'Score':
+        """
+        Creates a Score instance for a roll given by its rank.
+        :param category: The scoring category.
+        :param rank: The roll rank, from 0 to 251.
         :param points: The points scored in this category.
+        :return: A Score instance holding the decoded, sorted roll.
         """
-        self.category = category
-        self.roll = roll
-        self.points = points
+        return cls(category, decode_roll(rank), points)
 
     def __repr__(self) -> str:
         """
@@ -32,7 +96,7 @@ class Score:
         """
         return {
             'category': self.category.value,
-            'roll': self.roll,
+            'roll': list(self.roll),
             'points': self.points
         }
     
@@ -1,6 +1,20 @@
+from typing import Any
+
 from src.score import Score
 from src.score_category import ScoreCategory
 
+UPPER_SECTION: frozenset[ScoreCategory] = frozenset({
+    ScoreCategory.ACES,
+    ScoreCategory.TWOS,
+    ScoreCategory.THREES,
+    ScoreCategory.FOURS,
+    ScoreCategory.FIVES,
+    ScoreCategory.SIXES
+})
+UPPER_SECTION_BONUS_THRESHOLD = 63
+UPPER_SECTION_BONUS = 35
+YAHTZEE_BONUS = 100
+
 class ScoreCard:
     """
     Represents a score card for a game, tracking scores in various categories.
@@ -61,9 +75,9 @@ class ScoreCard:
         self._check_upper_section_bonus()
         
         if self.upper_section_bonus_awarded:
-            total += 35
+            total += UPPER_SECTION_BONUS
         
-        total += self.yahtzee_bonus_count * 100
+        total += self.yahtzee_bonus_count * YAHTZEE_BONUS
         
         return total
 
@@ -74,6 +88,38 @@ class ScoreCard:
         """
         return f"ScoreCard(scores={self.scores})"
     
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the ScoreCard instance to a dictionary.
+        :return: A dictionary of the scores by category name, None for unscored categories,
+            and the bonus state.
+        """
+        return {
+            'scores': {
+                category.value: None if score is None else score.to_dict()
+                for category, score in self.scores.items()
+            },
+            'upper_section_bonus_awarded': self.upper_section_bonus_awarded,
+            'yahtzee_bonus_count': self.yahtzee_bonus_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'ScoreCard':
+        """
+        Creates a ScoreCard instance from a dictionary, restoring its bonus state as stored
+        rather than replaying the scores.
+        :param data: A dictionary from to_dict().
+        :return: A ScoreCard instance.
+        """
+        card = cls()
+
+        for value, score in data['scores'].items():
+            card.scores[ScoreCategory(value)] = None if score is None else Score.from_dict(score)
+
+        card.upper_section_bonus_awarded = data['upper_section_bonus_awarded']
+        card.yahtzee_bonus_count = data['yahtzee_bonus_count']
+        return card
+
     def _check_upper_section_bonus(self) -> None:
         """
         Checks if the upper section bonus has been achieved and updates the status.
@@ -83,17 +129,10 @@ class ScoreCard:
         
         upper_section_total = sum(
             score.points for category, score in self.scores.items()
-            if category in [
-                ScoreCategory.ACES,
-                ScoreCategory.TWOS,
-                ScoreCategory.THREES,
-                ScoreCategory.FOURS,
-                ScoreCategory.FIVES,
-                ScoreCategory.SIXES
-            ] and score is not None
+            if category in UPPER_SECTION and score is not None
         )
         
-        if upper_section_total >= 63:
+        if upper_section_total >= UPPER_SECTION_BONUS_THRESHOLD:
             self.upper_section_bonus_awarded = True
             
     @staticmethod
@@ -103,4 +142,13 @@ class ScoreCard:
         :param roll: A list of integers representing the dice roll.
         :return: True if the roll is a Yahtzee, False otherwise.
         """
-        return len(set(roll)) == 1 and len(roll) == 5
\ No newline at end of file
+        return len(set(roll)) == 1 and len(roll) == 5
+
+    @staticmethod
+    def is_yahtzee_counts(counts: tuple[int, ...]) -> bool:
+        """
+        Checks if a roll given by its face counts is a Yahtzee (five dice, all the same).
+        :param counts: The number of dice showing each face, ones first.
+        :return: True if the roll is a Yahtzee, False otherwise.
+        """
+        return sum(counts) == 5 and max(counts) == 5
\ No newline at end of file
@@ -13,4 +13,8 @@ class ScoreCategory(Enum):
     SMALL_STRAIGHT = 'Small Straight'
     LARGE_STRAIGHT = 'Large Straight'
     YAHTZEE = 'Yahtzee'
-    CHANCE = 'Chance'
\ No newline at end of file
+    CHANCE = 'Chance'
+
+# Position of each category in ScoreCategory order: its column in the score tables and
+# its bit in packed score card masks.
+CATEGORY_INDEX: dict[ScoreCategory, int] = {category: index for index, category in enumerate(ScoreCategory)}
@@ -1,5 +1,10 @@
-from src.category_scorer import CATEGORY_SCORERS
+import numpy as np
+
+from src.category_scorer import CATEGORY_SCORERS, score_face_counts
+from src.roll_encoding import ROLL_INDEX, ROLLS, encode_rolls, face_counts
+from src.roll_table import INTERNED_SCORES, ROLL_SCORES, SCORE_TABLE
 from src.score import Score
+from src.score_category import ScoreCategory
 
 
 class Scorer:
@@ -16,18 +21,85 @@ class Scorer:
     def get_scores(self, roll: list[int]) -> list[Score]:
         """
         Evaluates the roll and returns a list of possible scores for each valid category.
+        Standard 5d6 rolls are looked up in the precomputed score table, other rolls of
+        six-sided dice are scored from their face counts, and anything else falls back
+        to running the category scorers. Sorted 5d6 rolls get shared, interned Scores, which
+        hold the roll as an immutable tuple.
         :param roll: A list of integers representing the dice roll.
         :return: A list of Score objects for each valid scoring category.
         """
         scores = []
-        
+
         if len(roll) < self._min_dice:
             return scores
-        
+
+        key = tuple(roll)
+        index = ROLL_INDEX.get(key)
+
+        if index is not None:
+            # Sorted rolls get the shared, interned Scores; others keep the caller's roll order.
+            if key == ROLLS[index]:
+                return list(INTERNED_SCORES[index])
+
+            return [Score(category, roll, points) for category, points in ROLL_SCORES[index]]
+
+        try:
+            counts = face_counts(roll)
+        except (TypeError, ValueError):
+            counts = None
+
+        if counts is not None:
+            # Chance always scores, even for an empty roll; other categories only when non-zero.
+            return [
+                Score(category, roll, points)
+                for category, points in zip(ScoreCategory, score_face_counts(counts))
+                if points or category is ScoreCategory.CHANCE
+            ]
+
         for _, scorer in self._category_scorers.items():
             score = scorer(roll)
-            
+
             if score is not None:
                 scores.append(score)
-                
-        return scores
\ No newline at end of file
+
+        return scores
+
+    def get_scores_for_rank(self, rank: int) -> list[Score]:
+        """
+        Returns the possible scores for a roll given by its rank.
+        :param rank: The roll rank, from 0 to 251.
+        :return: A list of the shared Score objects for each valid scoring category.
+        :raises ValueError: If the rank is out of range.
+        """
+        if not 0 <= rank < len(ROLLS):
+            raise ValueError(f"Roll rank must be between 0 and {len(ROLLS) - 1}, got {rank}.")
+
+        return list(INTERNED_SCORES[rank])
+
+    def score_batch(self, rolls: np.ndarray) -> np.ndarray:
+        """
+        Scores a batch of 5d6 rolls in one vectorized table lookup.
+        :param rolls: An (N, 5) integer array of dice values, in any order within a row.
+        :return: An (N, 13) array of points, with columns in ScoreCategory order and 0
+            where a category does not score.
+        :raises ValueError: If the array is not (N, 5) or holds values outside 1-6.
+        """
+        return SCORE_TABLE[encode_rolls(rolls)]
+
+    def score_ranks(self, ranks: np.ndarray) -> np.ndarray:
+        """
+        Scores a batch of rolls given by their ranks, as score_batch() does for dice.
+        :param ranks: An (N,) integer array of roll ranks, from 0 to 251.
+        :return: An (N, 13) array of points, with columns in ScoreCategory order and 0
+            where a category does not score.
+        :raises ValueError: If the array is not (N,) integers or holds ranks out of range.
+        """
+        ranks = np.asarray(ranks)
+
+        if ranks.ndim != 1 or not (ranks.size == 0 or np.issubdtype(ranks.dtype, np.integer)):
+            raise ValueError("Roll ranks must be an (N,) integer array.")
+
+        if ranks.size and (ranks.min() < 0 or ranks.max() >= len(ROLLS)):
+            raise ValueError(f"Roll ranks must be between 0 and {len(ROLLS) - 1}.")
+
+        return SCORE_TABLE[ranks]
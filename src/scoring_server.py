@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import suppress
+from typing import Any, Callable
+
+import numpy as np
+
+from src.advisor import MAX_REROLLS, Advisor
+from src.roll_encoding import encode_roll
+from src.roll_table import KEEPS
+from src.score_card import ScoreCard
+from src.score_category import ScoreCategory
+from src.scorer import Scorer
+from src.solver import FULL_MASK, card_state
+from src.strategy_file import open_strategy_file
+
+DEFAULT_MAX_DELAY = 0.0003
+DEFAULT_MAX_BATCH = 4096
+MAX_BODY_SIZE = 1 << 20
+
+_CATEGORIES = tuple(ScoreCategory)
+_CATEGORY_NAMES = [category.value for category in ScoreCategory]
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Content Too Large"}
+
+
+class MicroBatcher:
+    """
+    Collects items submitted by concurrent requests and handles them together. The first
+    item of a batch starts a short timer; when it fires, or the batch is full, every
+    pending item goes to the handler in one call and each request gets its own result.
+    Everything runs on the event loop thread, so the handler should be a quick,
+    vectorized call. If the handler fails on a batch, each item is retried on its own, so
+    only the items that fail get the error.
+    """
+    def __init__(self, handler: Callable[[list], list], max_delay: float = DEFAULT_MAX_DELAY,
+                 max_batch: int = DEFAULT_MAX_BATCH) -> None:
+        """
+        Initializes a MicroBatcher.
+        :param handler: Called with a list of items; returns one result per item, in order.
+        :param max_delay: The longest an item waits for others to join its batch, in seconds.
+        :param max_batch: The most items handled in one call.
+        """
+        self.handler = handler
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    def submit(self, item: Any) -> asyncio.Future:
+        """
+        Adds an item to the current batch. Must be called from the event loop.
+        :param item: The item to handle.
+        :return: A future that resolves to the item's result, or raises the handler's error
+            for this item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+
+        return future
+
+    def flush(self) -> None:
+        """
+        Hands every pending item to the handler now.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+
+        if not pending:
+            return
+
+        self.batches += 1
+        self.items += len(pending)
+
+        try:
+            results = self.handler([item for item, _ in pending])
+        except Exception as error:
+            if len(pending) == 1:
+                _settle(pending[0][1], error=error)
+                return
+
+            # Find the items at fault, so one bad request does not fail the others.
+            for item, future in pending:
+                try:
+                    result = self.handler([item])[0]
+                except Exception as item_error:
+                    _settle(future, error=item_error)
+                else:
+                    _settle(future, result)
+            return
+
+        for (_, future), result in zip(pending, results):
+            _settle(future, result)
+
+
+def _settle(future: asyncio.Future, result: Any = None, error: Exception | None = None) -> None:
+    """
+    Resolves a batched item's future, unless its request has already been cancelled.
+    :param future: The item's future.
+    :param result: The item's result.
+    :param error: The item's error, set instead of the result if given.
+    """
+    # A request whose client has gone away may have been cancelled.
+    if future.done():
+        return
+
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _encode_roll(roll: Any) -> int:
+    """
+    Encodes a roll from a request body, accepting only integer dice: JSON true and 1.0
+    would otherwise pass as a 1.
+    :param roll: The roll, as sent in the request body.
+    :return: The roll rank.
+    :raises ValueError: If the roll is not five integer dice with values 1-6.
+    """
+    if not _is_integer_roll(roll):
+        raise ValueError(f"Roll must be a list of integer dice, got {roll!r}.")
+
+    return encode_roll(roll)
+
+
+def _is_integer_roll(roll: Any) -> bool:
+    """
+    Checks that a roll is a list of integer dice. Booleans are not dice.
+    :param roll: The roll to check.
+    :return: True if every die is an int.
+    """
+    return isinstance(roll, list) and all(isinstance(die, int) and not isinstance(die, bool) for die in roll)
+
+
+def _check_card(data: Any) -> None:
+    """
+    Checks that a request's card is well-formed before it is read, so a bad card is
+    rejected with its own request rather than failing in a batch.
+    :param data: The card, as sent in the request body.
+    :raises ValueError: If the card or one of its scores is malformed, or a score has a roll
+        that is not integer dice or points that are not a non-negative integer.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('scores'), dict):
+        raise ValueError("The card must be an object with a 'scores' object.")
+
+    for name, score in data['scores'].items():
+        if score is None:
+            continue
+
+        if not isinstance(score, dict) or not {'category', 'roll', 'points'} <= score.keys():
+            raise ValueError(f"The {name!r} score must be null or an object with a category, roll and points.")
+
+        if not _is_integer_roll(score['roll']):
+            raise ValueError(f"The {name!r} score's roll must be a list of integer dice, got {score['roll']!r}.")
+
+        points = score['points']
+
+        if not isinstance(points, int) or isinstance(points, bool) or points < 0:
+            raise ValueError(f"The {name!r} score's points must be a non-negative integer, got {points!r}.")
+
+
+class ScoringServer:
+    """
+    A small HTTP/1.1 JSON service for roll scoring and, given solved strategy values, turn
+    advice. Concurrent requests are micro-batched, so a burst of them is scored with one
+    Scorer.score_ranks() call and advised with one Advisor.advise_batch() call. It uses
+    only the standard library and serves on a local TCP port or a Unix socket.
+
+    Routes:
+        POST /score   {"roll": [dice]} or {"rolls": [[dice], ...]}; returns the points of
+                      every category the roll scores in, as {"scores": {...}} or a list of them.
+        POST /advise  {"card": ScoreCard.to_dict(), "roll": [dice], "rerolls_left": 0-2};
+                      returns the best "keep" or "category" and its "expected_value".
+                      Only served when an Advisor is given.
+        GET  /health  Returns the status and batching statistics.
+    """
+    def __init__(self, scorer: Scorer | None = None, advisor: Advisor | None = None,
+                 max_delay: float = DEFAULT_MAX_DELAY, max_batch: int = DEFAULT_MAX_BATCH) -> None:
+        """
+        Initializes a ScoringServer.
+        :param scorer: The Scorer to use; a default one if omitted.
+        :param advisor: The Advisor answering /advise, or None to serve scoring only.
+        :param max_delay: The longest a request waits for others to join its batch, in seconds.
+        :param max_batch: The most requests handled in one batch.
+        """
+        self.scorer = scorer or Scorer()
+        self.advisor = advisor
+        self.score_batcher = MicroBatcher(self._score_ranks, max_delay, max_batch)
+        self.advice_batcher = MicroBatcher(self._advise_states, max_delay, max_batch)
+        self._routes = {'/score': ('POST', self._score), '/health': ('GET', self._health)}
+
+        if advisor is not None:
+            self._routes['/advise'] = ('POST', self._advise)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080, path: str | None = None) -> asyncio.Server:
+        """
+        Starts listening.
+        :param host: The interface to listen on; local only by default.
+        :param port: The TCP port, or 0 to pick a free one.
+        :param path: A Unix socket path to listen on instead of TCP.
+        :return: The started asyncio server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle_connection, path=path)
+
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    def _score_ranks(self, ranks: list[int]) -> list[dict[str, int]]:
+        """
+        Scores a batch of rolls with one table lookup.
+        :param ranks: The roll ranks.
+        :return: For each roll, the points of every category it scores in, by category name.
+        """
+        points = self.scorer.score_ranks(np.array(ranks, dtype=np.intp))
+        return [{name: value for name, value in zip(_CATEGORY_NAMES, row) if value} for row in points.tolist()]
+
+    def _advise_states(self, requests: list[tuple[int, int, int, int]]) -> list[tuple[int, float]]:
+        """
+        Finds the best action for a batch of turns with one vectorized evaluation.
+        :param requests: (mask, upper subtotal, roll rank, rerolls left) for each turn.
+        :return: The best action and its expected value for each turn.
+        """
+        masks, uppers, ranks, rerolls_left = np.array(requests, dtype=np.intp).T
+        actions, expected = self.advisor.advise_batch(masks, uppers, ranks, rerolls_left)
+        return list(zip(actions.tolist(), expected.tolist()))
+
+    async def _score(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Handles POST /score.
+        :param data: The request body.
+        :return: The response body.
+        :raises ValueError: If a roll is not five dice with values 1-6.
+        """
+        if 'rolls' in data:
+            ranks = [_encode_roll(roll) for roll in data['rolls']]
+            return {'scores': list(await asyncio.gather(*map(self.score_batcher.submit, ranks)))}
+
+        return {'scores': await self.score_batcher.submit(_encode_roll(data['roll']))}
+
+    async def _advise(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Handles POST /advise.
+        :param data: The request body.
+        :return: The response body.
+        :raises ValueError: If the card, roll or rerolls left are invalid, the card is full,
+            or the strategy values do not cover the card.
+        """
+        if 'card' in data:
+            _check_card(data['card'])
+
+        card = ScoreCard.from_dict(data['card']) if 'card' in data else ScoreCard()
+        rank = _encode_roll(data['roll'])
+        rerolls_left = data.get('rerolls_left', 0)
+        mask, upper = card_state(card)
+
+        if not isinstance(rerolls_left, int) or isinstance(rerolls_left, bool) or not 0 <= rerolls_left <= MAX_REROLLS:
+            raise ValueError(f"Rerolls left must be between 0 and {MAX_REROLLS}, got {rerolls_left}.")
+
+        if mask == FULL_MASK:
+            raise ValueError("Every category on the card has already been scored.")
+
+        if upper < 0 or np.isnan(self.advisor.values[mask, upper]):
+            raise ValueError("The strategy values were not solved for this card.")
+
+        action, expected = await self.advice_batcher.submit((mask, upper, rank, rerolls_left))
+
+        if rerolls_left:
+            return {'keep': list(KEEPS[action]), 'expected_value': expected}
+
+        return {'category': _CATEGORIES[action].value, 'expected_value': expected}
+
+    async def _health(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Handles GET /health.
+        :param data: The request body, ignored.
+        :return: The response body.
+        """
+        return {
+            'status': 'ok',
+            'advice': self.advisor is not None,
+            'batches': self.score_batcher.batches + self.advice_batcher.batches,
+            'requests': self.score_batcher.items + self.advice_batcher.items
+        }
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> tuple[int, dict[str, Any]]:
+        """
+        Routes one request.
+        :param method: The HTTP method.
+        :param target: The request target.
+        :param body: The request body.
+        :return: The status code and response body.
+        """
+        route = self._routes.get(target.partition('?')[0])
+
+        if route is None:
+            return 404, {'error': f"No route for {target}."}
+
+        expected_method, handler = route
+
+        if method != expected_method:
+            return 405, {'error': f"{target} only accepts {expected_method}."}
+
+        try:
+            data = json.loads(body) if body else {}
+
+            if not isinstance(data, dict):
+                raise ValueError("The request body must be a JSON object.")
+
+            return 200, await handler(data)
+        except KeyError as error:
+            return 400, {'error': f"Missing field {error}."}
+        except (ValueError, TypeError, IndexError, AttributeError) as error:
+            # A body of the wrong shape must still get a response, not a dropped connection.
+            return 400, {'error': str(error)}
+        except RecursionError:
+            return 400, {'error': "The request body is nested too deeply."}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of one connection in turn, keeping it open between them unless
+        the client asks otherwise.
+        :param reader: The connection's reader.
+        :param writer: The connection's writer.
+        """
+        try:
+            while request_line := await reader.readline():
+                parts = request_line.decode('latin-1').split()
+                headers = {}
+
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = len(parts) == 3 and parts[2] == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                length = headers.get('content-length', '0')
+
+                if len(parts) != 3 or not length.isdigit():
+                    status, payload, keep_alive = 400, {'error': "Malformed request."}, False
+                elif int(length) > MAX_BODY_SIZE:
+                    status, payload, keep_alive = 413, {'error': f"Bodies are limited to {MAX_BODY_SIZE} bytes."}, False
+                else:
+                    body = await reader.readexactly(int(length))
+                    status, payload = await self._dispatch(parts[0], parts[1], body)
+
+                content = json.dumps(payload).encode()
+                connection = "keep-alive" if keep_alive else "close"
+                writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(content)}\r\nConnection: {connection}\r\n\r\n".encode() + content)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            # The client went away or sent a header line too long to read.
+            pass
+        finally:
+            writer.close()
+
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def serve(server: ScoringServer, host: str = '127.0.0.1', port: int = 8080, path: str | None = None) -> None:
+    """
+    Runs a ScoringServer until cancelled.
+    :param server: The server to run.
+    :param host: The interface to listen on.
+    :param port: The TCP port.
+    :param path: A Unix socket path to listen on instead of TCP.
+    """
+    listener = await server.start(host, port, path)
+
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point: serves scoring, and advice if given a strategy file.
+    :param argv: The arguments, or None to use sys.argv.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Serve Yahtzee roll scoring and turn advice over local HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to listen on")
+    parser.add_argument('--port', type=int, default=8080, help="TCP port to listen on")
+    parser.add_argument('--unix', help="Unix socket path to listen on instead of TCP")
+    parser.add_argument('--strategy', help="strategy file from write_strategy_file(), to serve /advise")
+    parser.add_argument('--max-delay-us', type=int, default=round(DEFAULT_MAX_DELAY * 1e6),
+                        help="longest a request waits for a batch to fill, in microseconds")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="most requests per batch")
+    args = parser.parse_args(argv)
+
+    try:
+        advisor = Advisor(open_strategy_file(args.strategy)) if args.strategy else None
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    server = ScoringServer(advisor=advisor, max_delay=args.max_delay_us / 1e6, max_batch=args.max_batch)
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from src.advisor import Advisor
+from src.dice_roller import DiceRoller
+from src.roll_encoding import DIE_FACES, NUM_DICE, ROLL_ARRAY, ROLL_COUNTS, encode_rolls
+from src.roll_table import KEEP_MASKS, SCORE_TABLE
+from src.score_card import (
+    UPPER_SECTION, UPPER_SECTION_BONUS, UPPER_SECTION_BONUS_THRESHOLD, YAHTZEE_BONUS
+)
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.strategy_file import StrategyTable
+
+MAX_REROLLS = 2
+
+_NUM_CATEGORIES = len(ScoreCategory)
+_UPPER_SECTION_BITS = sum(1 << CATEGORY_INDEX[category] for category in UPPER_SECTION)
+_YAHTZEE_COLUMN = CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+_YAHTZEE_BIT = 1 << _YAHTZEE_COLUMN
+_IS_YAHTZEE = ROLL_COUNTS.max(axis=1) == NUM_DICE
+_POSITIONS = np.arange(NUM_DICE)
+
+
+class GameBatch:
+    """
+    The state of many games played in lockstep, held as one array per field rather than
+    one object per game. Scoring follows ScoreCard's bonus rules.
+    """
+    __slots__ = ('dice', 'ranks', 'masks', 'upper_subtotals', 'totals', 'yahtzee_bonus_counts', 'rerolls_left')
+
+    def __init__(self, n: int, start_mask: int = 0) -> None:
+        """
+        Initializes N games with empty score cards.
+        :param n: Number of games.
+        :param start_mask: Categories treated as already filled, with no points, in every game.
+        """
+        # Each row of dice is sorted, and ranks holds the rank of each row.
+        self.dice: np.ndarray = np.ones((n, NUM_DICE), dtype=np.int64)
+        self.ranks: np.ndarray = np.zeros(n, dtype=np.intp)
+        # Bit i of a mask is set once the i-th category in ScoreCategory order is scored.
+        self.masks: np.ndarray = np.full(n, start_mask, dtype=np.int64)
+        self.upper_subtotals: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.totals: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.yahtzee_bonus_counts: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.rerolls_left: int = MAX_REROLLS
+
+    def set_dice(self, dice: np.ndarray) -> None:
+        """
+        Replaces the dice of every game.
+        :param dice: An (N, 5) array of dice, each row sorted.
+        """
+        self.dice = dice
+        self.ranks = encode_rolls(dice).astype(np.intp)
+
+    def score(self, columns: np.ndarray) -> None:
+        """
+        Scores every game's dice in a category, awarding any bonuses.
+        :param columns: An (N,) array of category columns in ScoreCategory order.
+        :raises ValueError: If a category has already been scored.
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        bits = np.left_shift(1, columns)
+
+        if (self.masks & bits).any():
+            raise ValueError("Cannot score a category that has already been scored.")
+
+        points = SCORE_TABLE[self.ranks, columns].astype(np.int64)
+        bonus_yahtzee = _IS_YAHTZEE[self.ranks] & (self.masks & _YAHTZEE_BIT != 0) & (columns != _YAHTZEE_COLUMN)
+        before = self.upper_subtotals
+        self.upper_subtotals = before + np.where(bits & _UPPER_SECTION_BITS, points, 0)
+        crossed = (before < UPPER_SECTION_BONUS_THRESHOLD) & (self.upper_subtotals >= UPPER_SECTION_BONUS_THRESHOLD)
+
+        self.yahtzee_bonus_counts += bonus_yahtzee
+        self.totals += points + crossed * UPPER_SECTION_BONUS + bonus_yahtzee * YAHTZEE_BONUS
+        self.masks |= bits
+
+
+class Policy(ABC):
+    """
+    Plays every game in a batch at once. Subclasses decide which dice to hold and which
+    category to score, for all games in one vectorized call.
+    """
+    @abstractmethod
+    def keep(self, games: GameBatch) -> np.ndarray:
+        """
+        Chooses the dice to hold before a reroll.
+        :param games: The games, with games.rerolls_left rerolls left.
+        :return: An (N, 5) boolean array, True for the sorted dice positions to hold.
+        """
+
+    @abstractmethod
+    def choose_category(self, games: GameBatch) -> np.ndarray:
+        """
+        Chooses the category to score the final dice in.
+        :param games: The games, with no rerolls left.
+        :return: An (N,) array of open category columns in ScoreCategory order.
+        """
+
+
+class GreedyPolicy(Policy):
+    """
+    A simple baseline: holds the dice of the most common face, the highest on ties, and
+    scores wherever the roll earns the most points now.
+    """
+    # The dice of the most common face in each sorted roll; reversed so argmax breaks
+    # ties toward the highest face.
+    _KEEPS = ROLL_ARRAY == (DIE_FACES - ROLL_COUNTS[:, ::-1].argmax(axis=1))[:, np.newaxis]
+
+    def keep(self, games: GameBatch) -> np.ndarray:
+        """
+        Holds every die showing the most common face.
+        :param games: The games.
+        :return: An (N, 5) boolean keep mask.
+        """
+        return self._KEEPS[games.ranks]
+
+    def choose_category(self, games: GameBatch) -> np.ndarray:
+        """
+        Picks the open category that scores the most points, the first one on ties.
+        :param games: The games.
+        :return: An (N,) array of category columns.
+        """
+        filled = (games.masks[:, np.newaxis] >> np.arange(_NUM_CATEGORIES)) & 1
+        points = np.where(filled, -1, SCORE_TABLE[games.ranks])
+        return points.argmax(axis=1)
+
+
+class OptimalPolicy(Policy):
+    """
+    Plays the expected-value-optimal strategy, using the batched advisor over solved values.
+    """
+    def __init__(self, values: StrategyTable | np.ndarray) -> None:
+        """
+        Initializes an OptimalPolicy.
+        :param values: A StrategyTable, or the (8192, 64) value table returned by solve().
+        """
+        self.advisor = Advisor(values)
+
+    def keep(self, games: GameBatch) -> np.ndarray:
+        """
+        Holds the dice of the keep with the highest expected value.
+        :param games: The games.
+        :return: An (N, 5) boolean keep mask.
+        """
+        keeps, _ = self.advisor.advise_batch(games.masks, games.upper_subtotals, games.ranks, games.rerolls_left)
+        masks = KEEP_MASKS[games.ranks, keeps]
+        return (masks[:, np.newaxis] >> _POSITIONS & 1).astype(bool)
+
+    def choose_category(self, games: GameBatch) -> np.ndarray:
+        """
+        Scores in the category with the highest expected value, read from the strategy
+        file's best-category table when it has one.
+        :param games: The games.
+        :return: An (N,) array of category columns.
+        """
+        return self.advisor.best_categories(games.masks, games.upper_subtotals, games.ranks)
+
+
+def play(games: GameBatch, policy: Policy, roller: DiceRoller) -> None:
+    """
+    Plays one turn of every game in a batch: a roll, up to two rerolls and a score.
+    :param games: The games, updated in place.
+    :param policy: The policy choosing keeps and categories.
+    :param roller: The dice roller.
+    """
+    games.rerolls_left = MAX_REROLLS
+    games.set_dice(roller.roll_many(len(games.ranks)))
+
+    while games.rerolls_left:
+        keep = policy.keep(games)
+        games.set_dice(roller.reroll_many(games.dice, keep))
+        games.rerolls_left -= 1
+
+    games.score(policy.choose_category(games))
+
+
+def simulate(n: int, policy: Policy, roller: DiceRoller | None = None, start_mask: int = 0,
+             batch_size: int = 100_000) -> np.ndarray:
+    """
+    Plays n complete games under a policy, a batch of games at a time.
+    :param n: Number of games.
+    :param policy: The policy choosing keeps and categories.
+    :param roller: The dice roller, which must throw five six-sided dice. A new unseeded
+        roller is used if omitted.
+    :param start_mask: Categories treated as already filled, which are left out of every game.
+    :param batch_size: Number of games played in lockstep, bounding memory use.
+    :return: An (n,) array of final scores, including bonuses.
+        np.bincount() of it gives the score distribution.
+    :raises ValueError: If the roller does not throw five six-sided dice.
+    """
+    roller = roller or DiceRoller()
+
+    if (roller.num_dice, roller.die_size) != (NUM_DICE, DIE_FACES):
+        raise ValueError("The simulator only supports five six-sided dice.")
+
+    rounds = _NUM_CATEGORIES - start_mask.bit_count()
+    scores = np.empty(n, dtype=np.int64)
+
+    for start in range(0, n, batch_size):
+        games = GameBatch(min(batch_size, n - start), start_mask)
+
+        for _ in range(rounds):
+            play(games, policy, roller)
+
+        scores[start:start + len(games.totals)] = games.totals
+
+    return scores
+
+
+def simulate_parallel(n: int, policy: Policy, seed: int | np.random.SeedSequence, workers: int = 1,
+                      chunk_size: int = 100_000, start_mask: int = 0, use_alias: bool = False) -> np.ndarray:
+    """
+    Plays n complete games across a process pool, reproducibly. The games are cut into
+    chunks of a fixed size and chunk i always rolls from child stream i of the root seed,
+    so the scores are identical whatever the number of workers.
+    :param n: Number of games.
+    :param policy: The policy choosing keeps and categories; it is pickled to each worker.
+    :param seed: The root seed, or the root SeedSequence.
+    :param workers: Number of worker processes, or 0 to use every CPU.
+    :param chunk_size: Number of games per chunk. Changing it changes the games played.
+    :param start_mask: Categories treated as already filled, which are left out of every game.
+    :param use_alias: Roll with the alias sampler.
+    :return: An (n,) array of final scores, in chunk order.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [(index, min(chunk_size, n - start), seed, start_mask, use_alias)
+              for index, start in enumerate(range(0, n, chunk_size))]
+
+    if workers == 1:
+        return np.concatenate([np.empty(0, dtype=np.int64), *(_play_chunk(policy, *chunk) for chunk in chunks)])
+
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_attach_policy,
+                             initargs=(policy,)) as pool:
+        return np.concatenate([np.empty(0, dtype=np.int64), *pool.map(_simulate_chunk, chunks)])
+
+
+def _play_chunk(policy: Policy, index: int, size: int, seed: int | np.random.SeedSequence, start_mask: int,
+                use_alias: bool) -> np.ndarray:
+    """
+    Plays one chunk of games on its own child stream of the root seed.
+    :param policy: The policy choosing keeps and categories.
+    :param index: The chunk index, which picks the child stream.
+    :param size: Number of games in the chunk.
+    :param seed: The root seed.
+    :param start_mask: Categories treated as already filled.
+    :param use_alias: Roll with the alias sampler.
+    :return: The final scores of the chunk's games.
+    """
+    roller = DiceRoller.for_stream(seed, index, use_alias=use_alias)
+    return simulate(size, policy, roller, start_mask, batch_size=max(size, 1))
+
+
+# Set in each worker process: the policy the games are played with.
+_worker_policy: Policy | None = None
+
+
+def _attach_policy(policy: Policy) -> None:
+    """
+    Installs the policy in a worker process.
+    :param policy: The policy.
+    """
+    global _worker_policy
+
+    _worker_policy = policy
+
+
+def _simulate_chunk(chunk: tuple[int, int, int | np.random.SeedSequence, int, bool]) -> np.ndarray:
+    """
+    Plays one chunk of games in a worker process.
+    :param chunk: The chunk index, number of games, root seed, start mask and alias flag.
+    :return: The final scores of the chunk's games.
+    """
+    return _play_chunk(_worker_policy, *chunk)
@@ -0,0 +1,289 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from src.packed_score_card import PackedScoreCard
+from src.roll_encoding import ROLL_COUNTS
+from src.roll_table import KEEP_TRANSITIONS, ROLL_KEEPS, ROLL_PROBABILITIES, SCORE_TABLE
+from src.score_card import (
+    UPPER_SECTION, UPPER_SECTION_BONUS, UPPER_SECTION_BONUS_THRESHOLD, YAHTZEE_BONUS, ScoreCard
+)
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+
+NUM_CATEGORIES = len(ScoreCategory)
+NUM_MASKS = 1 << NUM_CATEGORIES
+FULL_MASK = NUM_MASKS - 1
+
+# The upper-section subtotal only matters up to the bonus threshold, so it is capped
+# there; a capped subtotal of 63 means the bonus has already been awarded.
+UPPER_CAP = UPPER_SECTION_BONUS_THRESHOLD
+NUM_UPPER = UPPER_CAP + 1
+
+_POINTS = SCORE_TABLE.astype(np.int64)
+_UPPER_BITS = sum(1 << CATEGORY_INDEX[category] for category in UPPER_SECTION)
+_YAHTZEE_COLUMN = CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+_YAHTZEE_BIT = 1 << _YAHTZEE_COLUMN
+_COLUMN_BITS = 1 << np.arange(NUM_CATEGORIES)
+_UPPER_COLUMNS = np.flatnonzero(_COLUMN_BITS & _UPPER_BITS)
+_LOWER_COLUMNS = np.flatnonzero(_COLUMN_BITS & ~_UPPER_BITS)
+# The Yahtzee bonus each roll earns in each other column once the Yahtzee box is filled.
+_YAHTZEE_BONUSES = np.where(
+    (ROLL_COUNTS.max(axis=1) == 5)[:, np.newaxis] & (_COLUMN_BITS != _YAHTZEE_BIT), YAHTZEE_BONUS, 0
+)
+
+# Thread counts for the BLAS and OpenMP libraries numpy may use, set to one in workers so
+# the processes do not oversubscribe the cores between them.
+_THREAD_LIMITS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def card_state(card: ScoreCard | PackedScoreCard) -> tuple[int, int]:
+    """
+    Reduces a score card to the solver's game state.
+    Under ScoreCard's rules a later Yahtzee earns a bonus whenever the Yahtzee box has been
+    filled, whatever it scored, so bonus eligibility is already part of the filled mask.
+    :param card: A ScoreCard or PackedScoreCard.
+    :return: The filled-category mask and the upper-section subtotal capped at 63.
+    """
+    if isinstance(card, PackedScoreCard):
+        return card.filled, min(card.upper_subtotal, UPPER_CAP)
+
+    mask = 0
+    upper = 0
+
+    for category, score in card.scores.items():
+        if score is not None:
+            mask |= 1 << CATEGORY_INDEX[category]
+
+            if category in UPPER_SECTION:
+                upper += score.points
+
+    return mask, min(upper, UPPER_CAP)
+
+
+def category_values(values: np.ndarray, mask: int, uppers: np.ndarray) -> np.ndarray:
+    """
+    Values every way of scoring every final roll: the points, any bonuses earned and the
+    expected value of the game state that follows.
+    :param values: The (8192, 64) state value table, solved for every state after this one.
+    :param mask: The filled-category mask of the current state.
+    :param uppers: The capped upper-section subtotals to evaluate, as a (U,) integer array.
+    :return: A (U, 252, 13) array, -inf for categories that are already filled.
+    """
+    uppers = np.asarray(uppers, dtype=np.intp)
+    return category_values_batch(values, np.full(len(uppers), mask, dtype=np.intp), uppers)
+
+
+def category_values_batch(values: np.ndarray, masks: np.ndarray, uppers: np.ndarray,
+                          ranks: np.ndarray | None = None) -> np.ndarray:
+    """
+    Values every way of scoring final rolls for many game states at once, each with its own
+    filled mask: the points, any bonuses earned and the expected value of the game state
+    that follows. This is the one place the bonus rules are applied to a scoring choice.
+    :param values: The (8192, 64) state value table, solved for every state after these.
+    :param masks: The filled-category masks, as an (S,) integer array.
+    :param uppers: The capped upper-section subtotals, as an (S,) integer array.
+    :param ranks: The ranks of the rolls to value, as an (R,) integer array, or None for all 252.
+    :return: An (S, R, 13) array, -inf for categories that are already filled.
+    """
+    masks = np.asarray(masks, dtype=np.intp)
+    uppers = np.asarray(uppers, dtype=np.intp)[:, np.newaxis]
+    points = (_POINTS if ranks is None else _POINTS[ranks]).T[:, np.newaxis]
+    next_masks = masks | _COLUMN_BITS[:, np.newaxis]
+    # Gathered through the flat table, which is much faster than two-dimensional indexing.
+    flat_values = values.reshape(-1)
+    # Built category-major, (13, S, R), so each column is written contiguously.
+    value = np.empty((NUM_CATEGORIES, len(masks), points.shape[2]))
+    # The lower section leaves the subtotal alone, so its future values are one per state.
+    lower_states = next_masks[_LOWER_COLUMNS] * NUM_UPPER + uppers.T
+    value[_LOWER_COLUMNS] = points[_LOWER_COLUMNS] + flat_values.take(lower_states)[:, :, np.newaxis]
+
+    # The upper section moves the subtotal by the points scored, and may earn the bonus.
+    upper_points = points[_UPPER_COLUMNS]
+    subtotal = uppers + upper_points
+    bonus = np.where((uppers < UPPER_CAP) & (subtotal >= UPPER_CAP), UPPER_SECTION_BONUS, 0)
+    new_states = next_masks[_UPPER_COLUMNS][:, :, np.newaxis] * NUM_UPPER + np.minimum(subtotal, UPPER_CAP)
+    value[_UPPER_COLUMNS] = upper_points + bonus + flat_values.take(new_states)
+
+    yahtzee = np.flatnonzero(masks & _YAHTZEE_BIT)
+
+    if len(yahtzee):
+        yahtzee_bonus = _YAHTZEE_BONUSES if ranks is None else _YAHTZEE_BONUSES[ranks]
+        value[:, yahtzee] += yahtzee_bonus.T[:, np.newaxis]
+
+    value[next_masks == masks] = -np.inf
+    return value.transpose(1, 2, 0)
+
+
+def keep_values(roll_values: np.ndarray) -> np.ndarray:
+    """
+    Takes the expectation of roll values over the reroll that follows each keep.
+    :param roll_values: A (U, 252) array of values of the rolls that may be thrown next.
+    :return: A (U, 462) array of the expected value of each keep.
+    """
+    return KEEP_TRANSITIONS.expectation(roll_values)
+
+
+def best_keep_values(keeps: np.ndarray) -> np.ndarray:
+    """
+    Values each roll by the best keep it allows, keeping all five dice included.
+    :param keeps: A (U, 462) array of keep values.
+    :return: A (U, 252) array of roll values.
+    """
+    return keeps[:, ROLL_KEEPS].max(axis=2)
+
+
+def turn_values(values: np.ndarray, mask: int, uppers: np.ndarray) -> list[np.ndarray]:
+    """
+    Values every roll of a turn by backward induction over the rerolls.
+    :param values: The (8192, 64) state value table, solved for every state after this one.
+    :param mask: The filled-category mask of the current state.
+    :param uppers: The capped upper-section subtotals to evaluate, as a (U,) integer array.
+    :return: Three (U, 252) arrays, the value of holding each roll with 0, 1 and 2 rerolls left.
+    """
+    rolls = [category_values(values, mask, uppers).max(axis=2)]
+
+    for _ in range(2):
+        rolls.append(best_keep_values(keep_values(rolls[-1])))
+
+    return rolls
+
+
+def solve_mask(values: np.ndarray, mask: int) -> np.ndarray:
+    """
+    Solves the expected final score of every upper subtotal for one filled-category mask.
+    :param values: The (8192, 64) state value table, solved for every mask with more categories filled.
+    :param mask: The filled-category mask to solve.
+    :return: A (64,) array of expected scores still to come, from the start of a turn.
+    """
+    if mask == FULL_MASK:
+        return np.zeros(NUM_UPPER)
+
+    return turn_values(values, mask, np.arange(NUM_UPPER))[-1] @ ROLL_PROBABILITIES
+
+
+def best_categories(values: np.ndarray, mask: int) -> np.ndarray:
+    """
+    Finds the best category to score each final roll in, for every upper subtotal of a mask.
+    :param values: The (8192, 64) state value table, solved for every mask with more categories filled.
+    :param mask: A filled-category mask with at least one category open.
+    :return: A (64, 252) uint8 array of column indices in ScoreCategory order.
+    """
+    return category_values(values, mask, np.arange(NUM_UPPER)).argmax(axis=2).astype(np.uint8)
+
+
+def masks_by_layer(start_mask: int = 0) -> list[list[int]]:
+    """
+    Groups the masks reachable from a start mask by how many categories they have filled.
+    Every mask in a layer depends only on masks in later layers.
+    :param start_mask: The categories filled at the start of the game.
+    :return: The layers, from all categories filled back to the start mask, each sorted.
+    """
+    free = FULL_MASK & ~start_mask
+    layers: list[list[int]] = [[] for _ in range(NUM_CATEGORIES + 1)]
+    subset = free
+
+    while True:
+        mask = start_mask | subset
+        layers[mask.bit_count()].append(mask)
+
+        if subset == 0:
+            break
+
+        subset = (subset - 1) & free
+
+    return [sorted(layer) for layer in reversed(layers) if layer]
+
+
+def solve(start_mask: int = 0, workers: int = 1) -> np.ndarray:
+    """
+    Computes the expected-value-optimal strategy values for solitaire Yahtzee by dynamic
+    programming over game states, using the ScoreCard bonus rules. A full solve visits all
+    8192 masks and takes a minute or so on one core; a start mask restricts it to a smaller
+    game, and more workers split each layer of masks across processes.
+    :param start_mask: Categories treated as already filled, which are left out of the game.
+    :param workers: Number of worker processes, or 0 to use every CPU. With more than one,
+        the results are bit-identical to a serial solve.
+    :return: An (8192, 64) array of the expected score still to come from the start of a
+        turn in each state, indexed by filled mask and capped upper subtotal. States that
+        were not solved hold NaN.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1:
+        return _solve_parallel(start_mask, workers)
+
+    values = np.full((NUM_MASKS, NUM_UPPER), np.nan)
+
+    for layer in masks_by_layer(start_mask):
+        for mask in layer:
+            values[mask] = solve_mask(values, mask)
+
+    return values
+
+
+# Set in each worker process: the shared value table and the memory block backing it.
+_worker_memory: shared_memory.SharedMemory | None = None
+_worker_values: np.ndarray | None = None
+
+
+def _attach_worker(name: str) -> None:
+    """
+    Maps the shared value table into a worker process.
+    :param name: The name of the shared memory block.
+    """
+    global _worker_memory, _worker_values
+
+    # The parent creates and unlinks the block; workers only map it.
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_values = np.ndarray((NUM_MASKS, NUM_UPPER), dtype=np.float64, buffer=_worker_memory.buf)
+
+
+def _solve_worker_masks(masks: list[int]) -> None:
+    """
+    Solves a share of one layer, writing straight into the shared value table.
+    :param masks: The masks to solve, all from the same layer.
+    """
+    for mask in masks:
+        _worker_values[mask] = solve_mask(_worker_values, mask)
+
+
+def _solve_parallel(start_mask: int, workers: int) -> np.ndarray:
+    """
+    Solves layer by layer, splitting each layer across a process pool. Workers read the
+    later layers and write their own masks through one shared memory block, and each mask
+    is solved exactly as in the serial solve.
+    :param start_mask: Categories treated as already filled.
+    :param workers: Number of worker processes.
+    :return: The (8192, 64) state value table.
+    """
+    memory = shared_memory.SharedMemory(create=True, size=NUM_MASKS * NUM_UPPER * np.dtype(np.float64).itemsize)
+    # BLAS reads its thread count when numpy loads, before an initializer could set it, so
+    # the workers are started with it already in their environment.
+    saved = {name: os.environ.get(name) for name in _THREAD_LIMITS}
+    os.environ.update(dict.fromkeys(_THREAD_LIMITS, '1'))
+
+    try:
+        values = np.ndarray((NUM_MASKS, NUM_UPPER), dtype=np.float64, buffer=memory.buf)
+        values[:] = np.nan
+
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_attach_worker,
+                                 initargs=(memory.name,)) as pool:
+            for layer in masks_by_layer(start_mask):
+                # Several chunks per worker even out the uneven cost of masks.
+                chunks = [layer[start::workers * 4] for start in range(min(len(layer), workers * 4))]
+                list(pool.map(_solve_worker_masks, chunks))
+
+        result = values.copy()
+        del values
+        return result
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+import src
+from src.roll_table import KEEP_PROBABILITIES, SCORE_TABLE
+from src.score_card import UPPER_SECTION, UPPER_SECTION_BONUS, UPPER_SECTION_BONUS_THRESHOLD, YAHTZEE_BONUS
+from src.score_category import CATEGORY_INDEX
+from src.solver import FULL_MASK, NUM_MASKS, NUM_UPPER, best_categories, masks_by_layer, solve
+from src.utils import default_file_mode
+
+# File layout: a fixed-size header, the float32 state values and, optionally, the uint8
+# best-category table, all little-endian and at fixed offsets so both tables can be
+# memory-mapped in place.
+MAGIC = b"YAHTZSTR"
+FORMAT_VERSION = 3
+HEADER_SIZE = 128
+_HEADER = struct.Struct("<8sI16s32sII")
+
+VALUES_SHAPE = (NUM_MASKS, NUM_UPPER)
+ACTIONS_SHAPE = (NUM_MASKS, NUM_UPPER, SCORE_TABLE.shape[0])
+_VALUES_DTYPE = np.dtype("<f4")
+_VALUES_SIZE = int(np.prod(VALUES_SHAPE)) * _VALUES_DTYPE.itemsize
+_ACTIONS_SIZE = int(np.prod(ACTIONS_SHAPE))
+
+
+def _hash_rules() -> bytes:
+    """
+    Hashes everything the solved values depend on: the score of every roll in every
+    category, the reroll probabilities and the bonus rules.
+    :return: A 32-byte SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(SCORE_TABLE.astype("<i2").tobytes())
+    digest.update(KEEP_PROBABILITIES.astype("<f8").tobytes())
+    upper_bits = sum(1 << CATEGORY_INDEX[category] for category in UPPER_SECTION)
+    digest.update(struct.pack("<IIII", upper_bits, UPPER_SECTION_BONUS_THRESHOLD, UPPER_SECTION_BONUS, YAHTZEE_BONUS))
+    return digest.digest()
+
+
+# The rules are fixed once the tables are built, so they are hashed once, at import.
+_RULE_FINGERPRINT = _hash_rules()
+
+
+def rule_fingerprint() -> bytes:
+    """
+    Returns the fingerprint of the rules the solved values depend on.
+    :return: A 32-byte SHA-256 digest.
+    """
+    return _RULE_FINGERPRINT
+
+
+def _pack_header(start_mask: int, has_actions: bool) -> bytes:
+    """
+    Builds the file header for the current rule set and library version.
+    :param start_mask: The start mask the values were solved from.
+    :param has_actions: Whether the file holds the best-category table.
+    :return: The header, padded to HEADER_SIZE bytes.
+    """
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, src.__version__.encode(), _RULE_FINGERPRINT, start_mask,
+                          int(has_actions))
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+class StrategyTable:
+    """
+    Solved state values, and optionally the best category for every final roll, mapped
+    read-only from a strategy file. Opening one costs almost nothing: pages are read on
+    first touch and shared through the page cache by every process that maps the file.
+    """
+    def __init__(self, path: str, values: np.ndarray, actions: np.ndarray | None, start_mask: int) -> None:
+        """
+        Initializes a StrategyTable. Use open_strategy_file() or load_or_build() instead.
+        :param path: The path of the strategy file.
+        :param values: The (8192, 64) float32 value table, NaN for states that were not solved.
+        :param actions: The (8192, 64, 252) uint8 table of best category columns, or None.
+            Entries for states that were not solved, or have every category filled, are 0.
+        :param start_mask: The categories treated as already filled when the values were solved.
+        """
+        self.path = path
+        self.values = values
+        self.actions = actions
+        self.start_mask = start_mask
+
+    def covers(self, mask: int) -> bool:
+        """
+        Checks whether a filled-category mask was solved.
+        :param mask: The filled-category mask.
+        :return: True if the mask includes every category in the start mask.
+        """
+        return mask & self.start_mask == self.start_mask
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles as the path, so other processes map the same file instead of copying the tables.
+        :return: The callable and arguments that reopen the file.
+        """
+        return open_strategy_file, (self.path,)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the StrategyTable instance.
+        :return: A string representing the StrategyTable instance.
+        """
+        return f"StrategyTable(path={self.path!r}, start_mask={self.start_mask}, actions={self.actions is not None})"
+
+
+def write_strategy_file(path: str, values: np.ndarray, start_mask: int = 0, actions: bool = True) -> None:
+    """
+    Writes solved values to a strategy file, computing the best-category table from them.
+    The file is written beside its destination and renamed into place, so processes that
+    open it concurrently see either the old file or the complete new one.
+    :param path: The path to write.
+    :param values: The (8192, 64) value table returned by solve().
+    :param start_mask: The start mask the values were solved from.
+    :param actions: Whether to include the best-category table, which takes 132 MB on disk.
+    :raises ValueError: If the value table has the wrong shape.
+    """
+    values = np.asarray(values)
+
+    if values.shape != VALUES_SHAPE:
+        raise ValueError(f"Values must have shape {VALUES_SHAPE}, got {values.shape}.")
+
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+
+    try:
+        with os.fdopen(handle, "wb") as file:
+            os.fchmod(file.fileno(), default_file_mode())
+            file.write(_pack_header(start_mask, actions))
+            file.write(values.astype(_VALUES_DTYPE).tobytes())
+
+            if actions:
+                # Left sparse: only the pages of solved states are ever written.
+                file.truncate(HEADER_SIZE + _VALUES_SIZE + _ACTIONS_SIZE)
+
+        if actions:
+            table = np.memmap(temp_path, dtype=np.uint8, mode="r+", offset=HEADER_SIZE + _VALUES_SIZE,
+                              shape=ACTIONS_SHAPE)
+
+            for layer in masks_by_layer(start_mask):
+                for mask in layer:
+                    if mask != FULL_MASK:
+                        table[mask] = best_categories(values, mask)
+
+            table.flush()
+            del table
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def open_strategy_file(path: str) -> StrategyTable:
+    """
+    Maps a strategy file read-only after checking that it matches this library.
+    :param path: The path of the strategy file.
+    :return: The mapped StrategyTable.
+    :raises ValueError: If the file is not a strategy file, is truncated, or was built by a
+        different library version or for different rules.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        size = os.fstat(file.fileno()).st_size
+
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a strategy file.")
+
+    _, format_version, version, fingerprint, start_mask, has_actions = _HEADER.unpack_from(header)
+
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"{path} uses format version {format_version}, expected {FORMAT_VERSION}.")
+
+    version = version.rstrip(b"\0").decode()
+
+    if version != src.__version__:
+        raise ValueError(f"{path} was built by version {version}, expected {src.__version__}.")
+
+    if fingerprint != _RULE_FINGERPRINT:
+        raise ValueError(f"{path} was built for a different rule set.")
+
+    expected_size = HEADER_SIZE + _VALUES_SIZE + (_ACTIONS_SIZE if has_actions else 0)
+
+    if size != expected_size:
+        raise ValueError(f"{path} should be {expected_size} bytes, got {size}.")
+
+    values = np.memmap(path, dtype=_VALUES_DTYPE, mode="r", offset=HEADER_SIZE, shape=VALUES_SHAPE)
+    actions = None
+
+    if has_actions:
+        actions = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE + _VALUES_SIZE, shape=ACTIONS_SHAPE)
+
+    return StrategyTable(path, values, actions, start_mask)
+
+
+def load_or_build(path: str, start_mask: int = 0, actions: bool = True, workers: int = 1) -> StrategyTable:
+    """
+    Opens a cached strategy file, solving and rewriting it first if it is missing, stale,
+    or does not cover what is asked for.
+    :param path: The path of the cache file.
+    :param start_mask: The categories treated as already filled. A cached file solved from
+        a subset of these categories is reused as it is.
+    :param actions: Whether the best-category table is needed.
+    :param workers: Number of worker processes for the solve, as for solve().
+    :return: The mapped StrategyTable.
+    """
+    try:
+        table = open_strategy_file(path)
+
+        if table.covers(start_mask) and (table.actions is not None or not actions):
+            return table
+    except (FileNotFoundError, ValueError):
+        pass
+
+    write_strategy_file(path, solve(start_mask, workers), start_mask, actions)
+    return open_strategy_file(path)
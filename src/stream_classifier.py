@@ -0,0 +1,262 @@
+import argparse
+import csv
+import json
+import sys
+from contextlib import ExitStack
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+import numpy as np
+
+from src.roll_encoding import DIE_FACES, NUM_DICE
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.scorer import Scorer
+
+FORMATS = ('ndjson', 'csv')
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_DICE_COLUMNS = tuple(f"d{position}" for position in range(1, NUM_DICE + 1))
+
+_CATEGORY_NAMES = [category.value for category in ScoreCategory]
+
+
+def score_rolls(rolls: list[list[int]], scorer: Scorer) -> np.ndarray:
+    """
+    Scores a chunk of rolls, as one table lookup for the 5d6 rolls and with the Scorer for
+    any others.
+    :param rolls: The rolls, each a list of integer dice values.
+    :param scorer: The Scorer used for rolls that are not five six-sided dice.
+    :return: An (N, 13) array of points, with columns in ScoreCategory order.
+    :raises ValueError: If a roll is not a list of integers.
+    """
+    for row, roll in enumerate(rolls):
+        if not _is_integer_roll(roll):
+            raise ValueError(f"Roll {row}: dice must be integers, got {roll!r}.")
+
+    points = np.zeros((len(rolls), len(_CATEGORY_NAMES)), dtype=np.int64)
+    standard = [
+        row for row, roll in enumerate(rolls)
+        if len(roll) == NUM_DICE and all(1 <= die <= DIE_FACES for die in roll)
+    ]
+
+    if standard:
+        points[standard] = scorer.score_batch(np.array([rolls[row] for row in standard], dtype=np.int64))
+
+    if len(standard) < len(rolls):
+        for row in set(range(len(rolls))).difference(standard):
+            for score in scorer.get_scores(rolls[row]):
+                points[row, CATEGORY_INDEX[score.category]] = score.points
+
+    return points
+
+
+def classify_ndjson(lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE, roll_field: str = 'roll',
+                    scorer: Scorer | None = None) -> Iterator[str]:
+    """
+    Classifies a stream of NDJSON roll records, a chunk at a time, so memory use does not
+    depend on the length of the stream. Each line is an object with the roll under
+    roll_field, or a bare array of dice. Each output line is the input object with a
+    "scores" object added, mapping every category the roll scores in to its points.
+    :param lines: The input lines. Blank lines are skipped.
+    :param chunk_size: Number of records parsed and scored together.
+    :param roll_field: The field holding the roll.
+    :param scorer: The Scorer to use; a default one if omitted.
+    :return: An iterator of output lines, without line endings.
+    :raises ValueError: If the chunk size is not positive, or a line is not valid JSON or has no roll.
+    """
+    _check_chunk_size(chunk_size)
+    scorer = scorer or Scorer()
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+
+    while chunk := list(islice(numbered, chunk_size)):
+        records = [_parse_record(number, line, roll_field) for number, line in chunk]
+        points = score_rolls([record[roll_field] for record in records], scorer)
+
+        for record, row in zip(records, points.tolist()):
+            record['scores'] = {name: value for name, value in zip(_CATEGORY_NAMES, row) if value}
+            yield json.dumps(record)
+
+
+def classify_csv(lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 dice_columns: tuple[str, ...] = DEFAULT_DICE_COLUMNS, scorer: Scorer | None = None) -> Iterator[list]:
+    """
+    Classifies a stream of CSV roll records, a chunk at a time, so memory use does not
+    depend on the length of the stream. The first row is a header naming the columns,
+    with one column per die. Each output row is the input row followed by the points of
+    every category, in ScoreCategory order.
+    :param lines: The input lines.
+    :param chunk_size: Number of records parsed and scored together.
+    :param dice_columns: The names of the dice columns.
+    :param scorer: The Scorer to use; a default one if omitted.
+    :return: An iterator of output rows, starting with the header.
+    :raises ValueError: If the chunk size is not positive, a dice column is missing or a die
+        is not an integer.
+    """
+    _check_chunk_size(chunk_size)
+    scorer = scorer or Scorer()
+    reader = csv.reader(lines)
+    header = next(reader, None)
+
+    if header is None:
+        return
+
+    missing = [column for column in dice_columns if column not in header]
+
+    if missing:
+        raise ValueError(f"CSV header is missing the dice columns {missing}.")
+
+    positions = [header.index(column) for column in dice_columns]
+    yield header + _CATEGORY_NAMES
+
+    while True:
+        chunk = []
+        rolls = []
+
+        # Rows are parsed one at a time so an error names the line of the bad row.
+        for row in islice(reader, chunk_size):
+            try:
+                rolls.append([int(row[position]) for position in positions])
+            except (IndexError, ValueError) as error:
+                raise ValueError(f"CSV line {reader.line_num}: dice must be integers in every dice column.") from error
+
+            chunk.append(row)
+
+        if not chunk:
+            return
+
+        for row, points in zip(chunk, score_rolls(rolls, scorer).tolist()):
+            yield row + points
+
+
+def classify_stream(source: TextIO, sink: TextIO, record_format: str = 'ndjson', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    dice_columns: tuple[str, ...] = DEFAULT_DICE_COLUMNS, roll_field: str = 'roll') -> int:
+    """
+    Classifies every roll record read from a text stream and writes the results to another
+    as they are produced.
+    :param source: The input stream.
+    :param sink: The output stream.
+    :param record_format: 'ndjson' or 'csv', used for both input and output.
+    :param chunk_size: Number of records parsed and scored together.
+    :param dice_columns: The names of the dice columns, for CSV.
+    :param roll_field: The field holding the roll, for NDJSON.
+    :return: The number of records classified.
+    :raises ValueError: If the format is unknown, the chunk size is not positive or a record is malformed.
+    """
+    count = 0
+
+    if record_format == 'ndjson':
+        for line in classify_ndjson(source, chunk_size, roll_field):
+            sink.write(line + '\n')
+            count += 1
+    elif record_format == 'csv':
+        writer = csv.writer(sink, lineterminator='\n')
+        rows = classify_csv(source, chunk_size, dice_columns)
+        header = next(rows, None)
+
+        if header is not None:
+            writer.writerow(header)
+
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        raise ValueError(f"Format must be one of {FORMATS}, got {record_format!r}.")
+
+    return count
+
+
+def _parse_record(number: int, line: str, roll_field: str) -> dict:
+    """
+    Parses one NDJSON line into a record with a roll.
+    :param number: The line number, for error messages.
+    :param line: The line.
+    :param roll_field: The field holding the roll.
+    :return: The record; a bare array becomes an object with only the roll.
+    :raises ValueError: If the line is not valid JSON or has no roll of integer dice.
+    """
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Line {number}: invalid JSON: {error.msg}.") from error
+
+    if isinstance(record, list):
+        record = {roll_field: record}
+
+    if not isinstance(record, dict) or not isinstance(record.get(roll_field), list):
+        raise ValueError(f"Line {number}: expected an object with a '{roll_field}' array.")
+
+    if not _is_integer_roll(record[roll_field]):
+        raise ValueError(f"Line {number}: dice must be integers, got {record[roll_field]!r}.")
+
+    return record
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    """
+    Checks that a chunk size would take at least one record at a time.
+    :param chunk_size: The chunk size.
+    :raises ValueError: If the chunk size is less than one.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1, got {chunk_size}.")
+
+
+def _positive_int(text: str) -> int:
+    """
+    Parses a command-line argument that must be a positive integer.
+    :param text: The argument.
+    :return: The integer.
+    :raises argparse.ArgumentTypeError: If the argument is not a positive integer.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text!r}")
+
+    return value
+
+
+def _is_integer_roll(roll: object) -> bool:
+    """
+    Checks that a roll is a list of integer dice. Booleans are not dice.
+    :param roll: The roll to check.
+    :return: True if every die is an int.
+    """
+    return isinstance(roll, (list, tuple)) and all(isinstance(die, int) and not isinstance(die, bool) for die in roll)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point: classifies a file or standard input into a file or standard output.
+    :param argv: The arguments, or None to use sys.argv.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Classify a stream of Yahtzee rolls by the categories they score in.")
+    parser.add_argument('input', nargs='?', default='-', help="input file, or - for standard input")
+    parser.add_argument('-o', '--output', default='-', help="output file, or - for standard output")
+    parser.add_argument('-f', '--format', choices=FORMATS,
+                        help="record format; inferred from the input file extension, ndjson by default")
+    parser.add_argument('--chunk-size', type=_positive_int, default=DEFAULT_CHUNK_SIZE, help="records scored per batch")
+    parser.add_argument('--dice-columns', default=','.join(DEFAULT_DICE_COLUMNS), help="CSV dice column names")
+    parser.add_argument('--roll-field', default='roll', help="NDJSON field holding the roll")
+    args = parser.parse_args(argv)
+
+    record_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'ndjson')
+
+    with ExitStack() as streams:
+        try:
+            source = sys.stdin if args.input == '-' else streams.enter_context(open(args.input, newline=''))
+            sink = sys.stdout if args.output == '-' else streams.enter_context(open(args.output, 'w', newline=''))
+            classify_stream(source, sink, record_format, args.chunk_size, tuple(args.dice_columns.split(',')),
+                            args.roll_field)
+        except (OSError, ValueError) as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
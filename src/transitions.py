@@ -0,0 +1,105 @@
+from fractions import Fraction
+from typing import Sequence
+
+import numpy as np
+
+
+class TransitionMatrix:
+    """
+    A row-stochastic matrix of dice outcomes held exactly, as integer numerators over one
+    integer denominator per row, in compressed sparse row form alongside float64 copies.
+    A row is read or taken an expectation over in time proportional to its nonzeros. For
+    whole-matrix products the dense copy is used instead: with only a few hundred columns,
+    a BLAS matrix product beats a sparse product built from NumPy gathers at every batch size.
+    """
+    def __init__(self, counts: np.ndarray, denominators: np.ndarray) -> None:
+        """
+        Builds the matrix from outcome counts.
+        :param counts: A (rows, columns) array of non-negative integer outcome counts.
+        :param denominators: A (rows,) integer array, the number of equally likely outcomes per row.
+        :raises ValueError: If a row's counts do not sum to its denominator.
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        denominators = np.asarray(denominators, dtype=np.int64)
+
+        if counts.ndim != 2 or denominators.shape != counts.shape[:1]:
+            raise ValueError("Counts must be two-dimensional with one denominator per row.")
+
+        if (counts < 0).any() or (counts.sum(axis=1) != denominators).any():
+            raise ValueError("Every row of counts must be non-negative and sum to its denominator.")
+
+        rows, columns = np.nonzero(counts)
+        self.shape: tuple[int, int] = counts.shape
+        self.indptr = np.searchsorted(rows, np.arange(self.shape[0] + 1))
+        self.indices = columns
+        self.numerators = counts[rows, columns]
+        self.denominators = denominators
+        self.data = self.numerators / denominators[rows]
+        self.dense = counts / denominators[:, np.newaxis]
+        self._dense_columns = np.ascontiguousarray(self.dense.T)
+
+        for array in (self.indptr, self.indices, self.numerators, self.denominators, self.data, self.dense,
+                      self._dense_columns):
+            array.setflags(write=False)
+
+    @property
+    def nnz(self) -> int:
+        """
+        The number of nonzero entries.
+        :return: The number of outcomes with positive probability, over all rows.
+        """
+        return len(self.indices)
+
+    def row(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Reads the outcomes of one row that have positive probability.
+        :param index: The row index.
+        :return: The columns, ascending, and their float64 probabilities.
+        """
+        start, stop = self.indptr[index], self.indptr[index + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def exact_row(self, index: int) -> dict[int, Fraction]:
+        """
+        Reads the outcomes of one row that have positive probability, exactly.
+        :param index: The row index.
+        :return: A mapping from column to probability as a Fraction.
+        """
+        start, stop = self.indptr[index], self.indptr[index + 1]
+        denominator = int(self.denominators[index])
+        return {
+            int(column): Fraction(int(numerator), denominator)
+            for column, numerator in zip(self.indices[start:stop], self.numerators[start:stop])
+        }
+
+    def expectation(self, values: np.ndarray) -> np.ndarray:
+        """
+        Takes the expectation of outcome values under every row at once.
+        :param values: A (columns,) or (U, columns) array of outcome values.
+        :return: A (rows,) or (U, rows) array of expected values.
+        """
+        return values @ self._dense_columns
+
+    def row_expectation(self, index: int, values: np.ndarray) -> np.ndarray | float:
+        """
+        Takes the expectation of outcome values under one row, touching only its nonzeros.
+        :param index: The row index.
+        :param values: A (columns,) or (U, columns) array of outcome values.
+        :return: The expected value, or a (U,) array of them.
+        """
+        columns, probabilities = self.row(index)
+        return np.asarray(values)[..., columns] @ probabilities
+
+    def exact_expectation(self, index: int, values: Sequence[int | Fraction]) -> Fraction:
+        """
+        Takes the exact expectation of integer or rational outcome values under one row.
+        :param index: The row index.
+        :param values: A sequence of outcome values, one per column.
+        :return: The expected value as a Fraction.
+        """
+        start, stop = self.indptr[index], self.indptr[index + 1]
+        total = sum(
+            int(numerator) * values[column]
+            for column, numerator in zip(self.indices[start:stop].tolist(), self.numerators[start:stop])
+        )
+        return Fraction(total, int(self.denominators[index]))
@@ -1,9 +1,167 @@
+import json
+import os
+from collections.abc import Iterable, Iterator
+from enum import Enum
 from json import JSONEncoder
-from typing import Any
+from typing import Any, TextIO
+
+from src.roll_encoding import ROLL_INDEX
+from src.roll_table import INTERNED_SCORES
+from src.score import Score
+from src.score_card import ScoreCard
+from src.score_category import ScoreCategory
+
+# Every category name already JSON-encoded, so writing a Score never re-escapes one.
+_CATEGORY_JSON = {category: json.dumps(category.value) for category in ScoreCategory}
+_CATEGORIES_BY_VALUE = {category.value: category for category in ScoreCategory}
+
+# The interned Scores by rank and category, so decoding a sorted roll can hand one out.
+_INTERNED = {(rank, score.category): score for rank, scores in enumerate(INTERNED_SCORES) for score in scores}
 
 
 class DefaultEncoder(JSONEncoder):
+    """
+    A JSON encoder for the game's objects: anything with a to_dict() method is encoded
+    through it, enums by their value and other objects by their attributes.
+    """
     def default(self, obj) -> Any:
+        """
+        Converts an object the standard encoder cannot handle into one it can.
+        :param obj: The object to convert.
+        :return: A JSON-serializable representation of the object.
+        :raises TypeError: If the object cannot be converted.
+        """
+        if hasattr(obj, 'to_dict'):
+            return obj.to_dict()
+
+        if isinstance(obj, Enum):
+            return obj.value
+
         if hasattr(obj, '__dict__'):
-            return obj.__dict__()
-        return super().default(obj)
\ No newline at end of file
+            return vars(obj)
+
+        return super().default(obj)
+
+
+def default_file_mode() -> int:
+    """
+    Returns the permissions open() would give a new file under the current umask.
+    tempfile.mkstemp() creates files readable by their owner alone, so a file written
+    through one and renamed into place is given these first.
+    :return: The file mode bits.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def scores_to_dicts(scores: Iterable[Score | None]) -> list[dict[str, Any] | None]:
+    """
+    Converts many Scores to dictionaries, as Score.to_dict() does for one.
+    :param scores: The Scores to convert; None entries are kept as None.
+    :return: A list of dictionaries, in the same order.
+    """
+    return [
+        None if score is None else {'category': score.category.value, 'roll': list(score.roll), 'points': score.points}
+        for score in scores
+    ]
+
+
+def score_from_dict(data: dict[str, Any]) -> Score:
+    """
+    Creates a Score from a dictionary, as Score.from_dict() does, but hands out the shared,
+    interned Score when the roll is a sorted 5d6 roll with its usual points.
+    :param data: A dictionary containing the score data.
+    :return: A Score instance.
+    :raises ValueError: If the category is not a known category name.
+    """
+    category = _CATEGORIES_BY_VALUE.get(data['category'])
+
+    if category is None:
+        raise ValueError(f"Unknown score category {data['category']!r}.")
+
+    roll = data['roll']
+    key = tuple(roll)
+    rank = ROLL_INDEX.get(key)
+
+    if rank is not None:
+        score = _INTERNED.get((rank, category))
+
+        # The interned Score holds its roll as a tuple, so sharing it exposes nothing mutable.
+        if score is not None and score.points == data['points'] and score.roll == key:
+            return score
+
+    return Score(category, roll, data['points'])
+
+
+def scores_from_dicts(data: Iterable[dict[str, Any] | None]) -> list[Score | None]:
+    """
+    Creates many Scores from dictionaries with score_from_dict().
+    :param data: The score dictionaries; None entries are kept as None.
+    :return: A list of Scores, in the same order.
+    :raises ValueError: If a category is not a known category name.
+    """
+    return [None if item is None else score_from_dict(item) for item in data]
+
+
+def _score_json(score: Score) -> str:
+    """
+    Writes a Score as JSON text, exactly as json.dumps(score.to_dict()) would.
+    :param score: The Score to encode.
+    :return: The JSON text.
+    """
+    roll = ', '.join(map(str, score.roll))
+    return f'{{"category": {_CATEGORY_JSON[score.category]}, "roll": [{roll}], "points": {score.points}}}'
+
+
+def _score_card_json(card: ScoreCard) -> str:
+    """
+    Writes a ScoreCard as JSON text, exactly as json.dumps(card.to_dict()) would.
+    :param card: The ScoreCard to encode.
+    :return: The JSON text.
+    """
+    scores = ', '.join(
+        f'{_CATEGORY_JSON[category]}: {"null" if score is None else _score_json(score)}'
+        for category, score in card.scores.items()
+    )
+    bonus = 'true' if card.upper_section_bonus_awarded else 'false'
+    return f'{{"scores": {{{scores}}}, "upper_section_bonus_awarded": {bonus}, "yahtzee_bonus_count": {card.yahtzee_bonus_count}}}'
+
+
+def iter_json(obj: Any) -> Iterator[str]:
+    """
+    Encodes an object as JSON text piece by piece, so a large result never has to be held
+    as one string. Scores and ScoreCards are written directly, lists, tuples and other
+    iterables as arrays, and anything else as DefaultEncoder would encode it; joined, the
+    pieces match json.dumps(obj, cls=DefaultEncoder) for the same objects.
+    :param obj: A Score, ScoreCard, iterable of them, or any object DefaultEncoder handles.
+    :return: An iterator of JSON text fragments.
+    """
+    if isinstance(obj, Score):
+        yield _score_json(obj)
+    elif isinstance(obj, ScoreCard):
+        yield _score_card_json(obj)
+    elif isinstance(obj, (str, dict)) or not isinstance(obj, Iterable):
+        yield json.dumps(obj, cls=DefaultEncoder)
+    else:
+        yield '['
+
+        for index, item in enumerate(obj):
+            if index:
+                yield ', '
+
+            yield from iter_json(item)
+
+        yield ']'
+
+
+def dump_json(obj: Any, file: TextIO) -> None:
+    """
+    Writes an object as JSON to a text file, one fragment at a time, using iter_json().
+    :param obj: A Score, ScoreCard, iterable of them, or any object DefaultEncoder handles.
+    :param file: The text file object to write to.
+    """
+    write = file.write
+
+    for fragment in iter_json(obj):
+        write(fragment)
@@ -0,0 +1,296 @@
+import gc
+import pickle
+import weakref
+
+import numpy as np
+import pytest
+
+from src.advisor import Advice, Advisor
+from src.packed_score_card import PackedScoreCard
+from src.roll_encoding import ROLL_INDEX, ROLLS
+from src.roll_table import KEEPS
+from src.score import Score
+from src.score_card import ScoreCard
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.solver import FULL_MASK, category_values, solve, turn_values
+from src.strategy_file import open_strategy_file, write_strategy_file
+
+OPEN = (ScoreCategory.FIVES, ScoreCategory.SIXES, ScoreCategory.YAHTZEE)
+START_MASK = FULL_MASK & ~sum(1 << CATEGORY_INDEX[category] for category in OPEN)
+
+
+@pytest.fixture(scope="module")
+def values():
+    """Solve a small game with only fives, sixes and Yahtzee open."""
+    return solve(START_MASK)
+
+
+@pytest.fixture
+def card():
+    """Build a card with every category scored except fives, sixes and Yahtzee."""
+    card = PackedScoreCard()
+    card.filled = START_MASK
+    return card
+
+
+# Validation Tests
+@pytest.mark.parametrize("rerolls_left", [-1, 3])
+def test_advise_rejects_invalid_rerolls(values, card, rerolls_left):
+    """Test that rerolls left outside 0-2 are rejected."""
+    with pytest.raises(ValueError):
+        Advisor(values).advise(card, [1, 2, 3, 4, 5], rerolls_left)
+
+
+def test_advise_rejects_invalid_roll(values, card):
+    """Test that a roll that is not five dice is rejected."""
+    with pytest.raises(ValueError):
+        Advisor(values).advise(card, [1, 2, 3], 0)
+
+
+def test_advise_rejects_full_card(values):
+    """Test that a full card has no actions."""
+    card = PackedScoreCard()
+    card.filled = FULL_MASK
+    with pytest.raises(ValueError):
+        Advisor(values).advise(card, [1, 2, 3, 4, 5], 1)
+
+
+def test_advise_rejects_uncovered_card(tmp_path, values):
+    """Test that a card the strategy table was not solved for is rejected."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK, actions=False)
+    with pytest.raises(ValueError):
+        Advisor(open_strategy_file(path)).advise(ScoreCard(), [1, 2, 3, 4, 5], 2)
+
+
+def test_advise_rejects_unsolved_values(values):
+    """Test that raw values with NaN for the card's state are rejected like an uncovered table."""
+    with pytest.raises(ValueError):
+        Advisor(values).advise(PackedScoreCard(), [1, 2, 3, 4, 5], 2)
+
+
+def test_advise_batch_rejects_unsolved_values(values):
+    """Test that batched advice rejects states the raw values were not solved for."""
+    with pytest.raises(ValueError):
+        Advisor(values).advise_batch([0], [0], [0], 0)
+
+
+# Scoring Advice Tests
+def test_advise_scores_in_open_categories(values, card):
+    """Test that with no rerolls left only open categories are offered, best first."""
+    advice = Advisor(values).advise(card, [6, 6, 6, 6, 6], 0)
+    assert [action.category for action in advice] == [ScoreCategory.YAHTZEE, ScoreCategory.SIXES,
+                                                      ScoreCategory.FIVES]
+    assert all(action.keep is None for action in advice)
+    expected = category_values(values, START_MASK, np.array([0]))[0, ROLL_INDEX[(6, 6, 6, 6, 6)]]
+    assert advice[0].expected_value == pytest.approx(expected[CATEGORY_INDEX[ScoreCategory.YAHTZEE]])
+
+
+def test_advise_accepts_score_card(values):
+    """Test that a ScoreCard gets the same advice as the equivalent PackedScoreCard."""
+    card = ScoreCard()
+    packed = PackedScoreCard()
+    for category in ScoreCategory:
+        if category not in OPEN:
+            card.assign_score(Score(category, [1, 2, 3, 4, 6], 0))
+            packed.assign_score(Score(category, [1, 2, 3, 4, 6], 0))
+    advisor = Advisor(values)
+    assert [(a.category, a.expected_value) for a in advisor.advise(card, [5, 5, 1, 2, 3], 0)] == \
+           [(a.category, a.expected_value) for a in advisor.advise(packed, [5, 5, 1, 2, 3], 0)]
+
+
+# Keep Advice Tests
+@pytest.mark.parametrize("rerolls_left", [1, 2])
+def test_advise_best_keep_matches_solver(values, card, rerolls_left):
+    """Test that the best keep is worth what the solver values the roll at."""
+    roll = [6, 5, 3, 6, 1]
+    advice = Advisor(values).advise(card, roll, rerolls_left)
+    expected = turn_values(values, START_MASK, np.array([0]))[rerolls_left][0, ROLL_INDEX[tuple(roll)]]
+    assert advice[0].expected_value == pytest.approx(expected)
+    assert advice[0].keep == (6, 6)
+
+
+def test_advise_keeps_are_distinct_and_ranked(values, card):
+    """Test that every distinct keep is offered once, best first."""
+    advice = Advisor(values).advise(card, [2, 2, 2, 2, 2], 1)
+    assert sorted(action.keep for action in advice) == [(), (2,), (2, 2), (2, 2, 2), (2, 2, 2, 2), (2, 2, 2, 2, 2)]
+    assert all(action.category is None for action in advice)
+    assert [action.expected_value for action in advice] == sorted(
+        (action.expected_value for action in advice), reverse=True)
+
+
+def test_advise_uses_cache(values, card):
+    """Test that later rolls in the same state are answered from the cache."""
+    advisor = Advisor(values)
+    advisor.advise(card, [1, 2, 3, 4, 5], 2)
+    advisor.advise(card, [6, 6, 2, 3, 4], 2)
+    assert advisor.cache_info().hits >= 1
+    assert advisor.cache_info().misses == 2
+
+
+def test_advise_cache_evicts_least_recently_used(values, card):
+    """Test that the cache keeps at most cache_size entries, dropping the oldest."""
+    advisor = Advisor(values, cache_size=2)
+    other = PackedScoreCard()
+    other.filled = START_MASK
+    other.upper_subtotal = 20
+
+    advisor.advise(card, [1, 2, 3, 4, 5], 1)
+    advisor.advise(other, [1, 2, 3, 4, 5], 1)
+    advisor.advise(card, [6, 6, 6, 1, 2], 1)
+    advisor.advise(other, [1, 2, 3, 4, 6], 2)
+    assert advisor.cache_info().currsize == 2
+    assert advisor.cache_info().hits == 2
+
+    advisor.advise(card, [1, 2, 3, 4, 5], 1)
+    assert advisor.cache_info().misses == 4
+
+
+def test_advisor_has_no_reference_cycle(values, card):
+    """Test that an advisor is freed as soon as it is dropped, without the garbage collector."""
+    advisor = Advisor(values)
+    advisor.advise(card, [1, 2, 3, 4, 5], 2)
+    reference = weakref.ref(advisor)
+    gc.disable()
+
+    try:
+        del advisor
+        assert reference() is None
+    finally:
+        gc.enable()
+
+
+def test_scoring_values_match_category_values(values):
+    """Test that valuing one roll gives exactly the solver's values for every category."""
+    advisor = Advisor(values)
+    mask = START_MASK | 1 << CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+
+    for upper in (0, 40, 63):
+        expected = category_values(values, mask, np.array([upper]))[0]
+        np.testing.assert_array_equal(advisor._score_options(mask, upper), expected)
+        assert advisor._score_options(mask, upper, 251).tolist() == expected[251].tolist()
+
+
+def test_advise_with_strategy_table(tmp_path, values, card):
+    """Test that a mapped strategy table gives the same advice as the solved values."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK, actions=False)
+    mapped = Advisor(open_strategy_file(path)).advise(card, [5, 5, 6, 1, 2], 2)
+    direct = Advisor(values).advise(card, [5, 5, 6, 1, 2], 2)
+    assert [action.keep for action in mapped][:3] == [action.keep for action in direct][:3]
+    assert mapped[0].expected_value == pytest.approx(direct[0].expected_value, rel=1e-6)
+
+
+# Batch Advice Tests
+def test_advise_batch_matches_advise(values):
+    """Test that batched advice matches the best single-state advice for every request."""
+    rng = np.random.default_rng(7)
+    open_bits = [1 << CATEGORY_INDEX[category] for category in OPEN]
+    masks = START_MASK | rng.integers(0, 2, (200, len(OPEN))) @ open_bits
+    masks[masks == FULL_MASK] = START_MASK
+    uppers = rng.integers(0, 80, 200)
+    ranks = rng.integers(0, 252, 200)
+    rerolls_left = rng.integers(0, 3, 200)
+
+    advisor = Advisor(values)
+    actions, expected = advisor.advise_batch(masks, uppers, ranks, rerolls_left)
+
+    for index in range(200):
+        card = PackedScoreCard()
+        card.filled = int(masks[index])
+        card.upper_subtotal = int(uppers[index])
+        advice = advisor.advise(card, list(ROLLS[ranks[index]]), int(rerolls_left[index]))
+        assert expected[index] == pytest.approx(advice[0].expected_value)
+        # Ties between equally good actions may be broken either way.
+        if rerolls_left[index] == 0:
+            chosen = [a for a in advice if a.category == list(ScoreCategory)[actions[index]]]
+        else:
+            chosen = [a for a in advice if a.keep == KEEPS[actions[index]]]
+        assert chosen[0].expected_value == pytest.approx(expected[index])
+
+
+def test_advise_batch_broadcasts_rerolls(values):
+    """Test that a single rerolls-left value applies to every request."""
+    advisor = Advisor(values)
+    masks = np.full(3, START_MASK)
+    ranks = np.array([ROLL_INDEX[(1, 2, 3, 4, 5)], ROLL_INDEX[(6, 6, 6, 6, 6)], ROLL_INDEX[(5, 5, 6, 6, 1)]])
+    actions, expected = advisor.advise_batch(masks, np.zeros(3), ranks, 0)
+    assert actions[1] == CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+    assert expected.shape == (3,)
+
+
+def test_advise_batch_empty(values):
+    """Test that an empty batch returns empty arrays."""
+    actions, expected = Advisor(values).advise_batch([], [], [], [])
+    assert actions.shape == expected.shape == (0,)
+
+
+@pytest.mark.parametrize("masks, uppers, ranks, rerolls_left", [
+    ([START_MASK], [0, 0], [0], 0),  # Mismatched lengths
+    ([FULL_MASK], [0], [0], 0),  # Full card
+    ([START_MASK], [-1], [0], 0),  # Negative subtotal
+    ([START_MASK], [0], [252], 0),  # Rank out of range
+    ([START_MASK], [0], [0], 3),  # Too many rerolls
+])
+def test_advise_batch_rejects_invalid_requests(values, masks, uppers, ranks, rerolls_left):
+    """Test that invalid requests are rejected."""
+    with pytest.raises(ValueError):
+        Advisor(values).advise_batch(masks, uppers, ranks, rerolls_left)
+
+
+def test_advise_batch_rejects_uncovered_card(tmp_path, values):
+    """Test that a card the strategy table was not solved for is rejected."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK, actions=False)
+    with pytest.raises(ValueError):
+        Advisor(open_strategy_file(path)).advise_batch([0], [0], [0], 2)
+
+
+@pytest.mark.parametrize("actions", [True, False])
+def test_best_categories_matches_advise_batch(tmp_path, values, actions):
+    """Test that the best categories, read from the table or valued, match advise_batch."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK, actions=actions)
+    advisor = Advisor(open_strategy_file(path))
+    masks = np.array([START_MASK, START_MASK | 1 << CATEGORY_INDEX[ScoreCategory.SIXES]] * 126)
+    uppers = np.arange(252) % 64
+    ranks = np.arange(252)
+
+    columns, _ = Advisor(values).advise_batch(masks, uppers, ranks, 0)
+    np.testing.assert_array_equal(advisor.best_categories(masks, uppers, ranks), columns)
+
+
+def test_best_categories_reads_the_table(tmp_path, values, monkeypatch):
+    """Test that a table with best categories answers without valuing any options."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK)
+    monkeypatch.setattr("src.advisor.category_values_batch", lambda *args: pytest.fail("options valued"))
+    columns = Advisor(open_strategy_file(path)).best_categories([START_MASK], [0], [ROLL_INDEX[(6, 6, 6, 6, 6)]])
+    assert columns.tolist() == [CATEGORY_INDEX[ScoreCategory.YAHTZEE]]
+
+
+def test_best_categories_rejects_uncovered_card(tmp_path, values):
+    """Test that a card the strategy table was not solved for is rejected, not read as column 0."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK)
+    with pytest.raises(ValueError):
+        Advisor(open_strategy_file(path)).best_categories([0], [0], [0])
+
+
+def test_advisor_pickles_without_caches(tmp_path, values, card):
+    """Test that an advisor pickles its values and starts again with empty caches."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK, actions=False)
+    advisor = Advisor(open_strategy_file(path), cache_size=16)
+    advisor.advise(card, [1, 2, 3, 4, 5], 2)
+    restored = pickle.loads(pickle.dumps(advisor))
+    assert restored.cache_size == 16
+    assert restored.table.path == path
+    assert restored.cache_info().currsize == 0
+    assert restored.advise(card, [1, 2, 3, 4, 5], 2)[0].keep == advisor.advise(card, [1, 2, 3, 4, 5], 2)[0].keep
+
+
+def test_advice_repr():
+    """Test the string representation of advice."""
+    assert repr(Advice((6, 6), None, 12.5)) == "Advice(keep=(6, 6), expected_value=12.5000)"
+    assert repr(Advice(None, ScoreCategory.SIXES, 3)) == "Advice(category=ScoreCategory.SIXES, expected_value=3.0000)"
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from src.alias_table import AliasTable
+from src.roll_table import KEEP_PROBABILITIES, ROLL_PROBABILITIES
+
+
+def implied_distribution(table: AliasTable, row: int = 0) -> np.ndarray:
+    """Reconstruct the exact distribution encoded by one row of an alias table."""
+    n = table.num_outcomes
+    result = table.prob[row] / n
+    np.add.at(result, table.alias[row], (1.0 - table.prob[row]) / n)
+    return result
+
+
+# Construction Tests
+@pytest.mark.parametrize("probabilities", [
+    [1.0],
+    [0.5, 0.5],
+    [0.1, 0.2, 0.3, 0.4],
+    [0.0, 0.0, 1.0],
+    [3, 1, 0, 4],  # Unnormalized weights
+])
+def test_alias_table_encodes_distribution(probabilities):
+    """Test that the alias table encodes exactly the requested distribution."""
+    table = AliasTable(np.array(probabilities, dtype=float))
+    expected = np.array(probabilities, dtype=float) / sum(probabilities)
+    assert np.allclose(implied_distribution(table), expected, atol=1e-12)
+
+
+def test_alias_table_roll_distribution():
+    """Test that the sorted-roll alias table encodes the multinomial roll distribution."""
+    table = AliasTable(ROLL_PROBABILITIES)
+    assert np.allclose(implied_distribution(table), ROLL_PROBABILITIES, atol=1e-12)
+
+
+def test_alias_table_keep_distributions():
+    """Test that every keep alias table encodes its reroll distribution."""
+    table = AliasTable(KEEP_PROBABILITIES)
+    for row in range(0, len(KEEP_PROBABILITIES), 37):
+        assert np.allclose(implied_distribution(table, row), KEEP_PROBABILITIES[row], atol=1e-12)
+
+
+@pytest.mark.parametrize("probabilities", [
+    [0.0, 0.0],
+    [0.5, -0.5, 1.0],
+])
+def test_alias_table_invalid_probabilities(probabilities):
+    """Test that invalid distributions are rejected."""
+    with pytest.raises(ValueError, match="Probabilities must be non-negative"):
+        AliasTable(np.array(probabilities))
+
+
+# Sampling Tests
+def test_sample_never_draws_zero_probability_outcomes():
+    """Test that outcomes with zero probability are never drawn."""
+    table = AliasTable(np.array([0.0, 0.25, 0.0, 0.75]))
+    draws = table.sample(np.random.default_rng(42), size=10000)
+    assert set(np.unique(draws).tolist()) == {1, 3}
+
+
+def test_sample_frequencies():
+    """Test that sampled frequencies match the distribution."""
+    table = AliasTable(np.array([0.1, 0.2, 0.3, 0.4]))
+    draws = table.sample(np.random.default_rng(42), size=100000)
+    frequencies = np.bincount(draws, minlength=4) / len(draws)
+    assert np.allclose(frequencies, [0.1, 0.2, 0.3, 0.4], atol=0.01)
+
+
+def test_sample_per_draw_tables():
+    """Test that each draw uses its own table when given an array of tables."""
+    table = AliasTable(np.array([[1.0, 0.0], [0.0, 1.0]]))
+    draws = table.sample(np.random.default_rng(42), np.array([0, 1, 1, 0]))
+    assert draws.tolist() == [0, 1, 1, 0]
+
+
+def test_sample_one_matches_sample():
+    """Test that sample_one draws the same outcomes as sample for the same stream."""
+    table = AliasTable(ROLL_PROBABILITIES)
+    rng1 = np.random.default_rng(7)
+    rng2 = np.random.default_rng(7)
+
+    single = [table.sample_one(rng1) for _ in range(100)]
+    bulk = table.sample(rng2, size=100)
+
+    assert single == bulk.tolist()
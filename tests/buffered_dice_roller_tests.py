@@ -0,0 +1,102 @@
+import gc
+import threading
+
+import numpy as np
+import pytest
+
+from src.buffered_dice_roller import BufferedDiceRoller
+from src.dice_roller import DiceRoller
+
+
+def fill_threads():
+    """Return the live background fill threads."""
+    return [thread for thread in threading.enumerate() if thread.name == "BufferedDiceRoller"]
+
+
+# Sequence Tests
+@pytest.mark.parametrize("block_size, low_watermark", [(1, 0), (3, 1), (64, 16), (65536, 16384)])
+def test_rolls_match_unbuffered(block_size, low_watermark):
+    """Test that buffered rolls match an unbuffered roller with the same seed."""
+    with BufferedDiceRoller(seed=42, block_size=block_size, low_watermark=low_watermark) as buffered:
+        unbuffered = DiceRoller(seed=42)
+        assert [buffered.roll() for _ in range(500)] == [unbuffered.roll() for _ in range(500)]
+
+
+def test_mixed_calls_match_unbuffered():
+    """Test that every kind of draw stays in step with an unbuffered roller."""
+    with BufferedDiceRoller(seed=7, block_size=10, low_watermark=3) as buffered:
+        unbuffered = DiceRoller(seed=7)
+        for _ in range(50):
+            assert buffered.roll() == unbuffered.roll()
+            assert buffered.reroll([1, 2, 3, 4, 5], [0, 3]) == unbuffered.reroll([1, 2, 3, 4, 5], [0, 3])
+            assert (buffered.roll_many(7) == unbuffered.roll_many(7)).all()
+            assert buffered.roll_rank() == unbuffered.roll_rank()
+            assert (buffered.roll_many_ranks(3) == unbuffered.roll_many_ranks(3)).all()
+            dice = np.array([[1, 2, 3, 4, 5], [6, 6, 6, 1, 1]])
+            keep = np.array([[True, False, True, False, False], [True, True, True, False, False]])
+            assert (buffered.reroll_many(dice, keep) == unbuffered.reroll_many(dice, keep)).all()
+
+
+def test_counter_based_matches_unbuffered():
+    """Test that a buffered Philox roller matches an unbuffered one."""
+    with BufferedDiceRoller(seed=3, block_size=16, low_watermark=4, counter_based=True) as buffered:
+        unbuffered = DiceRoller(seed=3, counter_based=True)
+        assert [buffered.roll() for _ in range(100)] == [unbuffered.roll() for _ in range(100)]
+        assert buffered.roll_at(5, 2, 1) == unbuffered.roll_at(5, 2, 1)
+
+
+def test_spawned_buffered_rollers():
+    """Test that the stream factories build buffered rollers."""
+    rollers = BufferedDiceRoller.spawn(42, 2, block_size=8, low_watermark=2)
+    assert all(isinstance(roller, BufferedDiceRoller) for roller in rollers)
+    assert rollers[1].roll() == DiceRoller.for_stream(42, 1).roll()
+    for roller in rollers:
+        roller.close()
+
+
+def test_large_draw_spans_blocks():
+    """Test that a draw larger than a block takes dice from several blocks."""
+    with BufferedDiceRoller(seed=5, block_size=4, low_watermark=1) as buffered:
+        assert (buffered.roll_many(50) == DiceRoller(seed=5).roll_many(50)).all()
+
+
+def test_rolls_are_independent_lists():
+    """Test that handed-out rolls can be modified without affecting later ones."""
+    with BufferedDiceRoller(seed=1, block_size=8, low_watermark=2) as buffered:
+        first = buffered.roll()
+        first[0] = 99
+        unbuffered = DiceRoller(seed=1)
+        unbuffered.roll()
+        assert [buffered.roll() for _ in range(20)] == [unbuffered.roll() for _ in range(20)]
+
+
+# Lifecycle Tests
+@pytest.mark.parametrize("block_size, low_watermark", [(0, 0), (10, -1), (10, 11)])
+def test_rejects_invalid_buffer_sizes(block_size, low_watermark):
+    """Test that invalid block sizes and watermarks are rejected."""
+    with pytest.raises(ValueError):
+        BufferedDiceRoller(block_size=block_size, low_watermark=low_watermark)
+
+
+def test_close_stops_thread():
+    """Test that closing the roller ends its background thread."""
+    before = len(fill_threads())
+    roller = BufferedDiceRoller(seed=1, block_size=8, low_watermark=2)
+    assert len(fill_threads()) == before + 1
+    roller.close()
+    roller.close()
+    for thread in fill_threads():
+        thread.join(timeout=1)
+    assert len(fill_threads()) == before
+
+
+def test_abandoned_roller_stops_thread():
+    """Test that a roller that is garbage collected ends its background thread."""
+    before = len(fill_threads())
+    roller = BufferedDiceRoller(seed=1, block_size=8, low_watermark=2)
+    roller.roll()
+    del roller
+    gc.collect()
+    for thread in fill_threads():
+        thread.join(timeout=1)
+    assert len(fill_threads()) == before
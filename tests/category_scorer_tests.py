@@ -1,3 +1,6 @@
+from itertools import product
+
+import numpy as np
 import pytest
 
 from src.category_scorer import (
@@ -7,8 +10,14 @@ from src.category_scorer import (
     score_small_straight,
     score_large_straight,
     score_yahtzee,
+    has_small_straight,
+    has_large_straight,
+    score_face_counts,
+    score_face_counts_batch,
     CATEGORY_SCORERS
 )
+from src.roll_encoding import ROLL_COUNTS, face_counts, face_counts_batch
+from src.roll_table import SCORE_TABLE
 from src.score_category import ScoreCategory
 
 
@@ -682,3 +691,45 @@ def test_all_category_scorers_consistency():
             assert result.points >= 0
             assert result.roll == test_roll
 
+
+# Face count scoring Tests
+def expected_points(roll):
+    """Score a roll with the category scorers, 0 where a category does not score."""
+    scores = [scorer(roll) for scorer in CATEGORY_SCORERS.values()]
+    return [score.points if score is not None else 0 for score in scores]
+
+@pytest.mark.parametrize("num_dice", [0, 1, 2, 3, 4, 5])
+def test_score_face_counts_matches_category_scorers(num_dice):
+    """Test that scoring from face counts agrees with the category scorers for any dice count."""
+    for roll in product(range(1, 7), repeat=num_dice):
+        roll = list(roll)
+        assert score_face_counts(face_counts(roll)) == expected_points(roll), f"Mismatch for {roll}"
+
+def test_score_face_counts_batch_matches_score_table():
+    """Test that batch face count scoring reproduces the precomputed score table."""
+    assert (score_face_counts_batch(ROLL_COUNTS) == SCORE_TABLE).all()
+
+@pytest.mark.parametrize("num_dice", [1, 3, 6, 7])
+def test_score_face_counts_batch_other_dice_counts(num_dice):
+    """Test that batch face count scoring handles rolls of any size."""
+    rolls = np.random.default_rng(42).integers(1, 7, size=(500, num_dice))
+    result = score_face_counts_batch(face_counts_batch(rolls))
+    expected = [expected_points(roll) for roll in rolls.tolist()]
+    assert result.tolist() == expected
+
+@pytest.mark.parametrize("roll,small,large", [
+    ([1, 2, 3, 4, 6], True, False),
+    ([2, 3, 4, 5, 5], True, False),
+    ([3, 4, 5, 6, 6], True, False),
+    ([1, 2, 3, 4, 5], True, True),
+    ([2, 3, 4, 5, 6], True, True),
+    ([1, 2, 3, 5, 6], False, False),
+    ([1, 1, 1, 1, 1], False, False),
+    ([1, 2, 3, 4, 5, 6], True, False),  # Extra face spoils the large straight
+])
+def test_straight_detection_from_counts(roll, small, large):
+    """Test straight detection on face counts."""
+    counts = face_counts(roll)
+    assert has_small_straight(counts) == small
+    assert has_large_straight(counts) == large
+
@@ -1,4 +1,9 @@
+import numpy as np
+import pytest
+
 from src.dice_roller import DiceRoller
+from src.roll_encoding import encode_rolls
+from src.roll_table import ROLL_PROBABILITIES
 
 
 # Initialization Tests
@@ -436,3 +441,302 @@ def test_reroll_maintains_die_constraints():
         assert dice == sorted(dice)
         for value in dice:
             assert 1 <= value <= 8
+
+
+# Bulk Roll Tests
+def test_roll_many_shape_and_order():
+    """Test that roll_many returns sorted rows of the configured size."""
+    roller = DiceRoller(seed=42)
+    result = roller.roll_many(1000)
+
+    assert isinstance(result, np.ndarray)
+    assert result.shape == (1000, 5)
+    assert (np.diff(result, axis=1) >= 0).all()
+    assert result.min() >= 1
+    assert result.max() <= 6
+
+def test_roll_many_matches_repeated_roll():
+    """Test that roll_many produces the same rolls as repeated roll calls."""
+    roller1 = DiceRoller(seed=42)
+    roller2 = DiceRoller(seed=42)
+
+    bulk = roller1.roll_many(50)
+    single = [roller2.roll() for _ in range(50)]
+
+    assert bulk.tolist() == single
+    # Both generators should be left in the same state
+    assert roller1.roll() == roller2.roll()
+
+def test_roll_many_with_custom_dice():
+    """Test that roll_many respects custom dice counts and sizes."""
+    roller = DiceRoller(num_dice=3, die_size=20, seed=7)
+    result = roller.roll_many(200)
+
+    assert result.shape == (200, 3)
+    assert result.min() >= 1
+    assert result.max() <= 20
+
+def test_roll_many_zero_rolls():
+    """Test that roll_many handles zero rolls."""
+    roller = DiceRoller()
+    assert roller.roll_many(0).shape == (0, 5)
+
+
+# Bulk Reroll Tests
+def test_reroll_many_keeps_masked_dice():
+    """Test that kept dice survive a bulk reroll."""
+    roller = DiceRoller(seed=42)
+    dice = np.array([[1, 2, 3, 4, 5], [6, 6, 6, 6, 6]])
+    keep_mask = np.array([[True, True, True, True, False], [True, True, True, True, True]])
+
+    result = roller.reroll_many(dice, keep_mask)
+
+    assert result.shape == (2, 5)
+    assert (np.diff(result, axis=1) >= 0).all()
+    assert {1, 2, 3, 4}.issubset(result[0].tolist())
+    assert result[1].tolist() == [6, 6, 6, 6, 6]
+
+def test_reroll_many_matches_reroll():
+    """Test that reroll_many matches row-by-row reroll calls for the same seed."""
+    roller1 = DiceRoller(seed=42)
+    roller2 = DiceRoller(seed=42)
+    dice = roller1.roll_many(200)
+    roller2.roll_many(200)
+    keep_mask = DiceRoller(seed=1).rng.random(dice.shape) < 0.5
+
+    result = roller1.reroll_many(dice, keep_mask)
+    expected = [
+        roller2.reroll(row.tolist(), np.flatnonzero(~keep).tolist())
+        for row, keep in zip(dice, keep_mask)
+    ]
+
+    assert result.tolist() == expected
+
+def test_reroll_many_preserves_input():
+    """Test that reroll_many does not modify the input array."""
+    roller = DiceRoller(seed=42)
+    dice = np.array([[1, 2, 3, 4, 5]])
+    original = dice.copy()
+
+    roller.reroll_many(dice, np.zeros((1, 5), dtype=bool))
+
+    assert (dice == original).all()
+
+def test_reroll_many_shape_mismatch():
+    """Test that reroll_many rejects mismatched shapes."""
+    roller = DiceRoller()
+    dice = np.ones((3, 5), dtype=np.int64)
+
+    with pytest.raises(ValueError, match="keep_mask must have shape"):
+        roller.reroll_many(dice, np.ones((3, 4), dtype=bool))
+
+    with pytest.raises(ValueError, match="dice must have shape"):
+        roller.reroll_many(np.ones((3, 4), dtype=np.int64), np.ones((3, 4), dtype=bool))
+
+
+# Alias Sampler Tests
+def test_alias_mode_requires_standard_dice():
+    """Test that alias sampling is only available for five six-sided dice."""
+    with pytest.raises(ValueError, match="alias sampler only supports"):
+        DiceRoller(num_dice=4, use_alias=True)
+
+    with pytest.raises(ValueError, match="alias sampler only supports"):
+        DiceRoller(die_size=8, use_alias=True)
+
+def test_alias_roll_returns_sorted_valid_dice():
+    """Test that alias rolls look like ordinary rolls."""
+    roller = DiceRoller(seed=42, use_alias=True)
+    for _ in range(100):
+        result = roller.roll()
+        assert len(result) == 5
+        assert result == sorted(result)
+        assert all(isinstance(value, int) and 1 <= value <= 6 for value in result)
+
+def test_alias_roll_deterministic_with_seed():
+    """Test that alias rolls are reproducible for a seed."""
+    roller1 = DiceRoller(seed=42, use_alias=True)
+    roller2 = DiceRoller(seed=42, use_alias=True)
+    assert [roller1.roll() for _ in range(20)] == [roller2.roll() for _ in range(20)]
+    assert roller1.roll_many(20).tolist() == roller2.roll_many(20).tolist()
+
+def test_alias_roll_many_matches_dice_distribution():
+    """Test that alias rolls follow the same distribution as rolled dice."""
+    rolls = DiceRoller(seed=42, use_alias=True).roll_many(200000)
+    assert rolls.dtype == np.int64
+    assert (np.diff(rolls, axis=1) >= 0).all()
+
+    frequencies = np.bincount(encode_rolls(rolls), minlength=252) / len(rolls)
+    assert np.abs(frequencies - ROLL_PROBABILITIES).max() < 0.002
+
+    # Face frequencies should be uniform, as for ordinary dice
+    faces = np.bincount(rolls.ravel(), minlength=7)[1:] / rolls.size
+    assert np.allclose(faces, 1 / 6, atol=0.005)
+
+def test_alias_reroll_keeps_dice():
+    """Test that alias rerolls keep the dice that were not rerolled."""
+    roller = DiceRoller(seed=42, use_alias=True)
+    for _ in range(100):
+        result = roller.reroll([2, 2, 5, 6, 6], [2, 3])
+        assert len(result) == 5
+        assert result == sorted(result)
+        for die in (2, 2, 6):
+            assert result.count(die) >= [2, 2, 6].count(die)
+
+    assert roller.reroll([1, 2, 3, 4, 5], []) == [1, 2, 3, 4, 5]
+
+def test_alias_reroll_distribution():
+    """Test that a single rerolled die is uniform in alias mode."""
+    roller = DiceRoller(seed=42, use_alias=True)
+    counts = {value: 0 for value in range(1, 7)}
+    for _ in range(12000):
+        result = roller.reroll([6, 6, 6, 6, 6], [0])
+        counts[result[0]] += 1
+
+    for value, count in counts.items():
+        assert abs(count - 2000) < 200, f"Value {value} appeared {count} times"
+
+def test_alias_reroll_many_keeps_masked_dice():
+    """Test that alias bulk rerolls keep masked dice, in any row order."""
+    roller = DiceRoller(seed=42, use_alias=True)
+    dice = np.array([[5, 1, 5, 2, 3]] * 1000)
+    keep_mask = np.array([[True, False, True, False, False]] * 1000)
+
+    result = roller.reroll_many(dice, keep_mask)
+
+    assert result.shape == (1000, 5)
+    assert (np.diff(result, axis=1) >= 0).all()
+    assert ((result == 5).sum(axis=1) >= 2).all()
+    # Three rerolled dice average 3.5 each
+    assert abs(result.sum(axis=1).mean() - (10 + 3 * 3.5)) < 0.2
+
+
+# Roll Rank Tests
+def test_roll_rank_matches_roll():
+    """Test that roll_rank encodes the same roll that roll would return."""
+    roller1 = DiceRoller(seed=42)
+    roller2 = DiceRoller(seed=42)
+    for _ in range(20):
+        assert roller1.roll_rank() == encode_rolls(np.array([roller2.roll()]))[0]
+
+def test_roll_many_ranks_matches_roll_many():
+    """Test that roll_many_ranks encodes the rolls roll_many would return."""
+    for use_alias in (False, True):
+        roller1 = DiceRoller(seed=42, use_alias=use_alias)
+        roller2 = DiceRoller(seed=42, use_alias=use_alias)
+        ranks = roller1.roll_many_ranks(500)
+        assert ranks.dtype == np.uint8
+        assert (ranks == encode_rolls(roller2.roll_many(500))).all()
+
+def test_alias_roll_rank():
+    """Test that alias roll ranks are valid and reproducible."""
+    roller1 = DiceRoller(seed=42, use_alias=True)
+    roller2 = DiceRoller(seed=42, use_alias=True)
+    ranks = [roller1.roll_rank() for _ in range(50)]
+    assert all(0 <= rank < 252 for rank in ranks)
+    assert ranks == [encode_rolls(np.array([roller2.roll()]))[0] for _ in range(50)]
+
+def test_roll_rank_requires_standard_dice():
+    """Test that roll ranks are unavailable for non-standard dice."""
+    with pytest.raises(ValueError, match="Roll ranks are only defined"):
+        DiceRoller(num_dice=3).roll_rank()
+
+    with pytest.raises(ValueError, match="Roll ranks are only defined"):
+        DiceRoller(die_size=8).roll_many_ranks(10)
+
+# Spawned Stream Tests
+def test_spawn_is_reproducible():
+    """Test that spawning from the same seed gives the same streams."""
+    first = [roller.roll_many(20) for roller in DiceRoller.spawn(42, 3)]
+    second = [roller.roll_many(20) for roller in DiceRoller.spawn(42, 3)]
+    for a, b in zip(first, second):
+        assert (a == b).all()
+
+def test_spawn_streams_differ():
+    """Test that child streams differ from each other and from the root seed."""
+    rolls = [roller.roll_many(50) for roller in DiceRoller.spawn(42, 3)]
+    rolls.append(DiceRoller(seed=42).roll_many(50))
+    for i in range(len(rolls)):
+        for j in range(i + 1, len(rolls)):
+            assert not (rolls[i] == rolls[j]).all()
+
+def test_spawn_passes_arguments():
+    """Test that other arguments apply to every spawned roller."""
+    rollers = DiceRoller.spawn(1, 2, num_dice=3, use_alias=False)
+    assert all(roller.num_dice == 3 for roller in rollers)
+
+def test_spawn_from_seed_sequence_continues():
+    """Test that spawning twice from one SeedSequence gives new children."""
+    root = np.random.SeedSequence(42)
+    first = DiceRoller.spawn(root, 1)[0].roll_many(20)
+    second = DiceRoller.spawn(root, 1)[0].roll_many(20)
+    assert not (first == second).all()
+
+@pytest.mark.parametrize("index", [0, 3, 9])
+def test_for_stream_matches_spawn(index):
+    """Test that a single stream can be rebuilt without spawning the ones before it."""
+    spawned = DiceRoller.spawn(42, 10, use_alias=True)[index]
+    direct = DiceRoller.for_stream(42, index, use_alias=True)
+    assert (spawned.roll_many(30) == direct.roll_many(30)).all()
+
+# Counter-Based Roller Tests
+def test_counter_based_sequential_rolls_are_reproducible():
+    """Test that a counter-based roller still rolls reproducibly in sequence."""
+    roller1 = DiceRoller(seed=42, counter_based=True)
+    roller2 = DiceRoller(seed=42, counter_based=True)
+    assert [roller1.roll() for _ in range(20)] == [roller2.roll() for _ in range(20)]
+    assert isinstance(roller1.rng.bit_generator, np.random.Philox)
+
+def test_roll_at_is_random_access():
+    """Test that a position's roll does not depend on which rolls were drawn before it."""
+    roller1 = DiceRoller(seed=42, counter_based=True)
+    roller2 = DiceRoller(seed=42, counter_based=True)
+    for game in range(50):
+        roller1.roll_at(game, 0)
+    roller2.roll_many(10)
+    assert roller1.roll_at(1000, 7, 2) == roller2.roll_at(1000, 7, 2)
+
+def test_roll_at_positions_differ():
+    """Test that nearby positions draw different dice."""
+    roller = DiceRoller(seed=42, counter_based=True)
+    rolls = [roller.roll_at(game, turn, roll) for game in range(3) for turn in range(3) for roll in range(3)]
+    assert len(set(map(tuple, rolls))) > 20
+    assert all(roll == sorted(roll) and all(1 <= die <= 6 for die in roll) for roll in rolls)
+
+def test_roll_at_depends_on_seed():
+    """Test that different seeds give different positional rolls."""
+    rolls1 = [DiceRoller(seed=1, counter_based=True).roll_at(game, 0) for game in range(10)]
+    rolls2 = [DiceRoller(seed=2, counter_based=True).roll_at(game, 0) for game in range(10)]
+    assert rolls1 != rolls2
+
+def test_roll_at_distribution():
+    """Test that positional rolls follow the dice distribution."""
+    roller = DiceRoller(seed=7, counter_based=True)
+    dice = np.array([roller.roll_at(game, 0) for game in range(2000)])
+    counts = np.bincount(dice.ravel(), minlength=7)[1:]
+    assert (abs(counts / dice.size - 1 / 6) < 0.02).all()
+
+def test_reroll_at_replays_a_turn():
+    """Test that a turn replays from the seed and the rerolled indices alone."""
+    def play(roller):
+        dice = roller.roll_at(5, 3)
+        dice = roller.reroll_at(dice, [0, 1], 5, 3, 1)
+        return roller.reroll_at(dice, [4], 5, 3, 2)
+
+    assert play(DiceRoller(seed=9, counter_based=True)) == play(DiceRoller(seed=9, counter_based=True))
+
+def test_reroll_at_keeps_dice():
+    """Test that only the given indices are rerolled."""
+    roller = DiceRoller(seed=9, counter_based=True)
+    new_dice = roller.reroll_at([6, 6, 6, 6, 1], [4, 9], 0, 0, 1)
+    assert new_dice.count(6) >= 4
+
+def test_roll_at_requires_counter_based():
+    """Test that positional rolls need a counter-based roller."""
+    with pytest.raises(ValueError, match="counter-based"):
+        DiceRoller(seed=1).roll_at(0, 0)
+
+@pytest.mark.parametrize("position", [(-1, 0, 0), (0, -1, 0), (0, 0, 2 ** 32), (2 ** 64, 0, 0)])
+def test_roll_at_rejects_invalid_positions(position):
+    """Test that positions out of range are rejected."""
+    with pytest.raises(ValueError, match="out of range"):
+        DiceRoller(seed=1, counter_based=True).roll_at(*position)
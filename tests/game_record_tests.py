@@ -0,0 +1,173 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.game_record import (
+    HEADER_SIZE, RECORD_SIZE, GameRecord, TurnRecord, decode_game, decode_games, encode_game, encode_games,
+    open_game_file, write_game_file
+)
+from src.roll_encoding import encode_roll
+from src.roll_table import KEEP_INDEX
+from src.score_category import ScoreCategory
+from src.utils import DefaultEncoder
+
+
+def _random_game(rng: np.random.Generator) -> GameRecord:
+    """Plays a game with random keeps and categories, recording every roll."""
+    turns = []
+
+    for category in rng.permutation(list(ScoreCategory)):
+        rolls = [sorted(rng.integers(1, 7, 5).tolist())]
+        keeps = []
+
+        for _ in range(rng.integers(0, 3)):
+            kept = [die for die in rolls[-1] if rng.random() < 0.5]
+            keeps.append(kept)
+            rolls.append(sorted(kept + rng.integers(1, 7, 5 - len(kept)).tolist()))
+
+        turns.append(TurnRecord(rolls, keeps, ScoreCategory(category)))
+
+    return GameRecord(turns)
+
+
+def _yahtzee_game() -> GameRecord:
+    """A game that scores a Yahtzee, then two more Yahtzees for bonuses."""
+    turns = [TurnRecord([[6, 6, 6, 6, 6]], [], ScoreCategory.YAHTZEE)]
+    turns += [TurnRecord([[6, 6, 6, 6, 6]], [], ScoreCategory.SIXES),
+              TurnRecord([[1, 2, 6, 6, 6], [6, 6, 6, 6, 6]], [[6, 6, 6]], ScoreCategory.CHANCE)]
+    turns += [TurnRecord([[1, 2, 3, 4, 6]], [], category)
+              for category in ScoreCategory if category not in (ScoreCategory.YAHTZEE, ScoreCategory.SIXES,
+                                                                ScoreCategory.CHANCE)]
+    return GameRecord(turns)
+
+
+@pytest.fixture
+def games():
+    """Plays a batch of random games."""
+    rng = np.random.default_rng(9)
+    return [_random_game(rng) for _ in range(200)] + [_yahtzee_game()]
+
+
+# Round Trip Tests
+def test_game_round_trip(games):
+    """Test that a game packs into RECORD_SIZE bytes and unpacks unchanged."""
+    for game in games[:20]:
+        data = encode_game(game)
+        assert len(data) == RECORD_SIZE
+        assert decode_game(data) == game
+
+
+def test_unsorted_rolls_come_back_sorted():
+    """Test that rolls and keeps are stored by rank, so they decode sorted."""
+    game = _yahtzee_game()
+    game.turns[2] = TurnRecord([[6, 2, 6, 1, 6], [6, 6, 6, 6, 6]], [[6, 6, 6]], ScoreCategory.CHANCE)
+    assert decode_game(encode_game(game)) == _yahtzee_game()
+
+
+def test_record_is_far_smaller_than_json(games):
+    """Test that the packed record is over ten times smaller than the game as JSON."""
+    as_json = json.dumps([[turn.rolls, turn.keeps, turn.category] for turn in games[0].turns], cls=DefaultEncoder)
+    assert len(as_json) > 10 * RECORD_SIZE
+
+
+# Batch Decode Tests
+def test_batch_decode_matches_records(games):
+    """Test that the batch arrays agree with the games they were packed from."""
+    batch = decode_games(encode_games(games))
+    assert len(batch) == len(games)
+
+    for index, game in enumerate(games):
+        for turn_index, turn in enumerate(game.turns):
+            count = len(turn.rolls)
+            assert batch.roll_counts[index, turn_index] == count
+            assert list(batch.rolls[index, turn_index, :count]) == [encode_roll(roll) for roll in turn.rolls]
+            assert list(batch.keeps[index, turn_index, :count - 1]) == [KEEP_INDEX[tuple(keep)] for keep in turn.keeps]
+            assert ScoreCategory(list(ScoreCategory)[batch.categories[index, turn_index]]) == turn.category
+
+
+def test_batch_totals_match_score_cards(games):
+    """Test that the vectorized totals and bonuses match replaying each game on a ScoreCard."""
+    batch = decode_games(encode_games(games))
+    cards = [game.score_card() for game in games]
+    assert list(batch.totals) == [card.total_score for card in cards]
+    assert list(batch.yahtzee_bonus_counts) == [card.yahtzee_bonus_count for card in cards]
+    assert batch.yahtzee_bonus_counts[-1] == 2
+
+
+def test_decode_rejects_partial_records(games):
+    """Test that data that is not a whole number of records raises ValueError."""
+    with pytest.raises(ValueError):
+        decode_games(encode_games(games[:2])[:-1])
+
+
+def test_decode_rejects_corrupt_records(games):
+    """Test that a record with an out-of-range category raises ValueError."""
+    data = bytearray(encode_game(games[0]))
+    data[-1] |= 0x3C
+    with pytest.raises(ValueError):
+        decode_games(bytes(data))
+
+
+# Validation Tests
+def test_encode_rejects_incomplete_game(games):
+    """Test that a game without all 13 categories raises ValueError."""
+    with pytest.raises(ValueError):
+        encode_game(GameRecord(games[0].turns[:12]))
+
+
+def test_encode_rejects_keep_not_in_roll():
+    """Test that keeping dice the roll did not show raises ValueError."""
+    game = _yahtzee_game()
+    game.turns[2] = TurnRecord([[1, 2, 3, 4, 5], [6, 6, 6, 6, 6]], [[6, 6, 6]], ScoreCategory.CHANCE)
+    with pytest.raises(ValueError):
+        encode_game(game)
+
+
+def test_encode_rejects_reroll_that_drops_keep():
+    """Test that a reroll which does not contain the kept dice raises ValueError."""
+    game = _yahtzee_game()
+    game.turns[2] = TurnRecord([[1, 2, 6, 6, 6], [1, 1, 1, 1, 1]], [[6, 6, 6]], ScoreCategory.CHANCE)
+    with pytest.raises(ValueError):
+        encode_game(game)
+
+
+# Game File Tests
+def test_game_file_round_trip(tmp_path, games):
+    """Test that a game file maps the records and decodes them like the bytes."""
+    path = str(tmp_path / "games.bin")
+    write_game_file(path, games)
+    assert os.path.getsize(path) == HEADER_SIZE + len(games) * RECORD_SIZE
+
+    batch = open_game_file(path)
+    np.testing.assert_array_equal(batch.totals, decode_games(encode_games(games)).totals)
+    assert batch.record(5) == games[5]
+
+
+def test_game_file_applies_umask_mode(tmp_path, games):
+    """Test that a game file gets the usual permissions, not the owner-only ones of a temporary file."""
+    path = str(tmp_path / "games.bin")
+    umask = os.umask(0o027)
+
+    try:
+        write_game_file(path, games)
+    finally:
+        os.umask(umask)
+
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_empty_game_file(tmp_path):
+    """Test that a game file with no games opens as an empty batch."""
+    path = str(tmp_path / "games.bin")
+    write_game_file(path, [])
+    assert len(open_game_file(path)) == 0
+
+
+def test_open_rejects_other_files(tmp_path):
+    """Test that a file without the game file magic raises ValueError."""
+    path = tmp_path / "games.bin"
+    path.write_bytes(b"\0" * HEADER_SIZE)
+    with pytest.raises(ValueError):
+        open_game_file(str(path))
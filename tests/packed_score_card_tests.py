@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from src.packed_score_card import PackedScoreCard
+from src.roll_encoding import ROLLS, encode_roll
+from src.score import Score
+from src.score_card import ScoreCard
+from src.score_category import ScoreCategory
+from src.scorer import Scorer
+
+
+# Initialization Tests
+def test_default_initialization():
+    """Test default initialization of PackedScoreCard."""
+    card = PackedScoreCard()
+    assert card.filled == 0
+    assert card.upper_subtotal == 0
+    assert card.yahtzee_bonus_count == 0
+    assert card.total_score == 0
+    assert card.upper_section_bonus_awarded is False
+    assert set(card.available_categories()) == set(ScoreCategory)
+
+
+def test_packed_card_has_no_instance_dict():
+    """Test that PackedScoreCard uses slots instead of a per-instance dict."""
+    assert not hasattr(PackedScoreCard(), '__dict__')
+
+
+# Assign Score Tests
+def test_assign_score_basic():
+    """Test basic score assignment."""
+    card = PackedScoreCard()
+    card.assign_score(Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3))
+
+    assert card.get_points(ScoreCategory.ACES) == 3
+    assert card.get_points(ScoreCategory.TWOS) is None
+    assert card.is_filled(ScoreCategory.ACES)
+    assert ScoreCategory.ACES not in card.available_categories()
+    assert card.upper_subtotal == 3
+    assert card.total_score == 3
+
+
+def test_assign_score_duplicate_category():
+    """Test that assigning to same category twice raises ValueError."""
+    card = PackedScoreCard()
+    card.assign_score(Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3))
+    with pytest.raises(ValueError, match="Category .* has already been scored"):
+        card.assign_score(Score(ScoreCategory.ACES, [1, 1, 2, 3, 4], 2))
+
+
+def test_assign_score_points_out_of_range():
+    """Test that points that do not fit in a byte are rejected."""
+    card = PackedScoreCard()
+    with pytest.raises(ValueError, match="Points must be between 0 and 255"):
+        card.assign_score(Score(ScoreCategory.CHANCE, [1, 2, 3, 4, 5], 300))
+    assert card.filled == 0
+
+
+def test_assign_zero_points():
+    """Test that scratching a category with zero points fills it."""
+    card = PackedScoreCard()
+    card.assign_score(Score(ScoreCategory.YAHTZEE, [1, 2, 3, 4, 5], 0))
+    assert card.get_points(ScoreCategory.YAHTZEE) == 0
+    assert card.is_filled(ScoreCategory.YAHTZEE)
+
+
+def test_assign_rank_uses_score_table():
+    """Test that assigning by roll rank records the table points."""
+    card = PackedScoreCard()
+    card.assign_rank(ScoreCategory.FULL_HOUSE, encode_roll([2, 2, 2, 5, 5]))
+    card.assign_rank(ScoreCategory.LARGE_STRAIGHT, encode_roll([2, 2, 2, 5, 5]))
+
+    assert card.get_points(ScoreCategory.FULL_HOUSE) == 25
+    assert card.get_points(ScoreCategory.LARGE_STRAIGHT) == 0
+    assert card.total_score == 25
+
+
+@pytest.mark.parametrize("rank", [-1, 252])
+def test_assign_rank_rejects_out_of_range_ranks(rank):
+    """Test that a rank outside 0-251 is rejected rather than wrapping or indexing past the table."""
+    card = PackedScoreCard()
+    with pytest.raises(ValueError, match="Roll rank must be between 0 and 251"):
+        card.assign_rank(ScoreCategory.YAHTZEE, rank)
+    assert card.filled == 0
+
+
+# Bonus Tests
+def test_upper_section_bonus():
+    """Test that the upper bonus is added as soon as the subtotal reaches 63."""
+    card = PackedScoreCard()
+    points = [3, 6, 9, 12, 15, 18]
+    categories = [ScoreCategory.ACES, ScoreCategory.TWOS, ScoreCategory.THREES,
+                  ScoreCategory.FOURS, ScoreCategory.FIVES, ScoreCategory.SIXES]
+
+    for category, value in zip(categories, points):
+        assert card.upper_section_bonus_awarded is False
+        card.assign_score(Score(category, [], value))
+
+    assert card.upper_subtotal == 63
+    assert card.upper_section_bonus_awarded is True
+    assert card.total_score == 63 + 35
+
+    card.assign_score(Score(ScoreCategory.CHANCE, [1, 2, 3, 4, 5], 15))
+    assert card.total_score == 63 + 35 + 15
+
+
+def test_yahtzee_bonus():
+    """Test Yahtzee bonuses through both assignment paths."""
+    card = PackedScoreCard()
+    card.assign_score(Score(ScoreCategory.CHANCE, [6, 6, 6, 6, 6], 30))
+    assert card.yahtzee_bonus_count == 0
+
+    card.assign_score(Score(ScoreCategory.YAHTZEE, [5, 5, 5, 5, 5], 50))
+    assert card.yahtzee_bonus_count == 0
+
+    card.assign_rank(ScoreCategory.FOURS, encode_roll([4, 4, 4, 4, 4]))
+    card.assign_score(Score(ScoreCategory.THREE_OF_A_KIND, [3, 3, 3, 3, 3], 15))
+    assert card.yahtzee_bonus_count == 2
+    assert card.total_score == 30 + 50 + 20 + 15 + 200
+
+
+# Equivalence Tests
+def test_matches_score_card_over_random_games():
+    """Test that the packed card tracks the same totals as ScoreCard over random games."""
+    rng = np.random.default_rng(42)
+    scorer = Scorer()
+
+    for _ in range(200):
+        card = ScoreCard()
+        packed = PackedScoreCard()
+
+        for category in rng.permutation(list(ScoreCategory)):
+            rank = int(rng.integers(len(ROLLS)))
+            roll = list(ROLLS[rank])
+            points = next((s.points for s in scorer.get_scores(roll) if s.category == category), 0)
+            card.assign_score(Score(category, roll, points))
+            packed.assign_rank(category, rank)
+
+            assert packed.total_score == card.total_score
+            assert packed.yahtzee_bonus_count == card.yahtzee_bonus_count
+            assert packed.upper_section_bonus_awarded == card.upper_section_bonus_awarded
+
+        assert packed.available_categories() == []
+
+
+def test_from_score_card():
+    """Test packing an existing ScoreCard."""
+    card = ScoreCard()
+    card.assign_score(Score(ScoreCategory.YAHTZEE, [5, 5, 5, 5, 5], 50))
+    card.assign_score(Score(ScoreCategory.SIXES, [6, 6, 6, 6, 6], 30))
+    card.assign_score(Score(ScoreCategory.FIVES, [5, 5, 5, 5, 1], 20))
+    card.assign_score(Score(ScoreCategory.FOURS, [4, 4, 4, 4, 2], 16))
+
+    packed = PackedScoreCard.from_score_card(card)
+
+    assert packed.total_score == card.total_score
+    assert packed.yahtzee_bonus_count == 1
+    assert packed.upper_section_bonus_awarded is True
+    assert set(packed.available_categories()) == set(card.available_categories())
+
+
+def test_repr():
+    """Test string representation of PackedScoreCard."""
+    card = PackedScoreCard()
+    card.assign_score(Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3))
+    assert "PackedScoreCard" in repr(card)
@@ -0,0 +1,106 @@
+from fractions import Fraction
+
+import pytest
+
+from src.probability import probability_of
+from src.roll_encoding import ROLLS
+from src.roll_table import KEEP_INDEX, KEEP_TRANSITIONS
+from src.score_category import ScoreCategory
+
+
+def keep_nothing(roll, rerolls_left):
+    """Reroll every die."""
+    return ()
+
+
+def keep_sixes(roll, rerolls_left):
+    """Hold only the sixes."""
+    return tuple(die for die in roll if die == 6)
+
+
+def keep_other_dice(roll, rerolls_left):
+    """Try to hold a die that is not in the roll."""
+    return (7,)
+
+
+# No Reroll Tests
+@pytest.mark.parametrize("category, roll, expected", [
+    (ScoreCategory.YAHTZEE, [3, 3, 3, 3, 3], 1),
+    (ScoreCategory.YAHTZEE, [3, 3, 3, 3, 4], 0),
+    (ScoreCategory.FULL_HOUSE, [2, 3, 2, 3, 2], 1),
+    (ScoreCategory.SIXES, [1, 2, 3, 4, 5], 0),
+    (ScoreCategory.CHANCE, [1, 1, 2, 2, 3], 1),
+])
+def test_no_rerolls(category, roll, expected):
+    """Test that with no rerolls left the chance is whether the roll already scores."""
+    assert probability_of(category, roll, rerolls_left=0) == expected
+    assert probability_of(category, roll, rerolls_left=0, exact=True) == expected
+
+
+# Optimal Strategy Tests
+def test_large_straight_one_reroll():
+    """Test the chance of filling an inside large straight with one reroll."""
+    assert probability_of(ScoreCategory.LARGE_STRAIGHT, [1, 2, 3, 4, 6], rerolls_left=1, exact=True) == Fraction(1, 6)
+
+
+def test_yahtzee_in_three_rolls():
+    """Test the well-known chance of a Yahtzee within a full turn."""
+    first_roll = KEEP_TRANSITIONS.exact_row(KEEP_INDEX[()])
+    total = sum(
+        probability * probability_of(ScoreCategory.YAHTZEE, list(ROLLS[rank]), exact=True)
+        for rank, probability in first_roll.items()
+    )
+    assert total == Fraction(2783176, 60466176)
+
+
+def test_chance_is_certain():
+    """Test that the Chance category is always made."""
+    assert probability_of(ScoreCategory.CHANCE, [1, 2, 3, 4, 6]) == pytest.approx(1)
+    assert probability_of(ScoreCategory.CHANCE, [1, 2, 3, 4, 6], exact=True) == 1
+
+
+def test_float_matches_exact():
+    """Test that the float tables match the exact ones."""
+    for category in (ScoreCategory.FULL_HOUSE, ScoreCategory.SMALL_STRAIGHT, ScoreCategory.FOUR_OF_A_KIND):
+        for roll in ([1, 1, 2, 5, 6], [2, 3, 4, 6, 6], [5, 5, 5, 1, 2]):
+            exact = probability_of(category, roll, exact=True)
+            assert probability_of(category, roll) == pytest.approx(float(exact), abs=1e-12)
+
+
+def test_more_rerolls_never_hurt():
+    """Test that the optimal chance grows with the rerolls left."""
+    chances = [probability_of(ScoreCategory.YAHTZEE, [1, 2, 2, 5, 6], rerolls_left=k) for k in range(5)]
+    assert chances == sorted(chances)
+    assert chances[0] == 0
+
+
+# Custom Strategy Tests
+def test_keep_nothing_strategy():
+    """Test that rerolling everything makes a Yahtzee with the chance of a fresh roll."""
+    assert probability_of(ScoreCategory.YAHTZEE, [6, 6, 6, 6, 1], keep_nothing, 1, exact=True) == Fraction(6, 7776)
+
+
+def test_keep_sixes_strategy():
+    """Test the chance of a Yahtzee when only sixes are kept."""
+    assert probability_of(ScoreCategory.YAHTZEE, [6, 6, 6, 6, 1], keep_sixes, 1, exact=True) == Fraction(1, 6)
+    assert probability_of(ScoreCategory.YAHTZEE, [6, 6, 6, 6, 1], keep_sixes, 2, exact=True) == Fraction(11, 36)
+    assert probability_of(ScoreCategory.YAHTZEE, [6, 6, 6, 6, 1], keep_sixes, 2) == pytest.approx(11 / 36)
+
+
+# Validation Tests
+def test_rejects_keep_not_in_roll():
+    """Test that a strategy holding dice that are not in the roll is rejected."""
+    with pytest.raises(ValueError):
+        probability_of(ScoreCategory.YAHTZEE, [1, 2, 3, 4, 5], keep_other_dice, 1)
+
+
+def test_rejects_negative_rerolls():
+    """Test that negative rerolls are rejected."""
+    with pytest.raises(ValueError):
+        probability_of(ScoreCategory.YAHTZEE, [1, 2, 3, 4, 5], rerolls_left=-1)
+
+
+def test_rejects_invalid_roll():
+    """Test that a roll that is not five dice is rejected."""
+    with pytest.raises(ValueError):
+        probability_of(ScoreCategory.YAHTZEE, [1, 2, 3])
@@ -0,0 +1,184 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from src.roll_encoding import (
+    ROLLS, ROLL_ARRAY, ROLL_COUNTS, ROLL_INDEX, decode_ordered_rolls, decode_roll, decode_rolls, encode_ordered_rolls,
+    encode_roll, encode_rolls, face_counts, face_counts_batch, ranks_from_ordered_codes
+)
+
+
+# Roll Enumeration Tests
+def test_rolls_are_all_distinct_sorted_rolls():
+    """Test that ROLLS holds the 252 distinct sorted 5d6 rolls."""
+    assert len(ROLLS) == 252
+    assert len(set(ROLLS)) == 252
+    assert all(list(roll) == sorted(roll) for roll in ROLLS)
+    assert ROLLS[0] == (1, 1, 1, 1, 1)
+    assert ROLLS[-1] == (6, 6, 6, 6, 6)
+
+
+def test_roll_index_covers_every_ordered_roll():
+    """Test that every ordered roll maps to the rank of its sorted form."""
+    assert len(ROLL_INDEX) == 6 ** 5
+
+    for roll, index in ROLL_INDEX.items():
+        assert ROLLS[index] == tuple(sorted(roll))
+
+
+def test_roll_index_permutations_share_rank():
+    """Test that all orderings of a roll share one rank."""
+    ranks = {ROLL_INDEX[roll] for roll in permutations((6, 6, 1, 2, 3))}
+    assert ranks == {ROLLS.index((1, 2, 3, 6, 6))}
+
+
+# Scalar Encoding Tests
+@pytest.mark.parametrize("roll,rank", [
+    ([1, 1, 1, 1, 1], 0),
+    ([6, 6, 6, 6, 6], 251),
+    ([5, 4, 3, 2, 1], ROLLS.index((1, 2, 3, 4, 5))),
+])
+def test_encode_roll(roll, rank):
+    """Test that encode_roll returns the rank of the sorted roll."""
+    assert encode_roll(roll) == rank
+
+
+@pytest.mark.parametrize("roll", [
+    [1, 2, 3, 4],        # Too few dice
+    [1, 2, 3, 4, 5, 6],  # Too many dice
+    [0, 1, 2, 3, 4],     # Face too low
+    [1, 2, 3, 4, 7],     # Face too high
+])
+def test_encode_roll_invalid(roll):
+    """Test that encode_roll rejects rolls outside the 5d6 table."""
+    with pytest.raises(ValueError, match="Roll must be 5 dice"):
+        encode_roll(roll)
+
+
+def test_decode_roll_round_trip():
+    """Test that decode_roll inverts encode_roll for every rank."""
+    for rank in range(len(ROLLS)):
+        roll = decode_roll(rank)
+        assert isinstance(roll, list)
+        assert encode_roll(roll) == rank
+
+
+@pytest.mark.parametrize("rank", [-1, 252])
+def test_decode_roll_invalid(rank):
+    """Test that decode_roll rejects ranks out of range."""
+    with pytest.raises(ValueError, match="Roll rank must be between 0 and 251"):
+        decode_roll(rank)
+
+
+# Roll Array Tests
+def test_roll_array_matches_rolls():
+    """Test that ROLL_ARRAY is the array form of ROLLS."""
+    assert ROLL_ARRAY.shape == (252, 5)
+    assert [tuple(row) for row in ROLL_ARRAY.tolist()] == ROLLS
+
+
+# Batch Encoding Tests
+def test_encode_rolls_matches_roll_index():
+    """Test that encode_rolls agrees with ROLL_INDEX for every ordered roll."""
+    rolls = np.array(list(ROLL_INDEX.keys()))
+    expected = np.array(list(ROLL_INDEX.values()))
+    assert (encode_rolls(rolls) == expected).all()
+    assert encode_rolls(rolls).dtype == np.uint8
+
+
+def test_encode_rolls_rejects_invalid_faces():
+    """Test that encode_rolls rejects dice values outside 1-6."""
+    with pytest.raises(ValueError, match="Dice values must be between 1 and 6."):
+        encode_rolls(np.array([[1, 2, 3, 4, 7]]))
+
+
+def test_decode_rolls_round_trip():
+    """Test that decode_rolls inverts encode_rolls in bulk."""
+    ranks = np.arange(252, dtype=np.uint8)
+    rolls = decode_rolls(ranks)
+    assert rolls.shape == (252, 5)
+    assert (np.diff(rolls, axis=1) >= 0).all()
+    assert (encode_rolls(rolls) == ranks).all()
+
+
+def test_decode_rolls_invalid():
+    """Test that decode_rolls rejects ranks out of range."""
+    with pytest.raises(ValueError, match="Roll ranks must be between 0 and 251"):
+        decode_rolls(np.array([0, 252]))
+
+
+# Ordered Encoding Tests
+def test_ordered_codes_round_trip():
+    """Test that every ordered roll gets a distinct code that decodes back to it."""
+    rolls = np.array(list(ROLL_INDEX.keys()))
+    codes = encode_ordered_rolls(rolls)
+    assert codes.dtype == np.uint16
+    assert sorted(codes.tolist()) == list(range(7776))
+    assert (decode_ordered_rolls(codes) == rolls).all()
+
+
+def test_ranks_from_ordered_codes():
+    """Test that ordered codes map to the rank of the sorted roll."""
+    rolls = np.array([[6, 1, 3, 3, 2], [1, 2, 3, 3, 6]])
+    ranks = ranks_from_ordered_codes(encode_ordered_rolls(rolls))
+    assert ranks.tolist() == [ROLL_INDEX[(1, 2, 3, 3, 6)]] * 2
+
+
+def test_ordered_codes_invalid():
+    """Test that invalid rolls and codes are rejected."""
+    with pytest.raises(ValueError, match="Dice values must be between 1 and 6."):
+        encode_ordered_rolls(np.array([[0, 1, 1, 1, 1]]))
+
+    with pytest.raises(ValueError, match="shape"):
+        encode_ordered_rolls(np.array([1, 2, 3, 4, 5]))
+
+    with pytest.raises(ValueError, match="between 0 and 7775"):
+        decode_ordered_rolls(np.array([7776]))
+
+    with pytest.raises(ValueError, match="between 0 and 7775"):
+        ranks_from_ordered_codes(np.array([-1]))
+
+
+# Face Count Tests
+@pytest.mark.parametrize("roll,counts", [
+    ([1, 1, 1, 1, 1], (5, 0, 0, 0, 0, 0)),
+    ([6, 2, 6, 3, 2], (0, 2, 1, 0, 0, 2)),
+    ([], (0, 0, 0, 0, 0, 0)),
+    ([4, 4, 4], (0, 0, 0, 3, 0, 0)),
+])
+def test_face_counts(roll, counts):
+    """Test that face_counts tallies each face."""
+    assert face_counts(roll) == counts
+
+
+@pytest.mark.parametrize("roll", [[0, 1, 2], [1, 2, 7]])
+def test_face_counts_invalid(roll):
+    """Test that face_counts rejects dice values outside 1-6."""
+    with pytest.raises(ValueError, match="Dice values must be between 1 and 6."):
+        face_counts(roll)
+
+
+def test_face_counts_batch_matches_face_counts():
+    """Test that batch face counts agree with the scalar form."""
+    rolls = np.random.default_rng(42).integers(1, 7, size=(200, 7))
+    result = face_counts_batch(rolls)
+    assert result.shape == (200, 6)
+    assert [tuple(row) for row in result.tolist()] == [face_counts(roll) for roll in rolls.tolist()]
+
+
+def test_face_counts_batch_invalid():
+    """Test that batch face counts reject malformed input."""
+    with pytest.raises(ValueError, match="two-dimensional"):
+        face_counts_batch(np.array([1, 2, 3]))
+
+    with pytest.raises(ValueError, match="Dice values must be between 1 and 6."):
+        face_counts_batch(np.array([[1, 2, 9]]))
+
+
+def test_roll_counts_table():
+    """Test that ROLL_COUNTS holds the face counts of every sorted roll."""
+    assert ROLL_COUNTS.shape == (252, 6)
+    assert (ROLL_COUNTS.sum(axis=1) == 5).all()
+    assert [tuple(row) for row in ROLL_COUNTS.tolist()] == [face_counts(roll) for roll in ROLLS]
+
@@ -0,0 +1,138 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from src.roll_encoding import encode_rolls
+from src.roll_file import HEADER_SIZE, RollFile, open_roll_file, write_roll_file
+from src.scorer import Scorer
+
+
+@pytest.fixture
+def dice():
+    """Roll a small dataset of unsorted dice."""
+    return np.random.default_rng(4).integers(1, 7, (1000, 5))
+
+
+# Round Trip Tests
+def test_rank_encoding_round_trip(tmp_path, dice):
+    """Test that a rank-encoded file stores one byte per roll and reads back the sorted rolls."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, dice)
+    rolls = open_roll_file(path)
+    assert len(rolls) == 1000
+    assert os.path.getsize(path) == HEADER_SIZE + 1000
+    assert isinstance(rolls.rolls, np.memmap)
+    np.testing.assert_array_equal(rolls.ranks(), encode_rolls(dice))
+    np.testing.assert_array_equal(rolls.dice(), np.sort(dice, axis=1))
+    assert rolls.game_ids is None and rolls.turns is None and rolls.roll_numbers is None
+
+
+def test_ordered_encoding_keeps_dice_order(tmp_path, dice):
+    """Test that an ordered file reads back the dice as thrown."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, dice, encoding="ordered")
+    rolls = open_roll_file(path)
+    assert rolls.encoding == "ordered"
+    np.testing.assert_array_equal(rolls.dice(10, 20), dice[10:20])
+    np.testing.assert_array_equal(rolls.ranks(), encode_rolls(dice))
+
+
+def test_ranks_read_without_copy(tmp_path, dice):
+    """Test that a rank-encoded file hands out views of the mapped column."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, encode_rolls(dice))
+    rolls = open_roll_file(path)
+    assert np.shares_memory(rolls.ranks(5, 50), rolls.rolls)
+
+
+def test_optional_columns(tmp_path, dice):
+    """Test that game, turn and roll number columns are stored and aligned."""
+    path = str(tmp_path / "rolls.bin")
+    index = np.arange(1000)
+    write_roll_file(path, dice, game_ids=index // 39 + 2 ** 40, turns=index // 3 % 13, roll_numbers=index % 3)
+    rolls = open_roll_file(path)
+    np.testing.assert_array_equal(rolls.game_ids, index // 39 + 2 ** 40)
+    np.testing.assert_array_equal(rolls.turns, index // 3 % 13)
+    np.testing.assert_array_equal(rolls.roll_numbers, index % 3)
+    assert rolls.game_ids.offset % 8 == 0
+
+
+def test_empty_file(tmp_path):
+    """Test that a dataset without records can be written and read."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, np.empty((0, 5), dtype=int), turns=np.empty(0, dtype=int))
+    rolls = open_roll_file(path)
+    assert len(rolls) == 0
+    assert list(rolls.iter_scores()) == []
+
+
+def test_pickle_reopens_the_file(tmp_path, dice):
+    """Test that pickling sends the path rather than copying the columns."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, dice)
+    restored = pickle.loads(pickle.dumps(open_roll_file(path)))
+    assert isinstance(restored, RollFile)
+    np.testing.assert_array_equal(restored.ranks(), encode_rolls(dice))
+
+
+# Scoring Tests
+def test_iter_scores_matches_score_batch(tmp_path, dice):
+    """Test that scoring a file in chunks matches scoring the dice at once."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, dice, encoding="ordered")
+    chunks = list(open_roll_file(path).iter_scores(chunk_size=300))
+    assert [start for start, _ in chunks] == [0, 300, 600, 900]
+    np.testing.assert_array_equal(np.concatenate([points for _, points in chunks]), Scorer().score_batch(dice))
+
+
+# Validation Tests
+@pytest.mark.parametrize("rolls, kwargs", [
+    (np.array([[1, 2, 3, 4, 7]]), {}),  # Invalid die
+    (np.array([252]), {}),  # Invalid rank
+    (np.array([1, 2]), {"encoding": "ordered"}),  # Ranks cannot be stored in order
+    (np.array([[1, 2, 3, 4, 5]]), {"encoding": "json"}),  # Unknown encoding
+    (np.array([[1, 2, 3, 4, 5]]), {"turns": np.array([1, 2])}),  # Column length
+    (np.array([[1, 2, 3, 4, 5]]), {"roll_numbers": np.array([256])}),  # Column range
+    (np.array([[1, 2, 3, 4, 5]]), {"game_ids": np.array([-1])}),  # Negative game
+    (np.array([1.7, 2.2]), {}),  # Fractional ranks
+    (np.array([[1.5, 2, 3, 4, 5]]), {}),  # Fractional dice
+    (np.array([[1, 2, 3, 4, 5]]), {"turns": np.array([1.5])}),  # Fractional column
+])
+def test_write_rejects_invalid_data(tmp_path, rolls, kwargs):
+    """Test that invalid datasets are rejected without leaving a file behind."""
+    with pytest.raises(ValueError):
+        write_roll_file(str(tmp_path / "rolls.bin"), rolls, **kwargs)
+    assert os.listdir(tmp_path) == []
+
+
+def test_write_applies_umask_mode(tmp_path, dice):
+    """Test that the file gets the usual permissions, not the owner-only ones of a temporary file."""
+    path = str(tmp_path / "rolls.bin")
+    umask = os.umask(0o022)
+
+    try:
+        write_roll_file(path, dice)
+    finally:
+        os.umask(umask)
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_open_rejects_other_files(tmp_path):
+    """Test that a file without the magic bytes is rejected."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(bytes(HEADER_SIZE))
+    with pytest.raises(ValueError, match="not a roll file"):
+        open_roll_file(str(path))
+
+
+def test_open_rejects_truncated_file(tmp_path, dice):
+    """Test that a truncated file is rejected."""
+    path = str(tmp_path / "rolls.bin")
+    write_roll_file(path, dice)
+    with open(path, "r+b") as file:
+        file.truncate(HEADER_SIZE + 10)
+    with pytest.raises(ValueError, match="bytes"):
+        open_roll_file(path)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.category_scorer import CATEGORY_SCORERS
+from src.roll_encoding import ROLLS, ROLL_INDEX
+from src.roll_table import (
+    KEEPS, KEEP_INDEX, KEEP_PROBABILITIES, ROLL_KEEPS, ROLL_PROBABILITIES, ROLL_SCORES, SCORE_TABLE
+)
+from src.score_category import ScoreCategory
+
+
+# Score Table Tests
+def test_score_table_shape():
+    """Test that the score table has one row per roll and one column per category."""
+    assert SCORE_TABLE.shape == (252, len(ScoreCategory))
+    assert not SCORE_TABLE.flags.writeable
+
+
+def test_score_table_matches_category_scorers():
+    """Test that every table entry matches the category scorer it was built from."""
+    for index, roll in enumerate(ROLLS):
+        for column, category in enumerate(ScoreCategory):
+            score = CATEGORY_SCORERS[category.value](list(roll))
+            expected = score.points if score is not None else 0
+            assert SCORE_TABLE[index, column] == expected
+
+
+def test_roll_scores_match_score_table():
+    """Test that ROLL_SCORES lists exactly the scoring categories of each row."""
+    categories = list(ScoreCategory)
+
+    for index, row in enumerate(ROLL_SCORES):
+        expected = [
+            (categories[column], int(points))
+            for column, points in enumerate(SCORE_TABLE[index]) if points > 0
+        ]
+        assert list(row) == expected
+
+
+def test_score_table_known_rows():
+    """Test a few well-known rows of the score table."""
+    yahtzee = SCORE_TABLE[ROLL_INDEX[(6, 6, 6, 6, 6)]]
+    assert yahtzee[list(ScoreCategory).index(ScoreCategory.YAHTZEE)] == 50
+    assert yahtzee[list(ScoreCategory).index(ScoreCategory.SIXES)] == 30
+
+    straight = SCORE_TABLE[ROLL_INDEX[(5, 3, 1, 2, 4)]]
+    assert straight[list(ScoreCategory).index(ScoreCategory.LARGE_STRAIGHT)] == 40
+    assert straight[list(ScoreCategory).index(ScoreCategory.SMALL_STRAIGHT)] == 30
+    assert straight[list(ScoreCategory).index(ScoreCategory.FULL_HOUSE)] == 0
+
+
+# Probability Tests
+def test_roll_probabilities():
+    """Test the multinomial probabilities of the sorted rolls."""
+    assert ROLL_PROBABILITIES.sum() == pytest.approx(1.0)
+    assert ROLL_PROBABILITIES[ROLL_INDEX[(1, 1, 1, 1, 1)]] == pytest.approx(1 / 7776)
+    assert ROLL_PROBABILITIES[ROLL_INDEX[(1, 2, 3, 4, 5)]] == pytest.approx(120 / 7776)
+    assert ROLL_PROBABILITIES[ROLL_INDEX[(2, 2, 2, 5, 5)]] == pytest.approx(10 / 7776)
+
+
+# Keep Tests
+def test_keeps_enumerate_every_sub_multiset():
+    """Test that KEEPS holds the 462 sorted sub-multisets of a roll."""
+    assert len(KEEPS) == 462
+    assert len(set(KEEPS)) == 462
+    assert KEEPS[0] == ()
+    assert all(KEEPS[KEEP_INDEX[keep]] == keep for keep in KEEPS)
+    assert [len(keep) for keep in KEEPS].count(5) == 252
+
+
+def test_keep_probabilities():
+    """Test the reroll distributions of a few keeps."""
+    assert KEEP_PROBABILITIES.shape == (462, 252)
+    assert np.allclose(KEEP_PROBABILITIES.sum(axis=1), 1.0)
+
+    # Keeping nothing rerolls everything
+    assert np.allclose(KEEP_PROBABILITIES[KEEP_INDEX[()]], ROLL_PROBABILITIES)
+
+    # Keeping every die leaves the roll unchanged
+    keep_all = KEEP_PROBABILITIES[KEEP_INDEX[(2, 3, 3, 5, 6)]]
+    assert keep_all[ROLL_INDEX[(2, 3, 3, 5, 6)]] == 1.0
+
+    # Keeping four sixes makes a Yahtzee one time in six
+    four_sixes = KEEP_PROBABILITIES[KEEP_INDEX[(6, 6, 6, 6)]]
+    assert four_sixes[ROLL_INDEX[(6, 6, 6, 6, 6)]] == pytest.approx(1 / 6)
+    assert np.count_nonzero(four_sixes) == 6
+
+
+def test_roll_keeps():
+    """Test that ROLL_KEEPS maps roll positions to the kept sub-multiset."""
+    assert ROLL_KEEPS.shape == (252, 32)
+    rank = ROLL_INDEX[(1, 2, 2, 4, 6)]
+
+    assert KEEPS[ROLL_KEEPS[rank, 0]] == ()
+    assert KEEPS[ROLL_KEEPS[rank, 0b11111]] == (1, 2, 2, 4, 6)
+    assert KEEPS[ROLL_KEEPS[rank, 0b00110]] == (2, 2)
+    assert KEEPS[ROLL_KEEPS[rank, 0b10001]] == (1, 6)
@@ -90,6 +90,20 @@ def test_is_yahtzee(roll, expected):
     assert ScoreCard.is_yahtzee(roll) == expected
 
 
+@pytest.mark.parametrize("counts,expected", [
+    ((5, 0, 0, 0, 0, 0), True),
+    ((0, 0, 0, 0, 0, 5), True),
+    ((4, 1, 0, 0, 0, 0), False),
+    ((1, 1, 1, 1, 1, 0), False),
+    ((0, 4, 0, 0, 0, 0), False),  # Not 5 dice
+    ((0, 0, 6, 0, 0, 0), False),  # Too many dice
+    ((0, 0, 0, 0, 0, 0), False),  # Empty roll
+])
+def test_is_yahtzee_counts(counts, expected):
+    """Test the is_yahtzee_counts static method with various face counts."""
+    assert ScoreCard.is_yahtzee_counts(counts) == expected
+
+
 # Yahtzee Bonus Tests
 def test_yahtzee_bonus_basic():
     """Test basic Yahtzee bonus functionality."""
@@ -341,3 +355,27 @@ def test_empty_roll_handling():
     
     assert card.get_score(ScoreCategory.CHANCE) == score
     assert card.total_score == 0
+
+
+# Serialization Tests
+def test_to_dict_lists_every_category():
+    """Test that to_dict covers every category, None for unscored ones."""
+    card = ScoreCard()
+    card.assign_score(Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3))
+    data = card.to_dict()
+
+    assert list(data['scores']) == [category.value for category in ScoreCategory]
+    assert data['scores']['Aces'] == {'category': 'Aces', 'roll': [1, 1, 1, 2, 3], 'points': 3}
+    assert data['scores']['Twos'] is None
+
+
+def test_from_dict_round_trip_keeps_bonuses():
+    """Test that a ScoreCard survives a round trip with its bonus state."""
+    card = ScoreCard()
+    card.assign_score(Score(ScoreCategory.YAHTZEE, [6, 6, 6, 6, 6], 50))
+    card.assign_score(Score(ScoreCategory.SIXES, [6, 6, 6, 6, 6], 30))
+    restored = ScoreCard.from_dict(card.to_dict())
+
+    assert restored.scores == card.scores
+    assert restored.yahtzee_bonus_count == 1
+    assert restored.total_score == card.total_score
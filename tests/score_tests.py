@@ -0,0 +1,79 @@
+import copy
+import pickle
+
+import pytest
+
+from src.score import Score
+from src.score_category import ScoreCategory
+
+
+# Immutability Tests
+def test_score_has_no_instance_dict():
+    """Test that Score uses slots instead of a per-instance dict."""
+    score = Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3)
+    assert not hasattr(score, '__dict__')
+
+
+@pytest.mark.parametrize("attribute", ['category', 'roll', 'points', 'other'])
+def test_score_attributes_cannot_be_set(attribute):
+    """Test that Score attributes cannot be reassigned or added."""
+    score = Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3)
+    with pytest.raises(AttributeError, match="Score is immutable"):
+        setattr(score, attribute, None)
+
+
+def test_score_attributes_cannot_be_deleted():
+    """Test that Score attributes cannot be deleted."""
+    score = Score(ScoreCategory.ACES, [1, 1, 1, 2, 3], 3)
+    with pytest.raises(AttributeError, match="Score is immutable"):
+        del score.points
+
+
+# Value Semantics Tests
+def test_score_equality_and_hash():
+    """Test that Scores compare and hash by value."""
+    score1 = Score(ScoreCategory.FULL_HOUSE, [2, 2, 2, 5, 5], 25)
+    score2 = Score(ScoreCategory.FULL_HOUSE, [2, 2, 2, 5, 5], 25)
+    score3 = Score(ScoreCategory.CHANCE, [2, 2, 2, 5, 5], 16)
+
+    assert score1 == score2
+    assert hash(score1) == hash(score2)
+    assert score1 != score3
+    assert score1 != "not a score"
+    assert len({score1, score2, score3}) == 2
+
+
+def test_score_pickle_and_copy():
+    """Test that Scores survive pickling and copying."""
+    score = Score(ScoreCategory.YAHTZEE, [4, 4, 4, 4, 4], 50)
+
+    assert pickle.loads(pickle.dumps(score)) == score
+    assert copy.copy(score) == score
+    assert copy.deepcopy(score) == score
+
+
+def test_score_to_dict_copies_roll():
+    """Test that to_dict does not expose the Score's own roll list."""
+    score = Score(ScoreCategory.CHANCE, [1, 2, 3, 4, 5], 15)
+    data = score.to_dict()
+    data['roll'].append(6)
+
+    assert score.roll == [1, 2, 3, 4, 5]
+    assert Score.from_dict(score.to_dict()) == score
+
+
+# Shared Roll Tests
+def test_tuple_roll_equals_list_roll():
+    """Test that a Score holding its roll as a tuple equals one holding the same dice as a list."""
+    shared = Score(ScoreCategory.CHANCE, (1, 2, 3, 4, 5), 15)
+    fresh = Score(ScoreCategory.CHANCE, [1, 2, 3, 4, 5], 15)
+
+    assert shared == fresh and fresh == shared
+    assert hash(shared) == hash(fresh)
+    assert shared.to_dict() == fresh.to_dict()
+
+
+def test_tuple_roll_pickles():
+    """Test that a Score holding a tuple roll survives pickling."""
+    score = Score(ScoreCategory.CHANCE, (1, 2, 3, 4, 5), 15)
+    assert pickle.loads(pickle.dumps(score)) == score
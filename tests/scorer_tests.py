@@ -1,5 +1,10 @@
+from itertools import product
+
+import numpy as np
 import pytest
 
+from src.category_scorer import CATEGORY_SCORERS
+from src.roll_encoding import encode_roll, encode_rolls
 from src.scorer import Scorer
 from src.score import Score
 from src.score_category import ScoreCategory
@@ -402,7 +407,7 @@ def test_get_scores_roll_consistency():
     result = scorer.get_scores(test_roll)
     
     for score in result:
-        assert score.roll == test_roll, f"Score {score.category} has incorrect roll data"
+        assert list(score.roll) == test_roll, f"Score {score.category} has incorrect roll data"
 
 
 # Comprehensive integration tests
@@ -432,7 +437,7 @@ def test_get_scores_comprehensive(roll):
         assert isinstance(score.category, ScoreCategory)
         assert isinstance(score.points, int)
         assert score.points >= 0
-        assert score.roll == roll
+        assert list(score.roll) == roll
         
         # Points should be reasonable (not negative, not impossibly high)
         assert score.points <= 300  # Arbitrary upper bound
@@ -518,3 +523,200 @@ def test_get_scores_all_scoring_scenarios():
         if roll:  # Non-empty roll
             categories = {score.category for score in result}
             assert ScoreCategory.CHANCE in categories, f"Missing Chance for {description}"
+
+
+# Score table tests
+def test_get_scores_matches_category_scorers_for_every_roll():
+    """Test that table lookups agree with the category scorers for every ordered roll."""
+    scorer = Scorer()
+
+    for roll in product(range(1, 7), repeat=5):
+        roll = list(roll)
+        expected = [
+            (score.category, score.points)
+            for score in (s(roll) for s in CATEGORY_SCORERS.values()) if score is not None
+        ]
+        result = scorer.get_scores(roll)
+        assert [(score.category, score.points) for score in result] == expected
+        assert all(list(score.roll) == roll for score in result)
+
+
+def test_get_scores_out_of_range_dice_fall_back():
+    """Test that rolls outside the table still score through the category scorers."""
+    scorer = Scorer()
+    result = scorer.get_scores([0, 7, 7, 7, 8])
+
+    categories = {score.category for score in result}
+    assert categories == {ScoreCategory.THREE_OF_A_KIND, ScoreCategory.CHANCE}
+
+
+# Batch scoring tests
+def test_score_batch_matches_get_scores():
+    """Test that score_batch agrees with get_scores row by row."""
+    scorer = Scorer()
+    rolls = np.array(list(product(range(1, 7), repeat=5)))
+    result = scorer.score_batch(rolls)
+
+    assert result.shape == (len(rolls), len(ScoreCategory))
+
+    categories = list(ScoreCategory)
+    for roll, row in zip(rolls[::97], result[::97]):
+        expected = {(score.category, score.points) for score in scorer.get_scores(roll.tolist())}
+        actual = {(categories[column], int(points)) for column, points in enumerate(row) if points > 0}
+        assert actual == expected
+
+
+def test_score_batch_accepts_small_integer_dtypes():
+    """Test that score_batch works on compact uint8 roll arrays."""
+    scorer = Scorer()
+    rolls = np.array([[6, 6, 6, 6, 6], [1, 2, 3, 4, 5]], dtype=np.uint8)
+    result = scorer.score_batch(rolls)
+
+    yahtzee = list(ScoreCategory).index(ScoreCategory.YAHTZEE)
+    large_straight = list(ScoreCategory).index(ScoreCategory.LARGE_STRAIGHT)
+    assert result[0, yahtzee] == 50
+    assert result[1, large_straight] == 40
+    assert result[0, large_straight] == 0
+
+
+def test_score_batch_empty():
+    """Test that score_batch handles an empty batch."""
+    scorer = Scorer()
+    result = scorer.score_batch(np.empty((0, 5), dtype=np.int64))
+    assert result.shape == (0, len(ScoreCategory))
+
+
+@pytest.mark.parametrize("rolls", [
+    np.array([1, 2, 3, 4, 5]),          # Not two-dimensional
+    np.ones((2, 5, 1), dtype=np.int64), # Too many dimensions
+    np.array([[1, 2, 3, 4]]),           # Too few dice
+    np.array([[1, 2, 3, 4, 7]]),        # Face too high
+    np.array([[0, 2, 3, 4, 5]]),        # Face too low
+])
+def test_score_batch_invalid_rolls(rolls):
+    """Test that score_batch rejects malformed batches."""
+    scorer = Scorer()
+    with pytest.raises(ValueError):
+        scorer.score_batch(rolls)
+
+
+# Roll rank tests
+def test_get_scores_for_rank_matches_get_scores():
+    """Test that scoring by rank matches scoring the decoded roll."""
+    scorer = Scorer()
+
+    for rank in range(252):
+        result = scorer.get_scores_for_rank(rank)
+        expected = scorer.get_scores(result[0].roll)
+        assert [(s.category, s.points) for s in result] == [(s.category, s.points) for s in expected]
+        assert all(score.rank == rank for score in result)
+
+
+def test_get_scores_for_rank_invalid():
+    """Test that get_scores_for_rank rejects ranks out of range."""
+    scorer = Scorer()
+    with pytest.raises(ValueError, match="Roll rank must be between 0 and 251"):
+        scorer.get_scores_for_rank(252)
+
+
+def test_score_ranks_matches_score_batch():
+    """Test that score_ranks scores a 1-D array of roll ranks as score_batch scores the dice."""
+    scorer = Scorer()
+    rolls = np.array(list(product(range(1, 7), repeat=5)))
+    ranks = encode_rolls(rolls)
+
+    assert (scorer.score_ranks(ranks) == scorer.score_batch(rolls)).all()
+    assert scorer.score_ranks(np.empty(0, dtype=np.uint8)).shape == (0, len(ScoreCategory))
+
+
+@pytest.mark.parametrize("ranks", [
+    np.array([0, 300]),           # Rank too high
+    np.array([-1]),               # Rank too low
+    np.array([1.7, 2.2]),         # Not integers
+    np.array([[1, 2, 3, 4, 5]]),  # Not one-dimensional
+])
+def test_score_ranks_invalid(ranks):
+    """Test that score_ranks rejects malformed rank arrays."""
+    with pytest.raises(ValueError, match="Roll ranks"):
+        Scorer().score_ranks(ranks)
+
+
+def test_score_batch_rejects_ranks():
+    """Test that score_batch does not read a 1-D array as ranks."""
+    with pytest.raises(ValueError):
+        Scorer().score_batch(np.array([6, 6, 6, 6, 6]))
+
+
+def test_score_rank_round_trip():
+    """Test that Score converts between rolls and roll ranks."""
+    score = Score.from_rank(ScoreCategory.FULL_HOUSE, 100, 25)
+    assert score.roll == sorted(score.roll)
+    assert score.rank == 100
+    assert Score(ScoreCategory.CHANCE, [6, 5, 4, 3, 2], 20).rank == encode_roll([2, 3, 4, 5, 6])
+
+    with pytest.raises(ValueError):
+        _ = Score(ScoreCategory.CHANCE, [1, 2, 3], 6).rank
+
+
+# Face count fallback tests
+@pytest.mark.parametrize("roll", [
+    [1, 1, 1, 1, 1, 2, 3],
+    [2, 3, 4, 5, 6, 6],
+    [6, 6, 6],
+    [5],
+    [],
+])
+def test_get_scores_non_standard_rolls_match_category_scorers(roll):
+    """Test that face count scoring of non-standard rolls agrees with the category scorers."""
+    scorer = Scorer(min_dice=0)
+    expected = [
+        (score.category, score.points)
+        for score in (s(roll) for s in CATEGORY_SCORERS.values()) if score is not None
+    ]
+    result = scorer.get_scores(roll)
+    assert [(score.category, score.points) for score in result] == expected
+    assert all(score.roll is roll for score in result)
+
+
+# Interned score tests
+def test_get_scores_returns_shared_instances_for_sorted_rolls():
+    """Test that sorted rolls are scored with the same interned Score objects each time."""
+    scorer = Scorer()
+    result1 = scorer.get_scores([2, 2, 2, 5, 5])
+    result2 = Scorer().get_scores([2, 2, 2, 5, 5])
+
+    assert result1 is not result2
+    assert all(a is b for a, b in zip(result1, result2))
+    assert all(a is b for a, b in zip(result1, scorer.get_scores_for_rank(result1[0].rank)))
+
+
+def test_get_scores_unsorted_rolls_keep_caller_order():
+    """Test that unsorted rolls get fresh Scores holding the caller's roll."""
+    scorer = Scorer()
+    roll = [6, 6, 1, 2, 3]
+    result = scorer.get_scores(roll)
+
+    assert all(score.roll is roll for score in result)
+    assert result == scorer.get_scores(roll)
+
+
+def test_interned_scores_cannot_be_corrupted():
+    """Test that a caller cannot change the roll of a shared Score for later callers."""
+    score = Scorer().get_scores([1, 2, 3, 4, 5])[0]
+
+    with pytest.raises(AttributeError):
+        score.roll.append(6)
+
+    with pytest.raises(TypeError):
+        score.roll[0] = 6
+
+    assert Scorer().get_scores([1, 2, 3, 4, 5])[0].roll == (1, 2, 3, 4, 5)
+
+
+def test_interned_scores_equal_fresh_scores():
+    """Test that shared Scores compare and hash like Scores holding a list roll."""
+    shared = Scorer().get_scores_for_rank(0)[0]
+    fresh = Score(shared.category, [1, 1, 1, 1, 1], shared.points)
+
+    assert shared == fresh and fresh == shared
+    assert hash(shared) == hash(fresh)
@@ -0,0 +1,276 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.advisor import Advisor
+from src.packed_score_card import PackedScoreCard
+from src.score import Score
+from src.score_card import ScoreCard
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.scorer import Scorer
+from src.scoring_server import MicroBatcher, ScoringServer
+from src.solver import FULL_MASK, solve
+
+OPEN = (ScoreCategory.FIVES, ScoreCategory.SIXES, ScoreCategory.YAHTZEE)
+START_MASK = FULL_MASK & ~sum(1 << CATEGORY_INDEX[category] for category in OPEN)
+
+
+@pytest.fixture(scope="module")
+def advisor():
+    """Solve a small game with only fives, sixes and Yahtzee open."""
+    return Advisor(solve(START_MASK))
+
+
+def _open_card() -> dict:
+    """A card, as a dictionary, with every category scored except fives, sixes and Yahtzee."""
+    card = ScoreCard()
+
+    for category in ScoreCategory:
+        if category not in OPEN:
+            card.assign_score(Score(category, [1, 2, 3, 4, 6], 0))
+
+    return card.to_dict()
+
+
+async def _request(port: int, method: str, target: str, body: object = None, path: str | None = None):
+    """Sends one HTTP request on a new connection and returns the status and decoded body."""
+    if path is None:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(path)
+
+    content = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {len(content)}\r\nConnection: close\r\n\r\n".encode()
+                 + content)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def _serve(server: ScoringServer, client, path: str | None = None):
+    """Starts the server, runs a client coroutine against its port, and stops the server."""
+    async def run():
+        listener = await server.start(port=0, path=path)
+
+        async with listener:
+            port = None if path else listener.sockets[0].getsockname()[1]
+            return await client(port)
+
+    return asyncio.run(run())
+
+
+# MicroBatcher Tests
+def test_micro_batcher_groups_concurrent_items():
+    """Test that items submitted together are handled in one call."""
+    calls = []
+
+    def handler(items):
+        calls.append(items)
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(handler, max_delay=0.01)
+        return await asyncio.gather(*(batcher.submit(item) for item in range(10)))
+
+    assert asyncio.run(run()) == [item * 2 for item in range(10)]
+    assert calls == [list(range(10))]
+
+
+def test_micro_batcher_flushes_full_batches():
+    """Test that a full batch is handled without waiting for the timer."""
+    calls = []
+
+    def handler(items):
+        calls.append(len(items))
+        return items
+
+    async def run():
+        batcher = MicroBatcher(handler, max_delay=10, max_batch=4)
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(item) for item in range(8))), 1)
+
+    assert asyncio.run(run()) == list(range(8))
+    assert calls == [4, 4]
+
+
+def test_micro_batcher_isolates_errors_to_their_items():
+    """Test that a failing item fails only its own request, not the rest of its batch."""
+    calls = []
+
+    def handler(items):
+        calls.append(items)
+
+        if any(item < 0 for item in items):
+            raise ValueError("negative item")
+
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(handler, max_delay=0.01)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(-1), batcher.submit(2), return_exceptions=True)
+
+    first, second, third = asyncio.run(run())
+    assert (first, third) == (2, 4)
+    assert isinstance(second, ValueError)
+    assert calls[0] == [1, -1, 2]
+
+
+# Scoring Tests
+def test_score_matches_scorer():
+    """Test that /score returns the points of every scoring category."""
+    status, body = _serve(ScoringServer(), lambda port: _request(port, "POST", "/score", {'roll': [3, 2, 3, 2, 3]}))
+    expected = {score.category.value: score.points for score in Scorer().get_scores([2, 2, 3, 3, 3])}
+    assert status == 200
+    assert body == {'scores': expected}
+
+
+def test_score_many_rolls_in_one_request():
+    """Test that /score accepts a list of rolls."""
+    rolls = [[1, 2, 3, 4, 5], [6, 6, 6, 6, 6]]
+    status, body = _serve(ScoringServer(), lambda port: _request(port, "POST", "/score", {'rolls': rolls}))
+    assert status == 200
+    assert [scores['Chance'] for scores in body['scores']] == [15, 30]
+
+
+def test_concurrent_requests_share_batches():
+    """Test that concurrent requests are scored in fewer batches than requests."""
+    server = ScoringServer(max_delay=0.005)
+    rolls = np.random.default_rng(3).integers(1, 7, (50, 5)).tolist()
+
+    async def client(port):
+        return await asyncio.gather(*(_request(port, "POST", "/score", {'roll': roll}) for roll in rolls))
+
+    responses = _serve(server, client)
+    points = Scorer().score_batch(np.array(rolls))
+    assert [body['scores'].get('Chance') for _, body in responses] == points[:, -1].tolist()
+    assert server.score_batcher.items == 50
+    assert server.score_batcher.batches < 50
+
+
+def test_keep_alive_serves_several_requests():
+    """Test that one connection can carry several requests."""
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        statuses = []
+
+        for roll in ([1, 1, 1, 1, 1], [2, 2, 2, 2, 2]):
+            body = json.dumps({'roll': roll}).encode()
+            writer.write(f"POST /score HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            statuses.append((await reader.readline()).split()[1])
+
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length"):
+                    length = int(line.split(b":")[1])
+
+            await reader.readexactly(length)
+
+        writer.close()
+        return statuses
+
+    assert _serve(ScoringServer(), client) == [b"200", b"200"]
+
+
+def test_unix_socket(tmp_path):
+    """Test that the server can listen on a Unix socket."""
+    path = str(tmp_path / "scoring.sock")
+    status, body = _serve(ScoringServer(), lambda port: _request(port, "POST", "/score", {'roll': [5] * 5}, path), path)
+    assert status == 200
+    assert body['scores']['Yahtzee'] == 50
+
+
+# Error Tests
+@pytest.mark.parametrize("method, target, body, status", [
+    ("POST", "/score", {'roll': [1, 2, 3, 4, 7]}, 400),
+    ("POST", "/score", {'dice': [1, 2, 3, 4, 5]}, 400),
+    ("POST", "/score", b"not json", 400),
+    ("POST", "/score", [1, 2, 3, 4, 5], 400),
+    ("POST", "/score", {'roll': [True, 2, 3, 4, 5]}, 400),
+    ("POST", "/score", {'roll': [1.0, 2, 3, 4, 5]}, 400),
+    ("POST", "/score", {'rolls': [[1, 2, 3, 4, 5], [1, 1, 1, 1, False]]}, 400),
+    pytest.param("POST", "/score", b"[" * 100000, 400, id="deeply-nested"),
+    ("GET", "/score", None, 405),
+    ("POST", "/advise", {'roll': [1, 2, 3, 4, 5]}, 404),
+    ("GET", "/missing", None, 404),
+])
+def test_bad_requests(method, target, body, status):
+    """Test that invalid requests get an error status and message."""
+    result = _serve(ScoringServer(), lambda port: _request(port, method, target, body))
+    assert result[0] == status
+    assert 'error' in result[1]
+
+
+def test_health_reports_batches():
+    """Test that /health reports the batching statistics."""
+    status, body = _serve(ScoringServer(), lambda port: _request(port, "GET", "/health"))
+    assert status == 200
+    assert body == {'status': 'ok', 'advice': False, 'batches': 0, 'requests': 0}
+
+
+# Advice Tests
+@pytest.mark.parametrize("roll, rerolls_left", [([5, 5, 6, 6, 1], 2), ([6, 6, 6, 6, 6], 0), ([5, 5, 5, 2, 1], 1)])
+def test_advise_matches_advisor(advisor, roll, rerolls_left):
+    """Test that /advise returns the advisor's best action and its value."""
+    request = {'card': _open_card(), 'roll': roll, 'rerolls_left': rerolls_left}
+    status, body = _serve(ScoringServer(advisor=advisor), lambda port: _request(port, "POST", "/advise", request))
+    card = PackedScoreCard()
+    card.filled = START_MASK
+    best = advisor.advise(card, roll, rerolls_left)[0]
+
+    assert status == 200
+    assert body['expected_value'] == pytest.approx(best.expected_value)
+
+    if rerolls_left:
+        assert tuple(body['keep']) == best.keep
+    else:
+        assert body['category'] == best.category.value
+
+
+def test_advise_rejects_unsolved_card(advisor):
+    """Test that a card the strategy values do not cover is rejected."""
+    request = {'roll': [1, 2, 3, 4, 5], 'rerolls_left': 2}
+    status, body = _serve(ScoringServer(advisor=advisor), lambda port: _request(port, "POST", "/advise", request))
+    assert status == 400
+
+
+
+def _bad_card(name: str, score: object) -> dict:
+    """An open card with one score replaced."""
+    card = _open_card()
+    card['scores'][name] = score
+    return card
+
+
+@pytest.mark.parametrize("card", [
+    {'scores': []},
+    [],
+    _bad_card('Aces', {'category': 'Aces', 'roll': [1, 1, 2, 3, 4], 'points': 2.5}),
+    _bad_card('Aces', {'category': 'Aces', 'roll': [1, 1, 2, 3, 4], 'points': -5}),
+    _bad_card('Aces', {'category': 'Aces', 'roll': [1, 1, 2, 3, 4], 'points': True}),
+    _bad_card('Aces', {'category': 'Aces', 'roll': [1, 1, 2, 3, 4]}),
+    _bad_card('Aces', 3),
+    _bad_card('Aces', {'category': 'Aces', 'roll': [True, 1, 2, 3, 4], 'points': 2}),
+    _bad_card('Aces', {'category': 'Aces', 'roll': "11234", 'points': 2}),
+])
+def test_advise_rejects_malformed_cards(advisor, card):
+    """Test that malformed cards get a 400 response rather than a dropped connection."""
+    request = {'card': card, 'roll': [1, 2, 3, 4, 5], 'rerolls_left': 2}
+    status, body = _serve(ScoringServer(advisor=advisor), lambda port: _request(port, "POST", "/advise", request))
+    assert status == 400
+    assert 'error' in body
+
+
+def test_advise_bad_card_does_not_fail_its_batch(advisor):
+    """Test that a card with negative upper points does not fail a valid request batched with it."""
+    bad = {'card': _bad_card('Aces', {'category': 'Aces', 'roll': [1, 2, 3, 4, 5], 'points': -1}),
+           'roll': [1, 2, 3, 4, 5], 'rerolls_left': 2}
+    good = {'card': _open_card(), 'roll': [6, 6, 6, 6, 6], 'rerolls_left': 0}
+
+    async def client(port):
+        return await asyncio.gather(_request(port, "POST", "/advise", bad), _request(port, "POST", "/advise", good))
+
+    (bad_status, _), (good_status, body) = _serve(ScoringServer(advisor=advisor, max_delay=0.05), client)
+    assert bad_status == 400
+    assert good_status == 200
+    assert body['category'] == ScoreCategory.YAHTZEE.value
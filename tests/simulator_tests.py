@@ -0,0 +1,177 @@
+import numpy as np
+import pytest
+
+from src.dice_roller import DiceRoller
+from src.packed_score_card import PackedScoreCard
+from src.roll_encoding import ROLL_INDEX, ROLLS
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.simulator import GameBatch, GreedyPolicy, OptimalPolicy, Policy, simulate, simulate_parallel
+from src.solver import FULL_MASK, solve
+from src.strategy_file import open_strategy_file, write_strategy_file
+
+OPEN = (ScoreCategory.SIXES, ScoreCategory.YAHTZEE, ScoreCategory.CHANCE)
+START_MASK = FULL_MASK & ~sum(1 << CATEGORY_INDEX[category] for category in OPEN)
+
+
+class RecordingPolicy(GreedyPolicy):
+    """A greedy policy that records every roll it scores and where."""
+    def __init__(self):
+        self.turns = []
+
+    def choose_category(self, games):
+        columns = super().choose_category(games)
+        self.turns.append((games.ranks.copy(), columns.copy()))
+        return columns
+
+
+class RepeatPolicy(GreedyPolicy):
+    """A broken policy that always scores Chance."""
+    def choose_category(self, games):
+        return np.full(len(games.ranks), CATEGORY_INDEX[ScoreCategory.CHANCE])
+
+
+# Game Batch Tests
+def test_game_batch_scores_bonuses():
+    """Test that scoring awards the upper-section and Yahtzee bonuses like a score card."""
+    games = GameBatch(2)
+    games.upper_subtotals[:] = [60, 10]
+    games.masks[:] = 1 << CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+    games.set_dice(np.array([[3, 3, 3, 3, 3], [1, 2, 3, 4, 6]]))
+    games.score(np.full(2, CATEGORY_INDEX[ScoreCategory.THREES]))
+    assert list(games.totals) == [15 + 35 + 100, 3]
+    assert list(games.yahtzee_bonus_counts) == [1, 0]
+    assert list(games.upper_subtotals) == [75, 13]
+
+
+def test_game_batch_rejects_filled_category():
+    """Test that a category cannot be scored twice."""
+    games = GameBatch(1, START_MASK)
+    games.set_dice(np.array([[1, 2, 3, 4, 5]]))
+    with pytest.raises(ValueError):
+        games.score(np.array([CATEGORY_INDEX[ScoreCategory.ACES]]))
+
+
+# Greedy Policy Tests
+def test_greedy_keeps_most_common_face():
+    """Test that the greedy policy holds the most common face, the highest on ties."""
+    games = GameBatch(2)
+    games.set_dice(np.array([[1, 2, 2, 5, 6], [3, 3, 5, 5, 6]]))
+    np.testing.assert_array_equal(GreedyPolicy().keep(games), [[False, True, True, False, False],
+                                                              [False, False, True, True, False]])
+
+
+def test_greedy_scores_most_points():
+    """Test that the greedy policy scores in the open category worth the most."""
+    games = GameBatch(1)
+    games.masks[:] = 1 << CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+    games.set_dice(np.array([[6, 6, 6, 6, 6]]))
+    # Sixes, three and four of a kind and Chance all score 30; Sixes comes first.
+    assert GreedyPolicy().choose_category(games)[0] == CATEGORY_INDEX[ScoreCategory.SIXES]
+
+
+# Simulation Tests
+def test_simulate_full_games():
+    """Test that every game fills the whole card with a score in the possible range."""
+    scores = simulate(2000, GreedyPolicy(), DiceRoller(seed=1))
+    assert scores.shape == (2000,)
+    assert scores.min() >= 5
+    assert 100 < scores.mean() < 250
+
+
+def test_simulate_is_reproducible():
+    """Test that the same seed plays the same games."""
+    first = simulate(500, GreedyPolicy(), DiceRoller(seed=3), batch_size=128)
+    second = simulate(500, GreedyPolicy(), DiceRoller(seed=3), batch_size=128)
+    np.testing.assert_array_equal(first, second)
+
+
+def test_simulate_matches_packed_score_card():
+    """Test that replaying the simulated choices on score cards gives the same totals."""
+    policy = RecordingPolicy()
+    scores = simulate(300, policy, DiceRoller(seed=5, use_alias=True))
+    categories = list(ScoreCategory)
+
+    for game in range(300):
+        card = PackedScoreCard()
+        for ranks, columns in policy.turns:
+            card.assign_rank(categories[columns[game]], int(ranks[game]))
+        assert card.total_score == scores[game]
+
+
+def test_simulate_rejects_broken_policy():
+    """Test that a policy scoring a filled category is caught."""
+    with pytest.raises(ValueError):
+        simulate(10, RepeatPolicy(), DiceRoller(seed=1))
+
+
+def test_simulate_rejects_other_dice():
+    """Test that only five six-sided dice are supported."""
+    with pytest.raises(ValueError):
+        simulate(10, GreedyPolicy(), DiceRoller(num_dice=6))
+
+
+def test_policy_base_is_abstract():
+    """Test that the base policy must be subclassed."""
+    with pytest.raises(TypeError):
+        Policy()
+
+
+def test_policy_subclass_must_implement_both_methods():
+    """Test that a policy missing choose_category cannot be instantiated."""
+    class KeepOnly(Policy):
+        def keep(self, games):
+            return np.zeros((len(games.ranks), 5), dtype=bool)
+
+    with pytest.raises(TypeError):
+        KeepOnly()
+
+
+# Optimal Policy Tests
+def test_optimal_policy_matches_solved_value():
+    """Test that simulating the optimal policy averages the solver's expected score."""
+    values = solve(START_MASK)
+    scores = simulate(20000, OptimalPolicy(values), DiceRoller(seed=11), start_mask=START_MASK)
+    assert scores.mean() == pytest.approx(values[START_MASK, 0], rel=0.05)
+    assert scores.mean() > simulate(20000, GreedyPolicy(), DiceRoller(seed=11), start_mask=START_MASK).mean()
+
+
+def test_optimal_policy_keeps_best_dice():
+    """Test that the optimal keep holds dice that are in the roll."""
+    values = solve(START_MASK)
+    games = GameBatch(1, START_MASK)
+    games.set_dice(np.array([[2, 6, 6, 6, 6]]))
+    keep = OptimalPolicy(values).keep(games)
+    np.testing.assert_array_equal(keep, [[False, True, True, True, True]])
+    assert ROLL_INDEX[(2, 6, 6, 6, 6)] == games.ranks[0]
+
+
+def test_optimal_policy_reads_best_categories_from_table(tmp_path):
+    """Test that a strategy file's best-category table picks the categories the values do."""
+    values = solve(START_MASK)
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK)
+    games = GameBatch(252, START_MASK)
+    games.set_dice(np.array(ROLLS))
+    np.testing.assert_array_equal(OptimalPolicy(open_strategy_file(path)).choose_category(games),
+                                  OptimalPolicy(values).choose_category(games))
+
+
+# Parallel Simulation Tests
+def test_simulate_parallel_independent_of_workers():
+    """Test that the scores do not depend on the number of worker processes."""
+    serial = simulate_parallel(900, GreedyPolicy(), 42, workers=1, chunk_size=200)
+    parallel = simulate_parallel(900, GreedyPolicy(), 42, workers=2, chunk_size=200)
+    assert serial.shape == (900,)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_simulate_parallel_chunks_use_child_streams():
+    """Test that each chunk plays on its own child stream of the root seed."""
+    scores = simulate_parallel(300, GreedyPolicy(), 42, chunk_size=100)
+    np.testing.assert_array_equal(scores[100:200], simulate(100, GreedyPolicy(), DiceRoller.for_stream(42, 1)))
+    assert not (scores[:100] == scores[100:200]).all()
+
+
+def test_simulate_parallel_empty():
+    """Test that no games give no scores."""
+    assert simulate_parallel(0, GreedyPolicy(), 1).shape == (0,)
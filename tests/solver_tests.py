@@ -0,0 +1,207 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.packed_score_card import PackedScoreCard
+from src.roll_encoding import ROLL_INDEX
+from src.score import Score
+from src.score_card import ScoreCard
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.solver import (
+    FULL_MASK, NUM_UPPER, best_categories, card_state, category_values, category_values_batch, masks_by_layer, solve, solve_mask, turn_values
+)
+
+
+def open_only(*categories):
+    """Build a start mask with every category filled except the given ones."""
+    return FULL_MASK & ~sum(1 << CATEGORY_INDEX[category] for category in categories)
+
+
+def bit(category):
+    """Return the mask bit of a category."""
+    return 1 << CATEGORY_INDEX[category]
+
+
+# Game State Tests
+def test_card_state_empty():
+    """Test the state of an empty card."""
+    assert card_state(ScoreCard()) == (0, 0)
+    assert card_state(PackedScoreCard()) == (0, 0)
+
+
+def test_card_state_matches_for_both_cards():
+    """Test that ScoreCard and PackedScoreCard reduce to the same state."""
+    card = ScoreCard()
+    packed = PackedScoreCard()
+    for score in [
+        Score(ScoreCategory.SIXES, [6, 6, 6, 6, 6], 30),
+        Score(ScoreCategory.FIVES, [5, 5, 5, 5, 5], 25),
+        Score(ScoreCategory.FOURS, [4, 4, 4, 4, 1], 16),
+        Score(ScoreCategory.YAHTZEE, [1, 2, 3, 4, 5], 0),
+    ]:
+        card.assign_score(score)
+        packed.assign_score(score)
+
+    expected_mask = bit(ScoreCategory.SIXES) | bit(ScoreCategory.FIVES) | bit(ScoreCategory.FOURS) | bit(
+        ScoreCategory.YAHTZEE)
+    assert card_state(card) == (expected_mask, 63)  # 71 is capped at 63
+    assert card_state(packed) == (expected_mask, 63)
+
+
+# Layer Tests
+def test_masks_by_layer_full_game():
+    """Test that the full game has 14 layers covering all 8192 masks."""
+    layers = masks_by_layer()
+    assert len(layers) == 14
+    assert layers[0] == [FULL_MASK]
+    assert layers[-1] == [0]
+    assert sum(len(layer) for layer in layers) == 8192
+    assert all(all(mask.bit_count() == 13 - depth for mask in layer) for depth, layer in enumerate(layers))
+
+
+def test_masks_by_layer_with_start_mask():
+    """Test that only masks containing the start mask are visited."""
+    start = open_only(ScoreCategory.CHANCE, ScoreCategory.YAHTZEE)
+    layers = masks_by_layer(start)
+    assert layers == [[FULL_MASK], sorted([start | bit(ScoreCategory.CHANCE), start | bit(ScoreCategory.YAHTZEE)]),
+                      [start]]
+
+
+# Category Value Tests
+def test_category_values_filled_categories_are_excluded():
+    """Test that filled categories can never be chosen."""
+    values = np.zeros((8192, NUM_UPPER))
+    mask = bit(ScoreCategory.ACES) | bit(ScoreCategory.CHANCE)
+    result = category_values(values, mask, np.array([0]))
+
+    assert result.shape == (1, 252, 13)
+    assert np.isneginf(result[:, :, CATEGORY_INDEX[ScoreCategory.ACES]]).all()
+    assert np.isneginf(result[:, :, CATEGORY_INDEX[ScoreCategory.CHANCE]]).all()
+    assert np.isfinite(result[:, :, CATEGORY_INDEX[ScoreCategory.TWOS]]).all()
+
+
+def test_category_values_upper_bonus():
+    """Test that the upper bonus is paid once, when the subtotal reaches 63."""
+    values = np.zeros((8192, NUM_UPPER))
+    sixes = CATEGORY_INDEX[ScoreCategory.SIXES]
+    rank = ROLL_INDEX[(6, 6, 6, 6, 6)]
+    result = category_values(values, 0, np.array([0, 32, 33, 63]))
+
+    assert result[:, rank, sixes].tolist() == [30, 30, 30 + 35, 30]
+
+
+def test_category_values_yahtzee_bonus():
+    """Test that a Yahtzee roll earns the bonus once the Yahtzee box is filled, whatever it scored."""
+    values = np.zeros((8192, NUM_UPPER))
+    chance = CATEGORY_INDEX[ScoreCategory.CHANCE]
+    yahtzee_roll = ROLL_INDEX[(2, 2, 2, 2, 2)]
+
+    without = category_values(values, 0, np.array([0]))
+    scratched = category_values(values, bit(ScoreCategory.YAHTZEE), np.array([0]))
+
+    assert without[0, yahtzee_roll, chance] == 10
+    assert scratched[0, yahtzee_roll, chance] == 110
+    assert scratched[0, ROLL_INDEX[(1, 2, 2, 2, 2)], chance] == 9
+
+
+def test_category_values_include_future_values():
+    """Test that the value of the following state is added to the points."""
+    values = np.zeros((8192, NUM_UPPER))
+    values[bit(ScoreCategory.CHANCE)] = 7.5
+    result = category_values(values, 0, np.array([0]))
+    assert result[0, ROLL_INDEX[(1, 1, 1, 1, 1)], CATEGORY_INDEX[ScoreCategory.CHANCE]] == 5 + 7.5
+
+
+def test_category_values_batch_matches_single_mask():
+    """Test that batched category values match category_values state by state."""
+    values = np.random.default_rng(5).random((8192, NUM_UPPER)) * 100
+    masks = np.array([0, bit(ScoreCategory.YAHTZEE), open_only(ScoreCategory.ACES, ScoreCategory.CHANCE), 0])
+    uppers = np.array([0, 60, 62, 63])
+    result = category_values_batch(values, masks, uppers)
+    assert result.shape == (4, 252, 13)
+    for index in range(4):
+        np.testing.assert_array_equal(result[index], category_values(values, masks[index], uppers[index:index + 1])[0])
+
+
+def test_category_values_batch_values_chosen_rolls():
+    """Test that valuing some rolls gives exactly their rows of the full valuation."""
+    values = np.random.default_rng(6).random((8192, NUM_UPPER)) * 100
+    masks = np.array([bit(ScoreCategory.YAHTZEE), open_only(ScoreCategory.SIXES, ScoreCategory.YAHTZEE)])
+    uppers = np.array([45, 62])
+    ranks = np.array([251, 0, 251, 100])
+    np.testing.assert_array_equal(category_values_batch(values, masks, uppers, ranks),
+                                  category_values_batch(values, masks, uppers)[:, ranks])
+
+
+def test_best_categories_picks_highest_value():
+    """Test that each final roll is scored in its most valuable open category."""
+    values = np.zeros((8192, NUM_UPPER))
+    mask = open_only(ScoreCategory.SIXES, ScoreCategory.YAHTZEE)
+    best = best_categories(values, mask)
+    assert best.shape == (NUM_UPPER, 252)
+    assert best.dtype == np.uint8
+    assert best[0, ROLL_INDEX[(6, 6, 6, 6, 6)]] == CATEGORY_INDEX[ScoreCategory.YAHTZEE]
+    assert best[0, ROLL_INDEX[(1, 2, 6, 6, 6)]] == CATEGORY_INDEX[ScoreCategory.SIXES]
+
+
+# Solve Tests
+def test_solve_yahtzee_only_game():
+    """Test that chasing a Yahtzee alone matches the known 4.6% success rate."""
+    start = open_only(ScoreCategory.YAHTZEE)
+    values = solve(start)
+
+    assert values[FULL_MASK].tolist() == [0.0] * NUM_UPPER
+    assert values[start, 0] == pytest.approx(50 * 0.0460286, abs=1e-5)
+    assert np.isnan(values[0]).all()
+
+
+def test_solve_two_category_game_is_consistent():
+    """Test that a small game's value equals the expectation of its first turn."""
+    start = open_only(ScoreCategory.CHANCE, ScoreCategory.FULL_HOUSE)
+    values = solve(start)
+    first_turn = turn_values(values, start, np.array([0]))
+
+    assert values[start, 0] == pytest.approx(solve_mask(values, start)[0])
+    assert first_turn[0].shape == (1, 252)
+    # More rerolls can never make a roll worth less
+    assert (first_turn[1] >= first_turn[0] - 1e-9).all()
+    assert (first_turn[2] >= first_turn[1] - 1e-9).all()
+    # Two turns are worth more than either category alone
+    assert values[start, 0] > values[start | bit(ScoreCategory.FULL_HOUSE), 0]
+    assert values[start, 0] > values[start | bit(ScoreCategory.CHANCE), 0]
+
+
+def test_solve_upper_section_game():
+    """Test the upper-section-only game against its structure."""
+    start = open_only(*list(ScoreCategory)[:6])
+    values = solve(start)
+
+    # Values never decrease as the upper subtotal approaches the bonus
+    assert (np.diff(values[start, :63]) >= -1e-9).all()
+    # A capped subtotal means the bonus was already paid, so it is no longer to come
+    assert values[start, 63] + 35 >= values[start, 62] - 1e-9
+    assert values[start, 63] + 35 - values[start, 0] <= 35 + 1e-9
+
+
+# Parallel Solve Tests
+def test_parallel_solve_is_bit_identical():
+    """Test that splitting layers across processes gives exactly the serial results."""
+    start = open_only(ScoreCategory.ACES, ScoreCategory.TWOS, ScoreCategory.YAHTZEE, ScoreCategory.CHANCE)
+
+    serial = solve(start)
+    parallel = solve(start, workers=2)
+
+    assert serial.tobytes() == parallel.tobytes()
+
+
+def test_parallel_solve_restores_thread_limits(monkeypatch):
+    """Test that the BLAS thread limits set for the workers are undone afterwards."""
+    monkeypatch.setenv("OMP_NUM_THREADS", "3")
+    monkeypatch.delenv("OPENBLAS_NUM_THREADS", raising=False)
+    start = open_only(ScoreCategory.YAHTZEE, ScoreCategory.CHANCE)
+
+    solve(start, workers=2)
+
+    assert os.environ["OMP_NUM_THREADS"] == "3"
+    assert "OPENBLAS_NUM_THREADS" not in os.environ
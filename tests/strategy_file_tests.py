@@ -0,0 +1,171 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import src
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.solver import FULL_MASK, best_categories, solve
+from src.strategy_file import (
+    HEADER_SIZE, MAGIC, StrategyTable, load_or_build, open_strategy_file, rule_fingerprint, write_strategy_file
+)
+
+# A small game with only three open categories keeps every solve here fast.
+START_MASK = FULL_MASK & ~sum(
+    1 << CATEGORY_INDEX[category]
+    for category in (ScoreCategory.SIXES, ScoreCategory.YAHTZEE, ScoreCategory.CHANCE)
+)
+
+
+@pytest.fixture(scope="module")
+def values():
+    """Solve the small game once for the whole module."""
+    return solve(START_MASK)
+
+
+@pytest.fixture
+def path(tmp_path, values):
+    """Write a strategy file for the small game."""
+    path = str(tmp_path / "strategy.bin")
+    write_strategy_file(path, values, START_MASK)
+    return path
+
+
+# Round Trip Tests
+def test_values_round_trip_as_float32(path, values):
+    """Test that the mapped values match the solve to float32 precision."""
+    table = open_strategy_file(path)
+    assert isinstance(table.values, np.memmap)
+    assert table.values.dtype == np.float32
+    assert table.start_mask == START_MASK
+    np.testing.assert_array_equal(table.values, values.astype(np.float32))
+
+
+def test_actions_match_best_categories(path, values):
+    """Test that the stored best categories match a direct computation."""
+    table = open_strategy_file(path)
+    for mask in (START_MASK, START_MASK | 1 << CATEGORY_INDEX[ScoreCategory.SIXES]):
+        np.testing.assert_array_equal(table.actions[mask], best_categories(values, mask))
+
+
+def test_write_applies_umask_mode(tmp_path, values):
+    """Test that the file gets the usual permissions, not the owner-only ones of a temporary file."""
+    path = str(tmp_path / "strategy.bin")
+    umask = os.umask(0o022)
+
+    try:
+        write_strategy_file(path, values, START_MASK, actions=False)
+    finally:
+        os.umask(umask)
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_tables_are_read_only(path):
+    """Test that the mapped tables cannot be written through."""
+    table = open_strategy_file(path)
+    with pytest.raises(ValueError):
+        table.values[0, 0] = 1.0
+
+
+def test_without_actions(tmp_path, values):
+    """Test that the best-category table can be left out."""
+    path = str(tmp_path / "values.bin")
+    write_strategy_file(path, values, START_MASK, actions=False)
+    assert open_strategy_file(path).actions is None
+    assert os.path.getsize(path) == HEADER_SIZE + values.size * 4
+
+
+def test_pickle_reopens_the_file(path):
+    """Test that pickling sends the path rather than copying the tables."""
+    table = open_strategy_file(path)
+    data = pickle.dumps(table)
+    assert len(data) < 1000
+    restored = pickle.loads(data)
+    assert restored.path == path
+    np.testing.assert_array_equal(restored.values, table.values)
+
+
+def test_covers():
+    """Test which masks a table solved from a start mask covers."""
+    table = StrategyTable("unused", None, None, START_MASK)
+    assert table.covers(START_MASK)
+    assert table.covers(FULL_MASK)
+    assert not table.covers(0)
+
+
+# Header Tests
+def test_rule_fingerprint_is_stable():
+    """Test that the rule fingerprint is a fixed-size digest."""
+    assert len(rule_fingerprint()) == 32
+    assert rule_fingerprint() == rule_fingerprint()
+
+
+def test_open_does_not_rehash_rules(path, monkeypatch):
+    """Test that opening a file uses the fingerprint computed at import."""
+    monkeypatch.setattr("src.strategy_file.hashlib.sha256", lambda *args: pytest.fail("rules hashed again"))
+    assert open_strategy_file(path).start_mask == START_MASK
+
+
+def test_rejects_other_files(tmp_path):
+    """Test that a file without the magic bytes is rejected."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a strategy file".ljust(HEADER_SIZE, b"\0"))
+    with pytest.raises(ValueError, match="not a strategy file"):
+        open_strategy_file(str(path))
+
+
+def test_rejects_truncated_file(path):
+    """Test that a truncated file is rejected."""
+    with open(path, "r+b") as file:
+        file.truncate(HEADER_SIZE + 100)
+    with pytest.raises(ValueError, match="bytes"):
+        open_strategy_file(path)
+
+
+def test_rejects_other_version(path, monkeypatch):
+    """Test that a file built by another library version is rejected."""
+    monkeypatch.setattr(src, "__version__", "99.0.0")
+    with pytest.raises(ValueError, match="version"):
+        open_strategy_file(path)
+
+
+def test_rejects_other_rules(path):
+    """Test that a file built for different rules is rejected."""
+    with open(path, "r+b") as file:
+        file.seek(len(MAGIC) + 4 + 16)
+        file.write(bytes(32))
+    with pytest.raises(ValueError, match="rule set"):
+        open_strategy_file(path)
+
+
+# Cache Tests
+def test_load_or_build_creates_missing_file(tmp_path, values):
+    """Test that a missing cache is solved and written."""
+    path = str(tmp_path / "cache.bin")
+    table = load_or_build(path, START_MASK, actions=False)
+    np.testing.assert_array_equal(table.values, values.astype(np.float32))
+
+
+def test_load_or_build_reuses_valid_file(path, monkeypatch):
+    """Test that a valid cache is opened without solving."""
+    monkeypatch.setattr("src.strategy_file.solve", lambda *args: pytest.fail("solved again"))
+    assert load_or_build(path, START_MASK).start_mask == START_MASK
+    # A cache solved from fewer filled categories also covers a smaller game.
+    assert load_or_build(path, FULL_MASK).start_mask == START_MASK
+
+
+def test_load_or_build_rebuilds_stale_file(path, monkeypatch):
+    """Test that a cache from another library version is rebuilt."""
+    monkeypatch.setattr(src, "__version__", "99.0.0")
+    table = load_or_build(path, START_MASK)
+    assert table.start_mask == START_MASK
+    assert table.actions is not None
+
+
+def test_load_or_build_rebuilds_when_actions_missing(tmp_path, values):
+    """Test that a cache without actions is rebuilt when actions are needed."""
+    path = str(tmp_path / "cache.bin")
+    write_strategy_file(path, values, START_MASK, actions=False)
+    assert load_or_build(path, START_MASK).actions is not None
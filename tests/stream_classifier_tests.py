@@ -0,0 +1,185 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from src.score_category import CATEGORY_INDEX, ScoreCategory
+from src.scorer import Scorer
+from src.stream_classifier import classify_csv, classify_ndjson, classify_stream, main, score_rolls
+
+
+# Chunk Scoring Tests
+def test_score_rolls_matches_scorer():
+    """Test that chunk scoring matches the Scorer for standard and other rolls."""
+    rolls = [[3, 3, 3, 2, 2], [1, 2, 3, 4, 5], [6, 6, 6, 6], [1, 2, 3, 4, 5, 6], [7, 1, 1, 1, 1]]
+    scorer = Scorer(min_dice=4)
+    points = score_rolls(rolls, scorer)
+    assert points.shape == (5, 13)
+    for row, roll in enumerate(rolls):
+        expected = np.zeros(13, dtype=np.int64)
+        for score in scorer.get_scores(roll):
+            expected[CATEGORY_INDEX[score.category]] = score.points
+        np.testing.assert_array_equal(points[row], expected)
+
+
+def test_score_rolls_empty():
+    """Test that an empty chunk scores to an empty array."""
+    assert score_rolls([], Scorer()).shape == (0, 13)
+
+
+@pytest.mark.parametrize("roll", [[1, 2, 3, "a", 5], [[1], 2, 3, 4, 5], [1.5, 2, 3, 4, 5], [True, 2, 3, 4, 5]])
+def test_score_rolls_rejects_non_integer_dice(roll):
+    """Test that dice that are not integers are rejected rather than truncated or passed on."""
+    with pytest.raises(ValueError, match="Roll 1"):
+        score_rolls([[1, 1, 1, 1, 1], roll], Scorer())
+
+
+# NDJSON Tests
+def test_classify_ndjson_adds_scores():
+    """Test that each record keeps its fields and gains the categories it scores in."""
+    lines = ['{"id": 7, "roll": [2, 2, 3, 3, 3]}', '', '[1, 2, 3, 4, 5]']
+    output = [json.loads(line) for line in classify_ndjson(lines)]
+    assert output[0] == {
+        "id": 7, "roll": [2, 2, 3, 3, 3],
+        "scores": {"Twos": 4, "Threes": 9, "Three of a Kind": 13, "Full House": 25, "Chance": 13},
+    }
+    assert output[1]["roll"] == [1, 2, 3, 4, 5]
+    assert output[1]["scores"]["Large Straight"] == 40
+
+
+def test_classify_ndjson_chunks_are_lazy():
+    """Test that records are scored a chunk at a time, without reading the whole stream."""
+    consumed = []
+
+    def lines():
+        for index in range(10):
+            consumed.append(index)
+            yield json.dumps({"roll": [1, 1, 1, 1, 1]})
+
+    output = classify_ndjson(lines(), chunk_size=3)
+    next(output)
+    assert len(consumed) == 3
+
+
+def test_classify_ndjson_custom_roll_field():
+    """Test that the roll can be read from another field."""
+    output = json.loads(next(classify_ndjson(['{"dice": [6, 6, 6, 6, 6]}'], roll_field="dice")))
+    assert output["scores"]["Yahtzee"] == 50
+
+
+@pytest.mark.parametrize("line", [
+    '{"roll": [1, 2', '{"id": 1}', '"roll"', '{"roll": [1, 2, 3, "a", 5]}', '[[1], 2, 3, 4, 5]',
+    '[1.5, 2, 3, 4, 5]', '[true, 2, 3, 4, 5]',
+])
+def test_classify_ndjson_rejects_malformed_lines(line):
+    """Test that malformed records are reported with their line number."""
+    with pytest.raises(ValueError, match="Line 2"):
+        list(classify_ndjson(['[1, 1, 1, 1, 1]', line]))
+
+
+# CSV Tests
+def test_classify_csv_appends_points():
+    """Test that each row gains one points column per category."""
+    rows = list(classify_csv(["game,d1,d2,d3,d4,d5", "1,6,6,6,6,6", "2,1,2,3,4,6"]))
+    assert rows[0] == ["game", "d1", "d2", "d3", "d4", "d5"] + [category.value for category in ScoreCategory]
+    assert rows[1][:6] == ["1", "6", "6", "6", "6", "6"]
+    assert rows[1][6 + CATEGORY_INDEX[ScoreCategory.YAHTZEE]] == 50
+    assert rows[2][6 + CATEGORY_INDEX[ScoreCategory.SMALL_STRAIGHT]] == 30
+
+
+def test_classify_csv_custom_columns():
+    """Test that the dice can be read from other columns, in any position."""
+    rows = list(classify_csv(["a,b,c,d,e,note", "5,5,5,2,2,x"], dice_columns=("a", "b", "c", "d", "e")))
+    assert rows[1][6 + CATEGORY_INDEX[ScoreCategory.FULL_HOUSE]] == 25
+
+
+def test_classify_csv_empty():
+    """Test that an empty input gives no rows."""
+    assert list(classify_csv([])) == []
+
+
+def test_classify_csv_rejects_missing_columns():
+    """Test that a header without the dice columns is rejected."""
+    with pytest.raises(ValueError, match="missing"):
+        list(classify_csv(["d1,d2,d3", "1,2,3"]))
+
+
+def test_classify_csv_rejects_non_integer_dice():
+    """Test that dice that are not integers are rejected."""
+    with pytest.raises(ValueError, match="integers"):
+        list(classify_csv(["d1,d2,d3,d4,d5", "1,2,x,4,5"]))
+
+
+def test_classify_csv_reports_line_of_bad_row():
+    """Test that the error names the bad row's line, not the last line of its chunk."""
+    lines = ["d1,d2,d3,d4,d5", "1,1,1,1,1", "1,2,x,4,5", "2,2,2,2,2", "3,3,3,3,3"]
+    with pytest.raises(ValueError, match="CSV line 3:"):
+        list(classify_csv(lines, chunk_size=10))
+
+
+# Stream Tests
+@pytest.mark.parametrize("record_format, text, count", [
+    ("ndjson", '[1, 1, 1, 1, 1]\n[2, 2, 2, 2, 2]\n', 2),
+    ("csv", "d1,d2,d3,d4,d5\n1,1,1,1,1\n", 1),
+    ("csv", "", 0),
+])
+def test_classify_stream_counts_records(record_format, text, count):
+    """Test that the number of records classified is returned."""
+    sink = io.StringIO()
+    assert classify_stream(io.StringIO(text), sink, record_format, chunk_size=1) == count
+
+
+@pytest.mark.parametrize("record_format, text", [
+    ("ndjson", '[1, 1, 1, 1, 1]\n'),
+    ("csv", "d1,d2,d3,d4,d5\n1,1,1,1,1\n"),
+    ("csv", ""),
+])
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_classify_stream_rejects_chunk_sizes_below_one(record_format, text, chunk_size):
+    """Test that a chunk size that would take no records is rejected rather than dropping them."""
+    with pytest.raises(ValueError, match="Chunk size"):
+        classify_stream(io.StringIO(text), io.StringIO(), record_format, chunk_size=chunk_size)
+
+
+def test_classify_stream_rejects_unknown_format():
+    """Test that an unknown format is rejected."""
+    with pytest.raises(ValueError):
+        classify_stream(io.StringIO(""), io.StringIO(), "xml")
+
+
+# Command-Line Tests
+def test_main_classifies_files(tmp_path):
+    """Test that the command line reads and writes files, inferring CSV from the extension."""
+    source = tmp_path / "rolls.csv"
+    source.write_text("d1,d2,d3,d4,d5\n4,4,4,4,1\n")
+    target = tmp_path / "scores.csv"
+    assert main([str(source), "-o", str(target)]) == 0
+    lines = target.read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[1].split(",")[5 + CATEGORY_INDEX[ScoreCategory.FOUR_OF_A_KIND]] == "17"
+
+
+def test_main_reports_errors(tmp_path, capsys):
+    """Test that malformed input gives an error message and a non-zero exit status."""
+    source = tmp_path / "rolls.ndjson"
+    source.write_text("not json\n")
+    assert main([str(source), "-o", str(tmp_path / "out.ndjson")]) == 1
+    assert "Line 1" in capsys.readouterr().err
+
+
+def test_main_reports_missing_input(tmp_path, capsys):
+    """Test that an input file that cannot be opened gives an error message, not a traceback."""
+    assert main([str(tmp_path / "missing.ndjson"), "-o", str(tmp_path / "out.ndjson")]) == 1
+    assert capsys.readouterr().err.startswith("error: ")
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "-5", "many"])
+def test_main_rejects_chunk_sizes_below_one(tmp_path, capsys, chunk_size):
+    """Test that the command line only accepts a positive chunk size."""
+    source = tmp_path / "rolls.ndjson"
+    source.write_text("[1, 1, 1, 1, 1]\n")
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(source), "-o", str(tmp_path / "out.ndjson"), "--chunk-size", chunk_size])
+    assert exit_info.value.code == 2
+    assert "positive integer" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from src.roll_encoding import ROLL_INDEX, ROLLS
+from src.roll_table import KEEP_INDEX, KEEP_PROBABILITIES, KEEP_TRANSITIONS, KEEPS
+from src.transitions import TransitionMatrix
+
+
+# Construction Tests
+def test_small_matrix():
+    """Test the sparse form of a small matrix."""
+    matrix = TransitionMatrix(np.array([[1, 0, 1], [0, 3, 0]]), np.array([2, 3]))
+    assert matrix.shape == (2, 3)
+    assert matrix.nnz == 3
+    assert list(matrix.indptr) == [0, 2, 3]
+    assert list(matrix.indices) == [0, 2, 1]
+    assert list(matrix.data) == [0.5, 0.5, 1.0]
+    np.testing.assert_array_equal(matrix.dense, [[0.5, 0, 0.5], [0, 1, 0]])
+
+
+@pytest.mark.parametrize("counts, denominators", [
+    ([[1, 1], [1, 0]], [2, 2]),  # Row does not sum to its denominator
+    ([[2, -1]], [1]),  # Negative count
+    ([1, 1], [2]),  # Not two-dimensional
+    ([[1, 1]], [2, 2]),  # Wrong number of denominators
+])
+def test_rejects_invalid_counts(counts, denominators):
+    """Test that counts that do not form a stochastic matrix are rejected."""
+    with pytest.raises(ValueError):
+        TransitionMatrix(np.array(counts), np.array(denominators))
+
+
+def test_arrays_are_read_only():
+    """Test that the stored arrays cannot be modified."""
+    with pytest.raises(ValueError):
+        KEEP_TRANSITIONS.data[0] = 1.0
+
+
+# Keep Transition Tests
+def test_keep_transitions_are_sparse():
+    """Test that only the reachable outcomes of each keep are stored."""
+    assert KEEP_TRANSITIONS.shape == (462, 252)
+    assert KEEP_TRANSITIONS.nnz == 4368
+    assert KEEP_PROBABILITIES is KEEP_TRANSITIONS.dense
+
+
+@pytest.mark.parametrize("size, outcomes", [(0, 252), (1, 126), (2, 56), (3, 21), (4, 6), (5, 1)])
+def test_keep_row_sizes(size, outcomes):
+    """Test that keeping k dice reaches every multiset of the 5 - k rerolled dice."""
+    for index, keep in enumerate(KEEPS):
+        if len(keep) == size:
+            assert len(KEEP_TRANSITIONS.row(index)[0]) == outcomes
+
+
+def test_exact_rows_sum_to_one():
+    """Test that every exact row is a probability distribution."""
+    for index in range(len(KEEPS)):
+        assert sum(KEEP_TRANSITIONS.exact_row(index).values()) == 1
+
+
+def test_exact_row_known_values():
+    """Test the exact outcomes of keeping four sixes."""
+    row = KEEP_TRANSITIONS.exact_row(KEEP_INDEX[(6, 6, 6, 6)])
+    assert row[ROLL_INDEX[(6, 6, 6, 6, 6)]] == Fraction(1, 6)
+    assert row[ROLL_INDEX[(1, 6, 6, 6, 6)]] == Fraction(1, 6)
+    assert len(row) == 6
+
+
+def test_exact_row_matches_floats():
+    """Test that the float probabilities are the exact ones rounded."""
+    for index in (0, 100, 461):
+        columns, probabilities = KEEP_TRANSITIONS.row(index)
+        exact = KEEP_TRANSITIONS.exact_row(index)
+        assert [float(exact[column]) for column in columns] == list(probabilities)
+
+
+# Expectation Tests
+def test_expectation_matches_row_expectation():
+    """Test that the dense and sparse expectations agree."""
+    values = np.random.default_rng(3).random((4, 252))
+    expected = KEEP_TRANSITIONS.expectation(values)
+    assert expected.shape == (4, 462)
+    for index in (0, 7, 300, 461):
+        np.testing.assert_allclose(KEEP_TRANSITIONS.row_expectation(index, values), expected[:, index])
+        assert KEEP_TRANSITIONS.row_expectation(index, values[0]) == pytest.approx(expected[0, index])
+
+
+def test_exact_expectation():
+    """Test the exact expected sum of the dice after a reroll."""
+    dice_sums = [sum(roll) for roll in ROLLS]
+    assert KEEP_TRANSITIONS.exact_expectation(KEEP_INDEX[()], dice_sums) == Fraction(35, 2)
+    assert KEEP_TRANSITIONS.exact_expectation(KEEP_INDEX[(6, 6, 6, 6)], dice_sums) == Fraction(55, 2)
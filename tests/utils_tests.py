@@ -0,0 +1,124 @@
+import io
+import json
+
+import pytest
+
+from src.score import Score
+from src.score_card import ScoreCard
+from src.score_category import ScoreCategory
+from src.scorer import Scorer
+from src.utils import (
+    DefaultEncoder, dump_json, iter_json, score_from_dict, scores_from_dicts, scores_to_dicts
+)
+
+
+def _card() -> ScoreCard:
+    """Builds a partly filled ScoreCard with a Yahtzee bonus."""
+    card = ScoreCard()
+    card.assign_score(Score(ScoreCategory.YAHTZEE, [4, 4, 4, 4, 4], 50))
+    card.assign_score(Score(ScoreCategory.FOURS, [4, 4, 4, 4, 4], 20))
+    card.assign_score(Score(ScoreCategory.CHANCE, [6, 5, 1, 2, 3], 17))
+    return card
+
+
+# DefaultEncoder Tests
+def test_default_encoder_uses_to_dict():
+    """Test that objects with to_dict() are encoded through it."""
+    score = Score(ScoreCategory.ACES, [1, 1, 2, 3, 4], 2)
+    assert json.loads(json.dumps(score, cls=DefaultEncoder)) == score.to_dict()
+
+
+def test_default_encoder_encodes_plain_objects_by_attributes():
+    """Test that ordinary objects are encoded by their attributes rather than failing."""
+    class Plain:
+        def __init__(self):
+            self.name = "plain"
+            self.category = ScoreCategory.CHANCE
+
+    assert json.loads(json.dumps(Plain(), cls=DefaultEncoder)) == {'name': 'plain', 'category': 'Chance'}
+
+
+def test_default_encoder_rejects_unknown_objects():
+    """Test that objects with neither to_dict() nor attributes still raise TypeError."""
+    with pytest.raises(TypeError):
+        json.dumps(object(), cls=DefaultEncoder)
+
+
+# Bulk Conversion Tests
+def test_scores_to_dicts_matches_to_dict():
+    """Test that bulk conversion matches converting each Score."""
+    scores = Scorer().get_scores([2, 2, 3, 3, 3]) + [None]
+    assert scores_to_dicts(scores) == [None if score is None else score.to_dict() for score in scores]
+
+
+def test_scores_from_dicts_round_trip():
+    """Test that Scores survive a round trip through dictionaries."""
+    scores = Scorer().get_scores([1, 2, 3, 4, 5]) + [Score(ScoreCategory.YAHTZEE, [5, 3, 1, 2, 4], 0), None]
+    assert scores_from_dicts(scores_to_dicts(scores)) == scores
+
+
+def test_score_from_dict_reuses_interned_scores():
+    """Test that a sorted roll with its usual points decodes to the shared interned Score."""
+    interned = Scorer().get_scores([2, 2, 2, 5, 5])[0]
+    assert score_from_dict(interned.to_dict()) is interned
+
+
+@pytest.mark.parametrize("data", [
+    {'category': 'Aces', 'roll': [3, 1, 1, 2, 4], 'points': 2},
+    {'category': 'Aces', 'roll': [1, 1, 2, 3, 4], 'points': 5},
+    {'category': 'Aces', 'roll': [1, 1], 'points': 2},
+])
+def test_score_from_dict_keeps_non_canonical_scores(data):
+    """Test that unsorted rolls, unusual points and short rolls get their own Score."""
+    score = score_from_dict(data)
+    assert score.to_dict() == data
+
+
+def test_score_from_dict_rejects_unknown_category():
+    """Test that an unknown category name raises ValueError."""
+    with pytest.raises(ValueError):
+        score_from_dict({'category': 'Bogus', 'roll': [1, 1, 1, 1, 1], 'points': 0})
+
+
+# Streaming Encoder Tests
+@pytest.mark.parametrize("obj", [
+    Score(ScoreCategory.FULL_HOUSE, [2, 2, 3, 3, 3], 25),
+    ScoreCard(),
+    _card(),
+    [_card(), None, Score(ScoreCategory.ACES, [1, 2, 3, 4, 5], 1)],
+    (score for score in Scorer().get_scores([6, 6, 6, 6, 6])),
+    {'card': _card(), 'count': 3},
+    [],
+    "text",
+])
+def test_iter_json_matches_default_encoder(obj):
+    """Test that the streamed JSON is identical to encoding with DefaultEncoder."""
+    if not isinstance(obj, (list, tuple, dict, str, Score, ScoreCard)):
+        obj = list(obj)
+
+    assert "".join(iter_json(obj)) == json.dumps(obj, cls=DefaultEncoder)
+
+
+def test_dump_json_writes_in_fragments():
+    """Test that dump_json writes many fragments rather than one large string."""
+    writes = []
+
+    class Sink(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    cards = [_card() for _ in range(100)]
+    sink = Sink()
+    dump_json(iter(cards), sink)
+
+    assert len(writes) > len(cards)
+    assert json.loads(sink.getvalue()) == [card.to_dict() for card in cards]
+
+
+def test_score_from_dict_shared_score_is_immutable():
+    """Test that the shared Score handed out by score_from_dict cannot have its roll changed."""
+    score = score_from_dict({'category': 'Chance', 'roll': [1, 2, 3, 4, 5], 'points': 15})
+
+    with pytest.raises(AttributeError):
+        score.roll.append(6)